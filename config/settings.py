@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -21,11 +21,57 @@ class Settings(BaseSettings):
     data_dir: Path = Field(default_factory=lambda: _project_root() / "data")
     documents_dir: Path = Field(default_factory=lambda: _project_root() / "data" / "documents")
     chroma_persist_dir: Path = Field(default_factory=lambda: _project_root() / "data" / "chroma_db")
+    keyword_index_path: Path = Field(default_factory=lambda: _project_root() / "data" / "keyword_index.pkl")
+    corpus_generation_path: Path = Field(default_factory=lambda: _project_root() / "data" / "corpus_generation")
+    metrics_db_path: Path = Field(default_factory=lambda: _project_root() / "data" / "metrics.sqlite")
+    llm_cache_path: Path = Field(default_factory=lambda: _project_root() / "data" / "llm_cache.sqlite")
 
     # HuggingFace
     huggingface_hub_token: Optional[str] = Field(default=None, alias="HF_TOKEN")
     llm_model_name: str = Field(default="mistralai/Mistral-7B-Instruct-v0.2", alias="LLM_MODEL")
     embedding_model_name: str = Field(default="sentence-transformers/all-MiniLM-L6-v2", alias="EMBEDDING_MODEL")
+    llm_max_new_tokens: int = Field(default=1024, alias="LLM_MAX_NEW_TOKENS")
+    llm_temperature: float = Field(default=0.3, alias="LLM_TEMPERATURE")
+    # Prompt budgeting: model context window, and tokenizer used to count (default: the model's own; "chars" = len/4)
+    llm_context_window: int = Field(default=8192, alias="LLM_CONTEXT_WINDOW")
+    llm_tokenizer: Optional[str] = Field(default=None, alias="LLM_TOKENIZER")
+
+    # LLM backend: hf_endpoint (HF Hub / Inference router) | openai_compatible (any /v1/chat/completions
+    # server, e.g. llama.cpp, vLLM, scripts/local_llm_server.py) | transformers (in-process CPU pipeline)
+    llm_backend: str = Field(default="hf_endpoint", alias="LLM_BACKEND")
+    llm_base_url: str = Field(default="http://localhost:8080/v1", alias="LLM_BASE_URL")
+    llm_api_key: Optional[str] = Field(default=None, alias="LLM_API_KEY")
+    llm_local_model: str = Field(default="Qwen/Qwen2.5-0.5B-Instruct", alias="LLM_LOCAL_MODEL")
+
+    # Per-purpose model profiles (src/llm/profiles.py). LLM_FAST_MODEL serves classify/analyze/gap when set;
+    # LLM_PROFILES (JSON) overrides model / max_new_tokens / temperature per purpose.
+    llm_fast_model: Optional[str] = Field(default=None, alias="LLM_FAST_MODEL")
+    llm_profiles: dict[str, dict[str, Any]] = Field(default_factory=dict, alias="LLM_PROFILES")
+
+    # Async LLM client (OpenAI-compatible chat completions; HF Inference router for hf_endpoint)
+    hf_inference_base_url: str = Field(default="https://router.huggingface.co/v1", alias="HF_INFERENCE_BASE_URL")
+    llm_max_concurrency: int = Field(default=256, alias="LLM_MAX_CONCURRENCY")
+    llm_max_connections: int = Field(default=100, alias="LLM_MAX_CONNECTIONS")
+    llm_timeout_seconds: float = Field(default=120.0, alias="LLM_TIMEOUT_SECONDS")
+
+    # LLM retries (exponential backoff with full jitter) and circuit breaker
+    llm_retry_base_seconds: float = Field(default=0.5, alias="LLM_RETRY_BASE_SECONDS")
+    llm_retry_max_seconds: float = Field(default=8.0, alias="LLM_RETRY_MAX_SECONDS")
+    llm_breaker_failure_threshold: int = Field(default=5, alias="LLM_BREAKER_FAILURE_THRESHOLD")
+    llm_breaker_recovery_seconds: float = Field(default=30.0, alias="LLM_BREAKER_RECOVERY_SECONDS")
+
+    # Hedged requests: duplicate an async HTTP call still running after the model's recent latency
+    # percentile; the extra calls are capped at LLM_HEDGE_BUDGET_RATIO of all calls
+    llm_hedge_enabled: bool = Field(default=False, alias="LLM_HEDGE_ENABLED")
+    llm_hedge_percentile: float = Field(default=95.0, alias="LLM_HEDGE_PERCENTILE")
+    llm_hedge_budget_ratio: float = Field(default=0.05, alias="LLM_HEDGE_BUDGET_RATIO")
+    llm_hedge_min_samples: int = Field(default=20, alias="LLM_HEDGE_MIN_SAMPLES")
+    llm_hedge_window: int = Field(default=500, alias="LLM_HEDGE_WINDOW")
+
+    # LLM response cache (exact match on prompt + model + generation params)
+    llm_cache_enabled: bool = Field(default=True, alias="LLM_CACHE_ENABLED")
+    llm_cache_ttl_seconds: float = Field(default=7 * 24 * 3600, alias="LLM_CACHE_TTL_SECONDS")
+    llm_cache_max_entries: int = Field(default=5000, alias="LLM_CACHE_MAX_ENTRIES")
 
     # Chroma
     chroma_collection_name: str = Field(default="leadership_docs", alias="CHROMA_COLLECTION")
@@ -41,6 +87,56 @@ class Settings(BaseSettings):
     top_k_retrieve: int = Field(default=5, alias="TOP_K_RETRIEVE")
     retrieval_score_threshold: float = Field(default=0.3, alias="RETRIEVAL_SCORE_THRESHOLD")
 
+    # DOCX loading: "native" (python-docx) or "unstructured"; fallback retries failed native loads with unstructured
+    docx_loader: str = Field(default="native", alias="DOCX_LOADER")
+    docx_unstructured_fallback: bool = Field(default=False, alias="DOCX_UNSTRUCTURED_FALLBACK")
+
+    # Ingestion jobs (background processing of uploads)
+    ingestion_workers: int = Field(default=1, alias="INGESTION_WORKERS")
+    ingestion_job_history: int = Field(default=200, alias="INGESTION_JOB_HISTORY")
+    upload_chunk_bytes: int = Field(default=1024 * 1024, alias="UPLOAD_CHUNK_BYTES")
+
+    # Keyword index: compact in the background once this fraction of entries is tombstoned
+    keyword_index_compact_ratio: float = Field(default=0.2, alias="KEYWORD_INDEX_COMPACT_RATIO")
+
+    # Semantic answer cache in front of /ask (cosine similarity on question embeddings)
+    answer_cache_enabled: bool = Field(default=True, alias="ANSWER_CACHE_ENABLED")
+    answer_cache_threshold: float = Field(default=0.92, alias="ANSWER_CACHE_THRESHOLD")
+    answer_cache_capacity: int = Field(default=512, alias="ANSWER_CACHE_CAPACITY")
+    answer_cache_ttl_seconds: float = Field(default=3600, alias="ANSWER_CACHE_TTL_SECONDS")
+
+    # Local question classifier for auto mode: nearest centroid over question embeddings, trained from the
+    # seed file (scripts/train_question_classifier.py); the LLM classifies only when the margin is below min
+    question_classifier_enabled: bool = Field(default=True, alias="QUESTION_CLASSIFIER_ENABLED")
+    question_classifier_path: Path = Field(
+        default_factory=lambda: _project_root() / "data" / "question_classifier.npz", alias="QUESTION_CLASSIFIER_PATH"
+    )
+    question_classifier_seed_path: Path = Field(
+        default_factory=lambda: _project_root() / "config" / "question_classifier_seed.jsonl",
+        alias="QUESTION_CLASSIFIER_SEED_PATH",
+    )
+    question_classifier_min_margin: float = Field(default=0.03, alias="QUESTION_CLASSIFIER_MIN_MARGIN")
+    question_classifier_shadow_rate: float = Field(default=0.0, alias="QUESTION_CLASSIFIER_SHADOW_RATE")
+
+    # Auto mode: when the local classifier is unsure, one question-analyzer call classifies the question and
+    # (if strategic) seeds the decision graph's analysis, instead of a classifier call plus an analyzer call
+    combined_analysis: bool = Field(default=True, alias="COMBINED_ANALYSIS")
+
+    # Auto mode: retrieve for the question while it is being classified; the chosen agent reuses the results
+    speculative_retrieval: bool = Field(default=True, alias="SPECULATIVE_RETRIEVAL")
+
+    # Decision graph research: sub-question retrievals run concurrently, at most this many at a time
+    research_parallelism: int = Field(default=4, alias="RESEARCH_PARALLELISM")
+
+    # Decision graph checkpoints (in memory, per run): whole runs are evicted least-recently-used beyond
+    # these limits, and after CHECKPOINT_TTL_SECONDS idle
+    checkpoint_max_threads: int = Field(default=500, alias="CHECKPOINT_MAX_THREADS")
+    checkpoint_ttl_seconds: float = Field(default=1800, alias="CHECKPOINT_TTL_SECONDS")
+    checkpoint_max_mb: float = Field(default=256, alias="CHECKPOINT_MAX_MB")
+
+    # Structured metrics fast path: answer exact metric/period lookups from the metrics store
+    metrics_fast_path: bool = Field(default=True, alias="METRICS_FAST_PATH")
+
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
 
@@ -0,0 +1,97 @@
+"""Measure per-request decision graph overhead: compiling per request vs the shared compiled graph. Run from project root.
+
+Every node's LLM and retrieval calls are replaced with instant fakes, so the timings are LangGraph
+overhead only (graph construction, compilation, checkpointing, state merging).
+
+    python scripts/benchmark_decision_graph.py --runs 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.agents import decision_agent
+from src.graph import builder
+from src.graph.nodes import (
+    decision_synthesis,
+    internal_research,
+    knowledge_gap,
+    question_analyzer,
+    risk_assessment,
+    strategic_reasoning,
+)
+from src.models.schemas import Source
+
+_FAKE_REPLIES = {
+    "analyze": json.dumps({"classification": "strategic", "intent": "bench", "sub_questions": ["a", "b"]}),
+    "gap": json.dumps({"knowledge_gaps": [], "assumptions": [], "context_sufficient": True, "refined_sub_questions": []}),
+    "plan": "## Option A: Invest\nPros: growth.\n\n## Option B: Hold\nPros: low risk.",
+    "risk": "## Option A: Invest\nRisk score: 6\nRisk level: MEDIUM\n\n## Option B: Hold\nRisk score: 3\nRisk level: LOW",
+    "synthesize": "## Executive Summary\nProceed.\n\n## Confidence Level\nMEDIUM",
+}
+
+
+def _fake_llm(prompt: str, *args, purpose: str = None, **kwargs) -> str:
+    return _FAKE_REPLIES.get(purpose, "ok")
+
+
+async def _afake_llm(prompt: str, *args, purpose: str = None, **kwargs) -> str:
+    return _fake_llm(prompt, purpose=purpose)
+
+
+async def _afake_stream(prompt: str, *args, purpose: str = None, **kwargs):
+    yield _fake_llm(prompt, purpose=purpose)
+
+
+def _install_fakes() -> None:
+    for module in (question_analyzer, knowledge_gap, strategic_reasoning, risk_assessment, decision_synthesis):
+        for name, fake in (("invoke_for_text", _fake_llm), ("ainvoke_for_text", _afake_llm), ("astream_text", _afake_stream)):
+            if hasattr(module, name):
+                setattr(module, name, fake)
+    internal_research.query_documents = lambda q: [Source(content=f"context for {q}", metadata={"source_file": "bench"}, score=0.5)]
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+    print(f"{label:<28} mean {statistics.mean(samples) * 1000:8.2f} ms | p95 {p95 * 1000:8.2f} ms")
+
+
+def _time(fn, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+    _install_fakes()
+
+    _report("compile only (before)", _time(builder.build_decision_graph, args.runs))
+    builder.reset_decision_graph()
+    builder.get_decision_graph()
+    _report("shared graph lookup (after)", _time(builder.get_decision_graph, args.runs))
+
+    question = "Should we expand into a new region?"
+    original = decision_agent.get_decision_graph
+    decision_agent.get_decision_graph = builder.build_decision_graph
+    _report("run, compile per request", _time(lambda: decision_agent.run_decision_agent(question), args.runs))
+    decision_agent.get_decision_graph = original
+    _report("run, shared graph", _time(lambda: decision_agent.run_decision_agent(question), args.runs))
+
+    async def arun() -> None:
+        await decision_agent.arun_decision_agent(question)
+
+    _report("async run, shared graph", _time(lambda: asyncio.run(arun()), args.runs))
@@ -0,0 +1,41 @@
+"""Bulk-import a pre-chunked corpus (JSONL or Parquet) into Chroma and the keyword index. Run from project root.
+
+Each record: {"id": "...", "text": "...", "metadata": {...}, "embedding": [...]}.
+Only "text" is required; records without "embedding" are embedded with the configured model.
+
+    python scripts/import_corpus.py exports/chunks.jsonl
+    python scripts/import_corpus.py exports/chunks.parquet --batch-size 5000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from config import get_settings
+from src.ingestion.bulk_import import DEFAULT_BATCH_SIZE, import_corpus
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import pre-chunked records into the vector store.")
+    parser.add_argument("paths", nargs="+", type=Path, help=".jsonl or .parquet files")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Records per Chroma upsert")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    settings = get_settings()
+    settings.ensure_dirs()
+    for path in args.paths:
+        print(f"Importing {path} ...")
+        started = time.perf_counter()
+        stats = import_corpus(path, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - started
+        rate = stats.imported / elapsed if elapsed > 0 else 0.0
+        print(
+            f"Done. {stats.imported} records in {stats.batches} batches "
+            f"({stats.embedded} embedded locally, {stats.skipped} skipped) "
+            f"in {elapsed:.1f}s ({rate:.0f} records/s)."
+        )
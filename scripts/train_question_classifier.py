@@ -0,0 +1,32 @@
+"""Train the local insight / strategic question classifier from a labeled seed file. Run from project root.
+
+    python scripts/train_question_classifier.py
+    python scripts/train_question_classifier.py --seed my_questions.jsonl --output data/question_classifier.npz
+
+Seed lines are {"question": "...", "label": "insight" | "strategic"}. Prints leave-one-out accuracy and the
+median confidence margin (compare with QUESTION_CLASSIFIER_MIN_MARGIN). Restart the API to pick up the model.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from config import get_settings
+from src.agents.question_classifier import train_from_seed
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=Path, default=settings.question_classifier_seed_path)
+    parser.add_argument("--output", type=Path, default=settings.question_classifier_path)
+    args = parser.parse_args()
+
+    print(f"Training from {args.seed} ...")
+    classifier, report = train_from_seed(args.seed)
+    classifier.save(args.output)
+    print(json.dumps(report, indent=2))
+    print(f"Saved {args.output}")
@@ -1,12 +1,27 @@
 """Agents: Insight (RAG) and Strategic Decision (LangGraph)."""
 
-from src.agents.insight_agent import run_insight_agent
-from src.agents.decision_agent import run_decision_agent
-from src.agents.router import classify_question, route_and_answer
+from src.agents.insight_agent import arun_insight_agent, run_insight_agent
+from src.agents.decision_agent import arun_decision_agent, run_decision_agent
+from src.agents.router import (
+    aclassify_question,
+    aroute_and_answer,
+    aroute_question,
+    astream_answer,
+    classify_question,
+    route_and_answer,
+    route_question,
+)
 
 __all__ = [
     "run_insight_agent",
     "run_decision_agent",
     "classify_question",
+    "route_question",
     "route_and_answer",
+    "arun_insight_agent",
+    "arun_decision_agent",
+    "aclassify_question",
+    "aroute_question",
+    "aroute_and_answer",
+    "astream_answer",
 ]
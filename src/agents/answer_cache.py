@@ -0,0 +1,141 @@
+"""Semantic answer cache for /ask: reuse a prior AskResponse when a new question is a near-paraphrase."""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from config import get_settings
+from src.models.schemas import AskResponse
+from src.retrieval.embeddings import get_embedding_model
+from src.retrieval.metrics_store import find_periods, strip_periods
+from src.retrieval.vector_store import get_corpus_version
+
+logger = logging.getLogger(__name__)
+
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def exact_terms(question: str) -> tuple:
+    """
+    Periods and numbers in a question. Embeddings barely separate "revenue in Q3 FY2025" from "... Q4
+    FY2025", so a cached answer is only reused when these match exactly.
+    """
+    periods = tuple(sorted(set(find_periods(question))))
+    numbers = tuple(sorted(set(_NUMBER_RE.findall(strip_periods(question)))))
+    return periods, numbers
+
+
+@dataclass
+class _Entry:
+    mode: str
+    terms: tuple
+    vector: np.ndarray
+    response: AskResponse
+    created_at: float
+
+
+class SemanticAnswerCache:
+    """
+    LRU of (question embedding, mode) -> AskResponse. A lookup hits when cosine similarity with a cached
+    question in the same mode, with the same periods and numbers, is at or above threshold. All entries are
+    dropped when the persisted corpus generation changes (in any process), so answers never outlive the
+    documents they were built from.
+    """
+
+    def __init__(self, capacity: int, threshold: float, ttl_seconds: float) -> None:
+        self.capacity = max(1, capacity)
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._next_id = 0
+        self._corpus_version = get_corpus_version()
+        self._lock = threading.Lock()
+
+    def embed(self, question: str) -> np.ndarray:
+        """Unit-length question embedding (the embedding model already normalises)."""
+        return np.asarray(get_embedding_model().embed_query(question), dtype=np.float32)
+
+    def _sync_corpus_version(self) -> int:
+        """Drop everything if documents changed since entries were stored. Caller holds _lock."""
+        version = get_corpus_version()
+        if version != self._corpus_version:
+            if self._entries:
+                logger.info("Corpus changed; evicting %d cached answers", len(self._entries))
+            self._entries.clear()
+            self._corpus_version = version
+        return version
+
+    def lookup(self, question: str, vector: np.ndarray, mode: str) -> Optional[AskResponse]:
+        """Best cached response for this mode and these periods/numbers above threshold, or None."""
+        terms = exact_terms(question)
+        now = time.time()
+        with self._lock:
+            self._sync_corpus_version()
+            if self.ttl_seconds > 0:
+                for entry_id in [i for i, e in self._entries.items() if now - e.created_at > self.ttl_seconds]:
+                    del self._entries[entry_id]
+            candidates: List[int] = [i for i, e in self._entries.items() if e.mode == mode and e.terms == terms]
+            if candidates:
+                matrix = np.stack([self._entries[i].vector for i in candidates])
+                similarities = matrix @ vector
+                best = int(np.argmax(similarities))
+                if float(similarities[best]) >= self.threshold:
+                    entry_id = candidates[best]
+                    self._entries.move_to_end(entry_id)
+                    self.hits += 1
+                    return self._entries[entry_id].response.model_copy(update={"cached": True})
+            self.misses += 1
+            return None
+
+    def store(self, question: str, vector: np.ndarray, mode: str, response: AskResponse, corpus_version: int) -> None:
+        """Add a response computed against corpus_version (ignored if the corpus has moved on since)."""
+        terms = exact_terms(question)
+        with self._lock:
+            if self._sync_corpus_version() != corpus_version:
+                return
+            self._entries[self._next_id] = _Entry(
+                mode=mode, terms=terms, vector=vector, response=response, created_at=time.time()
+            )
+            self._next_id += 1
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "capacity": self.capacity,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_cache: Optional[SemanticAnswerCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """Singleton cache, or None when disabled (ANSWER_CACHE_ENABLED=false)."""
+    global _cache
+    settings = get_settings()
+    if not settings.answer_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticAnswerCache(
+                capacity=settings.answer_cache_capacity,
+                threshold=settings.answer_cache_threshold,
+                ttl_seconds=settings.answer_cache_ttl_seconds,
+            )
+        return _cache
@@ -1,45 +1,134 @@
 """Decision Agent: LangGraph workflow, multi-step reasoning, structured recommendation."""
 
 import logging
-from typing import Any
+import re
+import uuid
+from typing import Any, AsyncIterator, List, Optional
 
-from src.graph.builder import build_decision_graph
+from src.graph.builder import get_decision_graph
+from src.graph.chunk_store import get_chunk_store
+from src.graph.nodes.internal_research import retrieved_sources
 from src.graph.state import DecisionGraphState
-from src.models.schemas import AgentType, AskResponse, ReasoningStep, RiskSummary, Source
+from src.models.schemas import RUN_ID_PATTERN, AgentType, AskResponse, ReasoningStep, RiskSummary, Source
 
 logger = logging.getLogger(__name__)
 
 
-def run_decision_agent(question: str) -> AskResponse:
-    """Run the full LangGraph workflow and return structured response with trace and risk."""
-    graph = build_decision_graph()
-    initial: DecisionGraphState = {
+def _run_config(run_id: Optional[str] = None, **configurable: Any) -> dict[str, Any]:
+    """
+    Config for one graph run: its own checkpoint thread, so concurrent runs on the shared graph never mix.
+    run_id reuses the thread of an earlier (failed) run to resume it.
+    """
+    return {"configurable": {"thread_id": run_id or f"decision-{uuid.uuid4().hex}", **configurable}}
+
+
+def _set_in_flight(graph: Any, thread_id: str, in_flight: bool) -> None:
+    """Tell a bounded checkpointer a run is (no longer) executing on thread_id; eviction spares it meanwhile."""
+    mark = getattr(graph.checkpointer, "mark_in_flight" if in_flight else "mark_done", None)
+    if mark is not None:
+        mark(thread_id)
+
+
+def _start_run(
+    graph: Any,
+    question: str,
+    sources: Optional[List[Source]],
+    analysis: Optional[dict[str, Any]],
+    resume_run_id: Optional[str],
+    **configurable: Any,
+) -> tuple[dict[str, Any], Optional[DecisionGraphState]]:
+    """
+    (config, graph input) for a run. Input None resumes resume_run_id's thread from its last checkpoint (the
+    nodes that already completed are not run again); that needs a failed run for the same question whose
+    checkpoints are still held. Otherwise the run starts over on a new thread, so nothing from the old
+    thread's state (trace, sources, sub-questions) leaks into it. The thread is marked in flight, so
+    checkpoint eviction spares it until _release_run or _failed_run_id.
+    """
+    if resume_run_id is not None:
+        if not re.match(RUN_ID_PATTERN, resume_run_id):
+            raise ValueError(f"Invalid run id: {resume_run_id!r}")
+        config = _run_config(resume_run_id, **configurable)
+        snapshot = graph.get_state(config)
+        if snapshot.next and snapshot.values.get("question") == question:
+            logger.info("Resuming decision run %s at %s", resume_run_id, ", ".join(snapshot.next))
+            _set_in_flight(graph, resume_run_id, True)
+            return config, None
+        logger.info("Decision run %s has no resumable checkpoint for this question; starting over", resume_run_id)
+    config = _run_config(**configurable)
+    thread_id = config["configurable"]["thread_id"]
+    _set_in_flight(graph, thread_id, True)
+    return config, _initial_state(thread_id, question, sources, analysis)
+
+
+def _release_run(graph: Any, config: dict[str, Any]) -> None:
+    """
+    Delete a finished run's checkpoints from the shared saver, and its retrieved chunks. Failed runs keep
+    both so they can be resumed.
+    """
+    _set_in_flight(graph, config["configurable"]["thread_id"], False)
+    get_chunk_store().drop(config["configurable"]["thread_id"])
+    try:
+        graph.checkpointer.delete_thread(config["configurable"]["thread_id"])
+    except Exception as e:
+        logger.warning("Could not delete checkpoints for %s: %s", config["configurable"]["thread_id"], e)
+
+
+def _failed_run_id(graph: Any, config: dict[str, Any]) -> Optional[str]:
+    """
+    After a failure: the run's id if it has a checkpoint to resume from (no longer in flight, so eviction may
+    reclaim it if it is never resumed). A run that failed before its first checkpoint is released instead; the
+    bounded saver never tracked it, so nothing else would drop its chunks.
+    """
+    _set_in_flight(graph, config["configurable"]["thread_id"], False)
+    try:
+        if graph.get_state(config).next:
+            return config["configurable"]["thread_id"]
+    except Exception as e:
+        logger.warning("Could not read checkpoints for %s: %s", config["configurable"]["thread_id"], e)
+    _release_run(graph, config)
+    return None
+
+
+def _initial_state(
+    run_id: str, question: str, sources: Optional[List[Source]] = None, analysis: Optional[dict[str, Any]] = None
+) -> DecisionGraphState:
+    """
+    run_id: the run's checkpoint thread id, which also keys its retrieved chunks in the chunk store.
+    sources: retrieval results for question fetched ahead of the graph (internal research reuses them).
+    analysis: question analyzer output from routing (classification, intent, sub_questions); the
+    question_analyzer node then skips its own generation.
+    """
+    state: DecisionGraphState = {
         "question": question,
         "mode": "strategic",
+        "run_id": run_id,
         "iteration_count": 0,
         "max_iterations": 2,
         "reasoning_trace": [],
     }
-    try:
-        
-        final_state = graph.invoke(
-            initial,
-            config={
-                "configurable": {
-                    "thread_id": "decision-session-1"
-        }
-    }
-)
-    except Exception as e:
-        logger.exception("Decision graph failed: %s", e)
-        return AskResponse(
-            agent_type=AgentType.STRATEGIC,
-            answer="The strategic analysis could not be completed due to an error. Please try again.",
-            sources=[],
-            reasoning_trace=None,
-            risk_summary=None,
-        )
+    if sources is not None:
+        state["prefetched_chunk_ids"] = {question: get_chunk_store().put(run_id, sources)}
+    if analysis:
+        state.update({key: analysis[key] for key in ("classification", "intent", "sub_questions") if key in analysis})
+    return state
+
 
+def _error_response(run_id: Optional[str] = None) -> AskResponse:
+    """run_id: the failed run's thread, kept in the checkpoint store so a retry can resume it."""
+    response = AskResponse(
+        agent_type=AgentType.STRATEGIC,
+        answer="The strategic analysis could not be completed due to an error. Please try again.",
+        sources=[],
+        reasoning_trace=None,
+        risk_summary=None,
+        run_id=run_id,
+    )
+    response._cacheable = False
+    return response
+
+
+def _response_from_state(final_state: dict[str, Any]) -> AskResponse:
+    """Map the graph's final state to the API response (trace, risk summary, sources)."""
     answer = final_state.get("final_answer") or ""
     trace_raw = final_state.get("reasoning_trace") or []
     reasoning_trace = [
@@ -57,8 +146,8 @@ def run_decision_agent(question: str) -> AskResponse:
         scores=risk_scores if risk_scores else None,
     )
 
-    # Build sources from retrieved_sources in state
-    retrieved = final_state.get("retrieved_sources") or []
+    # Build sources from the run's chunk store (state holds only chunk ids)
+    retrieved = retrieved_sources(final_state)
     sources = [
         Source(content=s.get("content", ""), metadata=s.get("metadata", {}), score=s.get("score"))
         for s in retrieved
@@ -71,3 +160,99 @@ def run_decision_agent(question: str) -> AskResponse:
         reasoning_trace=reasoning_trace,
         risk_summary=risk_summary,
     )
+
+
+def run_decision_agent(
+    question: str,
+    sources: Optional[List[Source]] = None,
+    analysis: Optional[dict[str, Any]] = None,
+    resume_run_id: Optional[str] = None,
+) -> AskResponse:
+    """
+    Run the full LangGraph workflow and return structured response with trace and risk.
+    sources: already-retrieved results for question, used instead of retrieving it again.
+    analysis: question analysis done while routing, used instead of analyzing again.
+    resume_run_id: run_id from an earlier error response; that run continues after its last completed node.
+    On failure the run's checkpoints are kept and its run_id is returned in the error response.
+    """
+    graph = get_decision_graph()
+    config, run_input = _start_run(graph, question, sources, analysis, resume_run_id)
+    try:
+        final_state = graph.invoke(run_input, config=config)
+    except Exception as e:
+        logger.exception("Decision graph failed: %s", e)
+        return _error_response(_failed_run_id(graph, config))
+    except BaseException:  # interrupted: no run_id reaches the caller, so nothing can resume it
+        _release_run(graph, config)
+        raise
+    response = _response_from_state(final_state)
+    _release_run(graph, config)
+    return response
+
+
+async def arun_decision_agent(
+    question: str,
+    sources: Optional[List[Source]] = None,
+    analysis: Optional[dict[str, Any]] = None,
+    resume_run_id: Optional[str] = None,
+) -> AskResponse:
+    """Async variant of run_decision_agent: runs the graph with ainvoke (async node twins)."""
+    graph = get_decision_graph()
+    config, run_input = _start_run(graph, question, sources, analysis, resume_run_id)
+    try:
+        final_state = await graph.ainvoke(run_input, config=config)
+    except Exception as e:
+        logger.exception("Decision graph failed: %s", e)
+        return _error_response(_failed_run_id(graph, config))
+    except BaseException:  # cancelled (client gone, timeout): no run_id reaches the caller
+        _release_run(graph, config)
+        raise
+    response = _response_from_state(final_state)
+    _release_run(graph, config)
+    return response
+
+
+async def astream_decision_agent(
+    question: str,
+    sources: Optional[List[Source]] = None,
+    analysis: Optional[dict[str, Any]] = None,
+    resume_run_id: Optional[str] = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Run the graph with astream_events and yield stream events as they happen:
+    {"event": "node_start" | "node_end", "data": {"node", ["summary"]}} per graph node,
+    {"event": "token", "data": {"text"}} for decision_synthesis output, then
+    {"event": "done", "data": AskResponse}. A resumed run only streams the nodes it still has to run.
+    """
+    graph = get_decision_graph()
+    config, run_input = _start_run(graph, question, sources, analysis, resume_run_id, stream_tokens=True)
+    final_state: dict[str, Any] = {}
+    try:
+        async for event in graph.astream_events(run_input, config=config, version="v2"):
+            kind = event["event"]
+            name = event.get("name", "")
+            if kind == "on_custom_event" and name == "token":
+                yield {"event": "token", "data": {"text": event["data"].get("text", "")}}
+                continue
+            # Node runs are the chain events whose name matches the graph node they run in
+            if name != (event.get("metadata") or {}).get("langgraph_node"):
+                continue
+            if kind == "on_chain_start":
+                yield {"event": "node_start", "data": {"node": name}}
+            elif kind == "on_chain_end":
+                output = (event.get("data") or {}).get("output")
+                trace = output.get("reasoning_trace") if isinstance(output, dict) else None
+                summary = trace[-1].get("summary", "") if trace else ""
+                yield {"event": "node_end", "data": {"node": name, "summary": summary}}
+        snapshot = await graph.aget_state(config)
+        final_state = snapshot.values
+    except Exception as e:
+        logger.exception("Decision graph failed: %s", e)
+        yield {"event": "done", "data": _error_response(_failed_run_id(graph, config))}
+        return
+    except BaseException:  # client went away mid-stream: it never received a run_id, so nothing can resume it
+        _release_run(graph, config)
+        raise
+    response = _response_from_state(final_state)
+    _release_run(graph, config)
+    yield {"event": "done", "data": response}
@@ -1,16 +1,32 @@
 """Insight Agent: RAG-based, grounded in internal documents, with sources."""
 
+import asyncio
 import logging
 import re
-from typing import List
+from typing import Any, AsyncIterator, List, Optional
 
-from src.models.schemas import AgentType, AskResponse, Source
-from src.llm.factory import invoke_for_text
+from config import get_settings
+from src.models.schemas import AgentType, AskResponse, ReasoningStep, Source
+from src.llm.factory import ainvoke_for_text, astream_text, invoke_for_text
+from src.llm.prompt_budget import build_prompt
+from src.llm.resilience import CircuitOpenError
 from src.prompts.insight_prompt import INSIGHT_SYSTEM_PROMPT, INSIGHT_USER_TEMPLATE
+from src.retrieval.metrics_store import find_periods, list_metric_keys, lookup_metric, normalize_metric, strip_periods
 from src.retrieval.vector_store import query_documents
 
 logger = logging.getLogger(__name__)
 
+# Questions asking for analysis rather than a single figure always go through retrieval + LLM
+_ANALYTICAL_RE = re.compile(r"\b(why|trend|compare|comparison|versus|vs|explain|should|impact|driv\w*|change[ds]?|over the)\b", re.I)
+
+# Question wording around the metric name in an exact lookup ("what was our ... in", "... for fiscal year").
+# Whatever is left once these are trimmed from both ends must be a stored metric name, word for word, so
+# qualified asks ("revenue growth", "revenue per share", "YoY revenue") never get the bare metric's figure.
+_LEADING_WORDS = frozenset(
+    "what whats s was were is are did do does how much tell me give show please the our company reported report".split()
+)
+_TRAILING_WORDS = frozenset("in for during of at as the fiscal year quarter half".split())
+
 
 def _strip_source_artifacts_from_answer(text: str) -> str:
     """Remove any Source N, relevance %, and boilerplate that should not appear in the answer."""
@@ -67,40 +83,201 @@ Question: {question}
 Bullet-point summary:"""
 
 
-def run_insight_agent(question: str) -> AskResponse:
-    """Retrieve relevant docs, build context, generate grounded answer with sources."""
-    sources_list = query_documents(question)
-    # Pass context without "Source 1/2" labels so the LLM does not echo them
-    context = "\n\n---\n\n".join(
-        (s.content or "").strip() for s in sources_list
+def _metric_phrase(question: str) -> str:
+    """The question minus its period and the question wording around it, normalised like stored metric names."""
+    words = normalize_metric(strip_periods(question)).split()
+    while words and words[0] in _LEADING_WORDS:
+        words.pop(0)
+    while words and words[-1] in _TRAILING_WORDS:
+        words.pop()
+    return " ".join(words)
+
+
+def _answer_from_metrics(question: str) -> Optional[AskResponse]:
+    """
+    Fast path for exact lookups ("What was revenue in Q4 FY2025?"): one period, and the rest of the question
+    is exactly one known metric name, answered straight from the metrics store with a citation. None otherwise.
+    """
+    if _ANALYTICAL_RE.search(question):
+        return None
+    periods = set(find_periods(question))
+    if len(periods) != 1:
+        return None
+    metric_key = _metric_phrase(question)
+    if not metric_key or metric_key not in set(list_metric_keys()):
+        return None
+    period = periods.pop()
+    rows = lookup_metric(metric_key, period)
+    if not rows or len({r.value for r in rows}) != 1:
+        return None  # missing or conflicting figures: let the full agent reconcile
+
+    row = rows[0]
+    scale = row.unit.replace("$", "").strip()
+    unit = f" ({scale})" if scale and scale != "%" else ""
+    cited = "; ".join(
+        f"{r.source_file}" + (f", page {r.page}" if r.page else "") for r in rows
+    )
+    answer = f"**{row.metric}** for **{row.period}**: **{row.value_text}**{unit}.\n\nSource: {cited}."
+    sources = [
+        Source(
+            content=f"{r.metric} | {r.period} | {r.value_text}{(' ' + r.unit) if r.unit not in ('', '$', '%') else ''}",
+            metadata={"source_file": r.source_file, "page": r.page, "metric": r.metric, "period": r.period},
+            score=1.0,
+        )
+        for r in rows
+    ]
+    return AskResponse(
+        agent_type=AgentType.INSIGHT,
+        answer=answer,
+        sources=sources,
+        reasoning_trace=[ReasoningStep(node="metrics_lookup", summary="Answered from structured metrics store")],
+        risk_summary=None,
     )
-    if not context.strip():
-        context = "No relevant internal documents were found for this question."
 
-    user_prompt = INSIGHT_USER_TEMPLATE.format(context=context, question=question)
-    full_prompt = f"{INSIGHT_SYSTEM_PROMPT}\n\n{user_prompt}"
-    answer = None
+
+def _metrics_fast_path(question: str) -> Optional[AskResponse]:
+    if not get_settings().metrics_fast_path:
+        return None
     try:
-        answer = invoke_for_text(full_prompt)
-        if answer and answer.strip():
-            answer = _strip_source_artifacts_from_answer(answer)
+        return _answer_from_metrics(question)
     except Exception as e:
-        logger.warning("Main LLM call failed (%s), trying shorter fallback prompt", e)
-        try:
-            short_context = context[:2000].rstrip() + ("..." if len(context) > 2000 else "")
-            simple_prompt = _SIMPLE_SUMMARY_PROMPT.format(context=short_context, question=question)
-            answer = invoke_for_text(simple_prompt)
-            if answer and answer.strip():
-                answer = _strip_source_artifacts_from_answer(answer)
-        except Exception as e2:
-            logger.exception("Fallback LLM call also failed: %s", e2)
-    if not (answer and answer.strip()):
+        logger.warning("Metrics fast path failed (%s), using retrieval", e)
+        return None
+
+
+def _context_chunks(sources_list: List[Source]) -> List[str]:
+    """Chunk texts in retrieval (relevance) order, without "Source 1/2" labels so the LLM does not echo them."""
+    chunks = [(s.content or "").strip() for s in sources_list]
+    chunks = [c for c in chunks if c]
+    return chunks or ["No relevant internal documents were found for this question."]
+
+
+def _main_prompt(chunks: List[str], question: str) -> str:
+    prompt, _ = build_prompt(
+        "insight",
+        INSIGHT_SYSTEM_PROMPT,
+        INSIGHT_USER_TEMPLATE,
+        fixed={"question": question},
+        chunks={"context": chunks},
+        separator="\n\n---\n\n",
+    )
+    return prompt
+
+
+def _fallback_prompt(chunks: List[str], question: str) -> str:
+    prompt, _ = build_prompt(
+        "insight_fallback",
+        "",
+        _SIMPLE_SUMMARY_PROMPT,
+        fixed={"question": question},
+        chunks={"context": chunks},
+        separator="\n\n---\n\n",
+    )
+    return prompt
+
+
+def _clean_answer(answer: Optional[str]) -> Optional[str]:
+    if answer and answer.strip():
+        return _strip_source_artifacts_from_answer(answer)
+    return answer
+
+
+def _insight_response(question: str, sources_list: List[Source], answer: Optional[str]) -> AskResponse:
+    degraded = not (answer and answer.strip())
+    if degraded:
         answer = _format_answer_from_sources(question, sources_list)
 
-    return AskResponse(
+    response = AskResponse(
         agent_type=AgentType.INSIGHT,
         answer=answer,
         sources=sources_list,
         reasoning_trace=None,
         risk_summary=None,
     )
+    response._cacheable = not degraded
+    return response
+
+
+def run_insight_agent(question: str, sources: Optional[List[Source]] = None) -> AskResponse:
+    """
+    Retrieve relevant docs, build context, generate grounded answer with sources.
+    sources: already-retrieved results for question (speculative retrieval), used instead of querying again.
+    """
+    fast = _metrics_fast_path(question)
+    if fast is not None:
+        return fast
+    sources_list = sources if sources is not None else query_documents(question)
+    chunks = _context_chunks(sources_list)
+    full_prompt = _main_prompt(chunks, question)
+    answer = None
+    try:
+        answer = _clean_answer(invoke_for_text(full_prompt, purpose="insight"))
+    except CircuitOpenError as e:
+        logger.warning("LLM unavailable (%s), answering from sources", e)
+    except Exception as e:
+        logger.warning("Main LLM call failed (%s), trying shorter fallback prompt", e)
+        try:
+            answer = _clean_answer(invoke_for_text(_fallback_prompt(chunks, question), purpose="insight"))
+        except Exception as e2:
+            logger.exception("Fallback LLM call also failed: %s", e2)
+    return _insight_response(question, sources_list, answer)
+
+
+async def arun_insight_agent(question: str, sources: Optional[List[Source]] = None) -> AskResponse:
+    """Async variant of run_insight_agent: store lookups run in worker threads, LLM calls on the async client."""
+    fast = await asyncio.to_thread(_metrics_fast_path, question)
+    if fast is not None:
+        return fast
+    sources_list = sources if sources is not None else await asyncio.to_thread(query_documents, question)
+    chunks = _context_chunks(sources_list)
+    full_prompt = _main_prompt(chunks, question)
+    answer = None
+    try:
+        answer = _clean_answer(await ainvoke_for_text(full_prompt, purpose="insight"))
+    except CircuitOpenError as e:
+        logger.warning("LLM unavailable (%s), answering from sources", e)
+    except Exception as e:
+        logger.warning("Main LLM call failed (%s), trying shorter fallback prompt", e)
+        try:
+            answer = _clean_answer(await ainvoke_for_text(_fallback_prompt(chunks, question), purpose="insight"))
+        except Exception as e2:
+            logger.exception("Fallback LLM call also failed: %s", e2)
+    return _insight_response(question, sources_list, answer)
+
+
+async def astream_insight_agent(question: str, sources: Optional[List[Source]] = None) -> AsyncIterator[dict[str, Any]]:
+    """
+    Streaming variant of arun_insight_agent: yields {"event": "token", "data": {"text"}} as the answer is
+    generated, then {"event": "done", "data": AskResponse} whose answer is the cleaned full text.
+    """
+    fast = await asyncio.to_thread(_metrics_fast_path, question)
+    if fast is not None:
+        yield {"event": "done", "data": fast}
+        return
+    sources_list = sources if sources is not None else await asyncio.to_thread(query_documents, question)
+    chunks = _context_chunks(sources_list)
+    full_prompt = _main_prompt(chunks, question)
+    parts: list[str] = []
+    partial = False
+    try:
+        async for delta in astream_text(full_prompt, purpose="insight"):
+            parts.append(delta)
+            yield {"event": "token", "data": {"text": delta}}
+    except CircuitOpenError as e:
+        logger.warning("LLM unavailable (%s), answering from sources", e)
+    except Exception as e:
+        if parts:
+            logger.warning("Insight stream broke midway (%s), keeping partial answer", e)
+            partial = True
+        else:
+            logger.warning("Main LLM call failed (%s), trying shorter fallback prompt", e)
+            try:
+                fallback = await ainvoke_for_text(_fallback_prompt(chunks, question), purpose="insight")
+                parts = [fallback]
+                yield {"event": "token", "data": {"text": fallback}}
+            except Exception as e2:
+                logger.exception("Fallback LLM call also failed: %s", e2)
+    response = _insight_response(question, sources_list, _clean_answer("".join(parts)))
+    if partial:
+        response._cacheable = False
+    yield {"event": "done", "data": response}
@@ -0,0 +1,215 @@
+"""Local insight / strategic question classifier: nearest centroid over the MiniLM question embeddings."""
+
+import json
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import get_settings
+from src.observability.metrics import CLASSIFIER_AGREEMENT, CLASSIFIER_DECISIONS, CLASSIFIER_SECONDS
+from src.retrieval.embeddings import get_embedding_model
+
+logger = logging.getLogger(__name__)
+
+LABELS: Tuple[str, str] = ("insight", "strategic")
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class CentroidClassifier:
+    """
+    One unit-length centroid per label. A question goes to the label whose centroid is most similar;
+    confidence is the cosine margin between the two labels (0 = undecided).
+    """
+
+    def __init__(self, centroids: np.ndarray, embedding_model: str, trained_on: int) -> None:
+        self.centroids = _unit(np.asarray(centroids, dtype=np.float32))
+        self.embedding_model = embedding_model
+        self.trained_on = trained_on
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, labels: Sequence[str], embedding_model: str) -> "CentroidClassifier":
+        vectors = _unit(np.asarray(vectors, dtype=np.float32))
+        labels = np.asarray(labels)
+        missing = [label for label in LABELS if not (labels == label).any()]
+        if missing:
+            raise ValueError(f"Seed data has no examples for: {', '.join(missing)}")
+        centroids = np.stack([vectors[labels == label].mean(axis=0) for label in LABELS])
+        return cls(centroids, embedding_model, len(labels))
+
+    def predict(self, vector: np.ndarray) -> Tuple[Literal["insight", "strategic"], float]:
+        """(label, margin) for one question embedding."""
+        sims = self.centroids @ _unit(np.asarray(vector, dtype=np.float32))
+        best = int(np.argmax(sims))
+        return LABELS[best], float(sims[best] - sims[1 - best])  # type: ignore[return-value]
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, centroids=self.centroids, embedding_model=self.embedding_model, trained_on=self.trained_on)
+
+    @classmethod
+    def load(cls, path: Path) -> "CentroidClassifier":
+        with np.load(path) as data:
+            return cls(data["centroids"], str(data["embedding_model"]), int(data["trained_on"]))
+
+
+def load_seed(path: Path) -> List[Tuple[str, str]]:
+    """(question, label) pairs from a JSONL file of {"question": ..., "label": "insight" | "strategic"}."""
+    examples: List[Tuple[str, str]] = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            label = str(row.get("label", "")).strip().lower()
+            question = str(row.get("question", "")).strip()
+            if label not in LABELS or not question:
+                raise ValueError(f"{path}:{line_no}: expected a question and a label in {LABELS}")
+            examples.append((question, label))
+    return examples
+
+
+def train_from_seed(seed_path: Path) -> Tuple[CentroidClassifier, dict]:
+    """Embed the seed questions and fit centroids. Also reports leave-one-out accuracy and margins."""
+    examples = load_seed(seed_path)
+    model_name = get_settings().embedding_model_name
+    vectors = _unit(np.asarray(get_embedding_model().embed_documents([q for q, _ in examples]), dtype=np.float32))
+    labels = [label for _, label in examples]
+    classifier = CentroidClassifier.train(vectors, labels, model_name)
+
+    correct = 0
+    margins: List[float] = []
+    for i in range(len(examples)):
+        keep = [j for j in range(len(examples)) if j != i]
+        held_out = CentroidClassifier.train(vectors[keep], [labels[j] for j in keep], model_name)
+        predicted, margin = held_out.predict(vectors[i])
+        correct += predicted == labels[i]
+        margins.append(margin)
+    report = {
+        "examples": len(examples),
+        "per_label": {label: labels.count(label) for label in LABELS},
+        "leave_one_out_accuracy": round(correct / len(examples), 4),
+        "median_margin": round(float(np.median(margins)), 4),
+    }
+    return classifier, report
+
+
+_classifier: Optional[CentroidClassifier] = None
+_classifier_loaded = False
+_classifier_lock = threading.Lock()
+
+
+def get_question_classifier() -> Optional[CentroidClassifier]:
+    """
+    The trained classifier from QUESTION_CLASSIFIER_PATH, trained from the seed file (and saved) on first use
+    when missing or built for another embedding model. None when disabled or unavailable (LLM is used).
+    """
+    global _classifier, _classifier_loaded
+    settings = get_settings()
+    if not settings.question_classifier_enabled:
+        return None
+    if _classifier_loaded:
+        return _classifier
+    with _classifier_lock:
+        if _classifier_loaded:
+            return _classifier
+        path = settings.question_classifier_path
+        try:
+            if path.exists():
+                loaded = CentroidClassifier.load(path)
+                if loaded.embedding_model == settings.embedding_model_name:
+                    _classifier = loaded
+                else:
+                    logger.info("Question classifier was trained for %s; retraining", loaded.embedding_model)
+            if _classifier is None:
+                _classifier, report = train_from_seed(settings.question_classifier_seed_path)
+                _classifier.save(path)
+                logger.info("Trained question classifier from seed: %s", report)
+        except Exception as e:
+            logger.warning("Local question classifier unavailable (%s); using the LLM classifier", e)
+            _classifier = None
+        _classifier_loaded = True
+        return _classifier
+
+
+def reset_question_classifier() -> None:
+    """Reload from disk on next use (after retraining with the CLI)."""
+    global _classifier, _classifier_loaded
+    with _classifier_lock:
+        _classifier = None
+        _classifier_loaded = False
+
+
+def classify_locally(
+    question: str, vector: Optional[np.ndarray] = None
+) -> Optional[Tuple[Literal["insight", "strategic"], float]]:
+    """(label, margin) from the local classifier, reusing vector when the question is already embedded."""
+    classifier = get_question_classifier()
+    if classifier is None:
+        return None
+    started = time.perf_counter()
+    try:
+        if vector is None:
+            vector = np.asarray(get_embedding_model().embed_query(question), dtype=np.float32)
+        return classifier.predict(vector)
+    except Exception as e:
+        logger.warning("Local question classifier failed (%s)", e)
+        return None
+    finally:
+        CLASSIFIER_SECONDS.observe(time.perf_counter() - started, method="local")
+
+
+def is_confident(margin: float) -> bool:
+    return margin >= get_settings().question_classifier_min_margin
+
+
+def record_decision(method: str, label: str) -> None:
+    CLASSIFIER_DECISIONS.inc(method=method, label=label)
+
+
+def record_agreement(local_label: str, llm_label: str) -> None:
+    CLASSIFIER_AGREEMENT.inc(result="agree" if local_label == llm_label else "disagree")
+
+
+def should_shadow() -> bool:
+    """Whether to also ask the LLM about a confident local decision (QUESTION_CLASSIFIER_SHADOW_RATE)."""
+    rate = get_settings().question_classifier_shadow_rate
+    return rate > 0 and random.random() < rate
+
+
+def shadow_check(local_label: str, classify_with_llm: Callable[[], str]) -> None:
+    """Compare a confident local decision with the LLM in a background thread; only the agreement metric changes."""
+
+    def run() -> None:
+        try:
+            record_agreement(local_label, classify_with_llm())
+        except Exception as e:
+            logger.debug("Shadow classification failed: %s", e)
+
+    threading.Thread(target=run, name="classifier-shadow", daemon=True).start()
+
+
+def get_question_classifier_stats() -> dict:
+    """Local vs LLM decisions, agreement rate on compared questions, and mean local latency."""
+    local = sum(CLASSIFIER_DECISIONS.value(method="local", label=label) for label in LABELS)
+    llm = sum(CLASSIFIER_DECISIONS.value(method="llm", label=label) for label in LABELS)
+    agree = CLASSIFIER_AGREEMENT.value(result="agree")
+    compared = agree + CLASSIFIER_AGREEMENT.value(result="disagree")
+    count, total = CLASSIFIER_SECONDS.count_and_sum(method="local")
+    return {
+        "enabled": get_settings().question_classifier_enabled,
+        "local_decisions": int(local),
+        "llm_decisions": int(llm),
+        "compared": int(compared),
+        "agreement_rate": round(agree / compared, 4) if compared else None,
+        "mean_local_ms": round(1000 * total / count, 2) if count else None,
+    }
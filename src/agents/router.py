@@ -1,48 +1,336 @@
 """Question classification and routing to Insight or Decision agent."""
 
+import asyncio
 import logging
-from typing import Literal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, List, Literal, Optional
 
-from src.agents.insight_agent import run_insight_agent
-from src.agents.decision_agent import run_decision_agent
-from src.llm.factory import invoke_for_text
+import numpy as np
+
+from config import get_settings
+from src.agents import question_classifier
+from src.agents.answer_cache import SemanticAnswerCache, get_answer_cache
+from src.agents.insight_agent import arun_insight_agent, astream_insight_agent, run_insight_agent
+from src.agents.decision_agent import arun_decision_agent, astream_decision_agent, run_decision_agent
+from src.graph.nodes.question_analyzer import aanalyze_question, analyze_question
+from src.llm.factory import ainvoke_for_text, invoke_for_text
 from src.prompts.question_classifier_prompt import CLASSIFIER_SYSTEM_PROMPT, CLASSIFIER_USER_TEMPLATE
-from src.models.schemas import AskRequest, AskResponse, AgentType
+from src.models.schemas import AskRequest, AskResponse, AgentType, Source
+from src.observability.metrics import CLASSIFIER_SECONDS
+from src.retrieval.vector_store import get_corpus_version, query_documents
 
 logger = logging.getLogger(__name__)
 
+# Speculative retrieval for sync auto-mode requests (the async path uses asyncio.to_thread)
+_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="prefetch")
+
 
-def classify_question(question: str) -> Literal["insight", "strategic"]:
-    """Use lightweight LLM prompt to classify as factual (insight) or strategic (decision agent)."""
+def _classifier_prompt(question: str) -> str:
     user = CLASSIFIER_USER_TEMPLATE.format(question=question)
-    full = f"{CLASSIFIER_SYSTEM_PROMPT}\n\n{user}"
+    return f"{CLASSIFIER_SYSTEM_PROMPT}\n\n{user}"
+
+
+def _parse_classification(raw: str) -> Literal["insight", "strategic"]:
+    if "strategic" in raw.strip().lower():
+        return "strategic"
+    return "insight"
+
+
+def _llm_classify(question: str) -> Literal["insight", "strategic"]:
+    return _parse_classification(invoke_for_text(_classifier_prompt(question), purpose="classify"))
+
+
+def _local_decision(
+    question: str, local: Optional[tuple[Literal["insight", "strategic"], float]]
+) -> Optional[Literal["insight", "strategic"]]:
+    """The local label when it is confident (optionally shadow-checked against the LLM), else None."""
+    if local is None or not question_classifier.is_confident(local[1]):
+        return None
+    label = local[0]
+    question_classifier.record_decision("local", label)
+    if question_classifier.should_shadow():
+        question_classifier.shadow_check(label, lambda: _llm_classify(question))
+    return label
+
+
+def _llm_decision(
+    local: Optional[tuple[Literal["insight", "strategic"], float]], raw: Optional[str], error: Optional[Exception]
+) -> Literal["insight", "strategic"]:
+    if error is not None:
+        if local is not None:
+            logger.warning("LLM classifier failed (%s), using low-confidence local label %s", error, local[0])
+            question_classifier.record_decision("local", local[0])
+            return local[0]
+        logger.warning("Classifier failed (%s), defaulting to strategic", error)
+        return "strategic"
+    label = _parse_classification(raw or "")
+    question_classifier.record_decision("llm", label)
+    if local is not None:
+        question_classifier.record_agreement(local[0], label)
+    return label
+
+
+def classify_question(question: str, vector: Optional[np.ndarray] = None) -> Literal["insight", "strategic"]:
+    """
+    Classify as factual (insight) or strategic (decision agent). The local embedding classifier decides when
+    confident (vector: the question embedding, if already computed); otherwise a lightweight LLM prompt does.
+    """
+    local = question_classifier.classify_locally(question, vector)
+    label = _local_decision(question, local)
+    if label is not None:
+        return label
+    started = time.perf_counter()
+    raw, error = None, None
     try:
-        raw = invoke_for_text(full).strip().lower()
-        if "strategic" in raw:
-            return "strategic"
-        return "insight"
+        raw = invoke_for_text(_classifier_prompt(question), purpose="classify")
     except Exception as e:
-        logger.warning("Classifier failed (%s), defaulting to strategic", e)
-        return "strategic"
+        error = e
+    CLASSIFIER_SECONDS.observe(time.perf_counter() - started, method="llm")
+    return _llm_decision(local, raw, error)
 
 
-def route_and_answer(request: AskRequest) -> AskResponse:
-    """Route by mode (or classify when auto) and return response."""
-    question = request.question.strip()
-    if not question:
-        return AskResponse(
-            agent_type=AgentType.INSIGHT,
-            answer="Please provide a question.",
-            sources=[],
-        )
+async def aclassify_question(question: str, vector: Optional[np.ndarray] = None) -> Literal["insight", "strategic"]:
+    """Async variant of classify_question; the local classifier runs in a worker thread."""
+    local = await asyncio.to_thread(question_classifier.classify_locally, question, vector)
+    label = _local_decision(question, local)
+    if label is not None:
+        return label
+    started = time.perf_counter()
+    raw, error = None, None
+    try:
+        raw = await ainvoke_for_text(_classifier_prompt(question), purpose="classify")
+    except Exception as e:
+        error = e
+    CLASSIFIER_SECONDS.observe(time.perf_counter() - started, method="llm")
+    return _llm_decision(local, raw, error)
 
-    mode = (request.mode or "auto").lower()
+
+def _analysis_decision(
+    local: Optional[tuple[Literal["insight", "strategic"], float]],
+    analysis: Optional[dict[str, Any]],
+    error: Optional[Exception],
+) -> tuple[Literal["insight", "strategic"], Optional[dict[str, Any]]]:
+    raw = None if analysis is None else ("insight" if analysis.get("classification") == "factual" else "strategic")
+    kind = _llm_decision(local, raw, error)
+    return kind, analysis if kind == "strategic" else None
+
+
+def route_question(
+    question: str, vector: Optional[np.ndarray] = None
+) -> tuple[Literal["insight", "strategic"], Optional[dict[str, Any]]]:
+    """
+    Auto-mode routing: (kind, analysis). A confident local classifier decides alone. Otherwise, with
+    COMBINED_ANALYSIS, one question-analyzer call both classifies and (for strategic questions) produces the
+    intent and sub-questions the decision graph would generate next; analysis is passed on so the graph skips
+    that call. Without COMBINED_ANALYSIS the short classifier prompt is used and analysis is None.
+    """
+    if not get_settings().combined_analysis:
+        return classify_question(question, vector), None
+    local = question_classifier.classify_locally(question, vector)
+    label = _local_decision(question, local)
+    if label is not None:
+        return label, None
+    started = time.perf_counter()
+    analysis, error = None, None
+    try:
+        analysis = analyze_question(question)
+    except Exception as e:
+        error = e
+    CLASSIFIER_SECONDS.observe(time.perf_counter() - started, method="llm")
+    return _analysis_decision(local, analysis, error)
+
+
+async def aroute_question(
+    question: str, vector: Optional[np.ndarray] = None
+) -> tuple[Literal["insight", "strategic"], Optional[dict[str, Any]]]:
+    """Async variant of route_question."""
+    if not get_settings().combined_analysis:
+        return await aclassify_question(question, vector), None
+    local = await asyncio.to_thread(question_classifier.classify_locally, question, vector)
+    label = _local_decision(question, local)
+    if label is not None:
+        return label, None
+    started = time.perf_counter()
+    analysis, error = None, None
+    try:
+        analysis = await aanalyze_question(question)
+    except Exception as e:
+        error = e
+    CLASSIFIER_SECONDS.observe(time.perf_counter() - started, method="llm")
+    return _analysis_decision(local, analysis, error)
+
+
+def _prefetch(question: str) -> Optional[List[Source]]:
+    """Retrieval for the question ahead of routing; None on failure (the agent then retrieves itself)."""
+    try:
+        return query_documents(question)
+    except Exception as e:
+        logger.warning("Speculative retrieval failed (%s); agent will retrieve", e)
+        return None
+
+
+def _route_and_prefetch(
+    question: str, vector: Optional[np.ndarray]
+) -> tuple[Literal["insight", "strategic"], Optional[dict[str, Any]], Optional[List[Source]]]:
+    """Route while retrieving for the question in a worker thread: both agents start from that retrieval."""
+    if not get_settings().speculative_retrieval:
+        return (*route_question(question, vector), None)
+    future = _prefetch_pool.submit(_prefetch, question)
+    kind, analysis = route_question(question, vector)
+    return kind, analysis, future.result()
+
+
+async def _aroute_and_prefetch(
+    question: str, vector: Optional[np.ndarray]
+) -> tuple[Literal["insight", "strategic"], Optional[dict[str, Any]], Optional[List[Source]]]:
+    """Async variant of _route_and_prefetch: time to route is max(classify, retrieve) rather than the sum."""
+    if not get_settings().speculative_retrieval:
+        return (*await aroute_question(question, vector), None)
+    retrieval = asyncio.ensure_future(asyncio.to_thread(_prefetch, question))
+    try:
+        kind, analysis = await aroute_question(question, vector)
+    except BaseException:
+        retrieval.cancel()
+        raise
+    return kind, analysis, await retrieval
+
+
+def _answer(question: str, mode: str, vector: Optional[np.ndarray] = None) -> AskResponse:
+    """Run the agent for mode (routing first when auto; vector is the question embedding, if computed)."""
     if mode == "insight":
         return run_insight_agent(question)
     if mode == "strategic":
         return run_decision_agent(question)
     # auto
-    kind = classify_question(question)
+    kind, analysis, sources = _route_and_prefetch(question, vector)
     if kind == "insight":
-        return run_insight_agent(question)
-    return run_decision_agent(question)
+        return run_insight_agent(question, sources)
+    return run_decision_agent(question, sources, analysis)
+
+
+async def _aanswer(question: str, mode: str, vector: Optional[np.ndarray] = None) -> AskResponse:
+    """Async variant of _answer."""
+    if mode == "insight":
+        return await arun_insight_agent(question)
+    if mode == "strategic":
+        return await arun_decision_agent(question)
+    kind, analysis, sources = await _aroute_and_prefetch(question, vector)
+    if kind == "insight":
+        return await arun_insight_agent(question, sources)
+    return await arun_decision_agent(question, sources, analysis)
+
+
+def _empty_question_response() -> AskResponse:
+    return AskResponse(
+        agent_type=AgentType.INSIGHT,
+        answer="Please provide a question.",
+        sources=[],
+    )
+
+
+def _cache_lookup(question: str, mode: str) -> tuple[Optional[SemanticAnswerCache], Optional[np.ndarray], Optional[AskResponse]]:
+    """Return (cache, question vector, cached response); cache is None when disabled or unavailable."""
+    try:
+        cache = get_answer_cache()
+        if cache is None:
+            return None, None, None
+        vector = cache.embed(question)
+        cached = cache.lookup(question, vector, mode)
+        if cached is not None:
+            logger.info("Semantic answer cache hit (mode=%s)", mode)
+        return cache, vector, cached
+    except Exception as e:
+        logger.warning("Answer cache lookup failed (%s), running agent", e)
+        return None, None, None
+
+
+def _cache_store(
+    cache: Optional[SemanticAnswerCache],
+    question: str,
+    vector: Optional[np.ndarray],
+    mode: str,
+    response: AskResponse,
+    corpus_version: int,
+) -> None:
+    if cache is not None and vector is not None and response._cacheable:
+        cache.store(question, vector, mode, response, corpus_version)
+
+
+def route_and_answer(request: AskRequest) -> AskResponse:
+    """Route by mode (or classify when auto) and return response. Near-duplicate questions are served from the semantic answer cache."""
+    question = request.question.strip()
+    if not question:
+        return _empty_question_response()
+    if request.resume_run_id:
+        # Continue a failed strategic run; it already missed the cache and was routed
+        return run_decision_agent(question, resume_run_id=request.resume_run_id)
+
+    mode = (request.mode or "auto").lower()
+    corpus_version = get_corpus_version()
+    cache, vector, cached = _cache_lookup(question, mode)
+    if cached is not None:
+        return cached
+
+    response = _answer(question, mode, vector)
+    _cache_store(cache, question, vector, mode, response, corpus_version)
+    return response
+
+
+async def aroute_and_answer(request: AskRequest) -> AskResponse:
+    """Async variant of route_and_answer; the question embedding runs in a worker thread."""
+    question = request.question.strip()
+    if not question:
+        return _empty_question_response()
+    if request.resume_run_id:
+        # Continue a failed strategic run; it already missed the cache and was routed
+        return await arun_decision_agent(question, resume_run_id=request.resume_run_id)
+
+    mode = (request.mode or "auto").lower()
+    corpus_version = get_corpus_version()
+    cache, vector, cached = await asyncio.to_thread(_cache_lookup, question, mode)
+    if cached is not None:
+        return cached
+
+    response = await _aanswer(question, mode, vector)
+    _cache_store(cache, question, vector, mode, response, corpus_version)
+    return response
+
+
+async def astream_answer(request: AskRequest) -> AsyncIterator[dict[str, Any]]:
+    """
+    Streaming variant of aroute_and_answer for POST /ask/stream. Yields {"event": "route", "data": {"agent_type"}}
+    once the agent is chosen, then the agent's token / node_start / node_end events, and finally
+    {"event": "done", "data": AskResponse}. Cache hits yield only the done event; resumed runs skip the cache and routing.
+    """
+    question = request.question.strip()
+    if not question:
+        yield {"event": "done", "data": _empty_question_response()}
+        return
+    if request.resume_run_id:
+        yield {"event": "route", "data": {"agent_type": AgentType.STRATEGIC.value}}
+        async for event in astream_decision_agent(question, resume_run_id=request.resume_run_id):
+            yield event
+        return
+
+    mode = (request.mode or "auto").lower()
+    corpus_version = get_corpus_version()
+    cache, vector, cached = await asyncio.to_thread(_cache_lookup, question, mode)
+    if cached is not None:
+        yield {"event": "done", "data": cached}
+        return
+
+    if mode in ("insight", "strategic"):
+        kind, analysis, sources = mode, None, None
+    else:
+        kind, analysis, sources = await _aroute_and_prefetch(question, vector)
+    agent_type = AgentType.INSIGHT if kind == "insight" else AgentType.STRATEGIC
+    yield {"event": "route", "data": {"agent_type": agent_type.value}}
+    if kind == "insight":
+        stream = astream_insight_agent(question, sources)
+    else:
+        stream = astream_decision_agent(question, sources, analysis)
+    async for event in stream:
+        if event["event"] == "done":
+            _cache_store(cache, question, vector, mode, event["data"], corpus_version)
+        yield event
@@ -1,15 +1,27 @@
 """FastAPI application entry. Config-driven, logging, error handling."""
 
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import get_settings
 from src.api.routes import router
+from src.graph.builder import get_checkpoint_stats, get_decision_graph
+from src.ingestion.jobs import shutdown_ingestion_jobs
 from src.ingestion.watcher import start_document_watcher, stop_document_watcher
+from src.agents.answer_cache import get_answer_cache
+from src.agents.question_classifier import get_question_classifier_stats
+from src.llm.async_client import close_async_http_client
+from src.llm.cache import get_llm_cache_stats
+from src.llm.hedging import get_hedging_stats
+from src.llm.prompt_budget import preload_tokenizers
+from src.llm.resilience import get_circuit_breaker_stats
+from src.observability.metrics import render_metrics
 
 # Logging
 settings = get_settings()
@@ -23,15 +35,20 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start document watcher on startup; stop on shutdown."""
+    """Start document watcher on startup; stop it, the ingestion workers and the async LLM client on shutdown."""
     try:
         start_document_watcher()
         logger.info("Document watcher started")
     except Exception as e:
         logger.warning("Could not start document watcher: %s", e)
+    # Load the prompt-budget tokenizers and compile the decision graph now rather than inside the first request
+    await asyncio.to_thread(preload_tokenizers)
+    await asyncio.to_thread(get_decision_graph)
     yield
     stop_document_watcher()
     logger.info("Document watcher stopped")
+    shutdown_ingestion_jobs()
+    await close_async_http_client()
 
 
 app = FastAPI(
@@ -52,5 +69,25 @@ app.include_router(router, prefix="", tags=["ask"])
 
 @app.get("/health")
 def health():
-    """Health check."""
-    return {"status": "ok"}
+    """Health check: LLM circuit-breaker and hedging state, cache, question classifier and checkpoint store stats."""
+    try:
+        cache_stats = get_llm_cache_stats()
+    except Exception as e:
+        cache_stats = {"error": str(e)}
+    answer_cache = get_answer_cache()
+    breaker = get_circuit_breaker_stats()
+    return {
+        "status": "ok" if breaker["state"] == "closed" else "degraded",
+        "llm_circuit": breaker,
+        "llm_hedging": get_hedging_stats(),
+        "llm_cache": cache_stats,
+        "answer_cache": answer_cache.stats() if answer_cache is not None else {"enabled": False},
+        "question_classifier": get_question_classifier_stats(),
+        "checkpoints": get_checkpoint_stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint: per-call-site LLM latency, tokens, retries, cache hits and errors; retrieval stage latency."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
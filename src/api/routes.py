@@ -1,14 +1,20 @@
-"""API routes. POST /ask and POST /upload for documents."""
+"""API routes. POST /ask (and /ask/stream for SSE), POST /upload and DELETE /documents/{name} for documents, GET /jobs/{id} for ingestion progress."""
 
+import json
 import logging
+import os
 from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO
 
 from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from config import get_settings
-from src.models.schemas import AskRequest, AskResponse
-from src.agents.router import route_and_answer
-from src.ingestion.document_processor import process_file, SUPPORTED_EXTENSIONS
+from src.models.schemas import AskRequest, AskResponse, IngestionJob
+from src.agents.router import aroute_and_answer, astream_answer
+from src.ingestion.document_processor import SUPPORTED_EXTENSIONS, remove_document
+from src.ingestion.jobs import get_ingestion_job, submit_ingestion_job
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +24,16 @@ ALLOWED_EXTENSIONS = {e.lower() for e in SUPPORTED_EXTENSIONS}
 
 
 @router.post("/ask", response_model=AskResponse)
-def ask(request: AskRequest) -> AskResponse:
+async def ask(request: AskRequest) -> AskResponse:
     """
     Ask a question. Mode: auto (classify), insight (RAG), or strategic (Decision Agent).
-    Returns agent_type, answer, sources, optional reasoning_trace and risk_summary.
+    Returns agent_type, answer, sources, optional reasoning_trace and risk_summary. A failed strategic run
+    also returns run_id; sending it back as resume_run_id continues that run instead of starting over.
+    Runs on the event loop: LLM calls go through the pooled async client, so concurrent
+    requests are not capped by the threadpool size.
     """
     try:
-        response = route_and_answer(request)
+        response = await aroute_and_answer(request)
         # Ensure Pydantic serialization
         return AskResponse(
             agent_type=response.agent_type,
@@ -32,45 +41,126 @@ def ask(request: AskRequest) -> AskResponse:
             sources=response.sources,
             reasoning_trace=response.reasoning_trace,
             risk_summary=response.risk_summary,
+            cached=response.cached,
+            run_id=response.run_id,
         )
     except Exception as e:
         logger.exception("Ask failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse(event: str, data: Any) -> str:
+    """One Server-Sent Events frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _ask_events(request: AskRequest) -> AsyncIterator[str]:
+    try:
+        async for item in astream_answer(request):
+            data = item["data"]
+            if isinstance(data, AskResponse):
+                data = data.model_dump(mode="json")
+            yield _sse(item["event"], data)
+    except Exception as e:
+        logger.exception("Ask stream failed: %s", e)
+        yield _sse("error", {"detail": str(e)})
+
+
+@router.post("/ask/stream")
+async def ask_stream(request: AskRequest) -> StreamingResponse:
+    """
+    Same as POST /ask, streamed as Server-Sent Events. Events: route {agent_type}; node_start / node_end
+    {node, summary} for Decision Agent steps; token {text} for answer text as it is generated;
+    done (the full AskResponse); error {detail}.
+    """
+    return StreamingResponse(
+        _ask_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 def _safe_filename(name: str) -> str:
     """Use basename only and allow only alphanumeric, dash, underscore, dot."""
     base = Path(name).name
     return "".join(c for c in base if c.isalnum() or c in "._- ").strip() or "document"
 
 
-@router.post("/upload")
-async def upload_documents(files: list[UploadFile] = File(..., description="PDF, TXT, or DOCX files")):
+def _save_upload(source: BinaryIO, dest: Path, chunk_bytes: int) -> None:
+    """
+    Stream an upload to disk in fixed-size chunks. Writes to a hidden .part file and renames,
+    so the document watcher never sees (or ingests) a half-written file.
+    """
+    tmp = dest.with_name(f".{dest.name}.part")
+    try:
+        with open(tmp, "wb") as out:
+            while True:
+                block = source.read(chunk_bytes)
+                if not block:
+                    break
+                out.write(block)
+        os.replace(tmp, dest)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+@router.post("/upload", response_model=IngestionJob, status_code=202)
+async def upload_documents(files: list[UploadFile] = File(..., description="PDF, TXT, or DOCX files")) -> IngestionJob:
     """
-    Upload one or more documents. Files are saved under data/documents and run through ingestion (chunked and added to the vector store).
+    Upload one or more documents. Files are streamed to data/documents and queued for ingestion
+    (chunked and added to the vector store) in the background. Poll GET /jobs/{job_id} for progress.
     """
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
     settings = get_settings()
     settings.ensure_dirs()
     docs_dir = Path(settings.documents_dir)
-    results = []
-    total_chunks = 0
+    queued: list[tuple[str, Path | None, str | None]] = []
     for upload in files:
         name = _safe_filename(upload.filename or "document")
         suffix = Path(name).suffix.lower()
         if suffix not in ALLOWED_EXTENSIONS:
-            results.append({"filename": name, "chunks": 0, "error": f"Unsupported type: {suffix}. Use .pdf, .txt, or .docx"})
+            queued.append((name, None, f"Unsupported type: {suffix}. Use .pdf, .txt, or .docx"))
             continue
         dest = docs_dir / name
         try:
-            content = await upload.read()
-            dest.write_bytes(content)
-            chunks = process_file(dest)
-            total_chunks += chunks
-            results.append({"filename": name, "chunks": chunks})
+            await run_in_threadpool(_save_upload, upload.file, dest, settings.upload_chunk_bytes)
+            queued.append((name, dest, None))
         except Exception as e:
-            logger.exception("Upload/ingest failed for %s: %s", name, e)
-            results.append({"filename": name, "chunks": 0, "error": str(e)})
-    successful = [r for r in results if "error" not in r]
-    return {"uploaded": len(successful), "chunks_added": total_chunks, "files": results}
+            logger.exception("Upload failed for %s: %s", name, e)
+            queued.append((name, None, str(e)))
+        finally:
+            await upload.close()
+    return submit_ingestion_job(queued)
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJob)
+def get_job(job_id: str) -> IngestionJob:
+    """Status of a background ingestion job: overall state plus per-file status and chunk counts."""
+    job = get_ingestion_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@router.delete("/documents/{source_file}")
+def delete_document(source_file: str) -> dict:
+    """
+    Delete a document: removes every file of that name under data/documents (chunks are keyed by file
+    name, so same-named files in subfolders share them) and its chunks from the vector store.
+    Keyword-index entries are tombstoned and compacted in the background.
+    """
+    name = _safe_filename(source_file)
+    paths = [p for p in Path(get_settings().documents_dir).rglob(name) if p.is_file()]
+    for path in paths:
+        path.unlink()
+    file_removed = bool(paths)
+    try:
+        chunks_removed = remove_document(name)
+    except Exception as e:
+        logger.exception("Delete failed for %s: %s", name, e)
+        raise HTTPException(status_code=500, detail=str(e))
+    if not file_removed and not chunks_removed:
+        raise HTTPException(status_code=404, detail=f"Unknown document: {name}")
+    return {"source_file": name, "file_removed": file_removed, "chunks_removed": chunks_removed}
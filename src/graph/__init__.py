@@ -1,6 +1,14 @@
 """LangGraph workflow for the Strategic Decision Agent."""
 
-from src.graph.builder import build_decision_graph
+from src.graph.builder import build_decision_graph, get_checkpoint_stats, get_decision_graph, reset_decision_graph
+from src.graph.checkpoint import BoundedMemorySaver
 from src.graph.state import DecisionGraphState
 
-__all__ = ["build_decision_graph", "DecisionGraphState"]
+__all__ = [
+    "build_decision_graph",
+    "get_decision_graph",
+    "reset_decision_graph",
+    "get_checkpoint_stats",
+    "BoundedMemorySaver",
+    "DecisionGraphState",
+]
@@ -1,11 +1,14 @@
 """LangGraph workflow builder. Conditional edges and loop for re-query / refine."""
 
 import logging
-from typing import Literal
+import threading
+from typing import Any, Literal
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 
+from src.graph.checkpoint import create_checkpointer
+from src.graph.chunk_store import get_chunk_store
 from src.graph.state import DecisionGraphState
 from src.graph.nodes import (
     question_analyzer_node,
@@ -14,7 +17,14 @@ from src.graph.nodes import (
     strategic_reasoning_node,
     risk_assessment_node,
     decision_synthesis_node,
+    aquestion_analyzer_node,
+    ainternal_research_node,
+    aknowledge_gap_node,
+    astrategic_reasoning_node,
+    arisk_assessment_node,
+    adecision_synthesis_node,
 )
+from src.graph.nodes.internal_research import pending_queries
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +33,15 @@ DEFAULT_MAX_ITERATIONS = 2
 
 
 def _route_after_knowledge_gap(state: DecisionGraphState) -> Literal["internal_research", "strategic_reasoning"]:
-    """If context insufficient and we have refined sub-questions and under max iterations, re-query else proceed."""
+    """
+    If context insufficient and refined sub-questions left queries not yet retrieved and under max iterations,
+    re-query else proceed (refined questions that were all asked before would only repeat the same retrieval).
+    """
     sufficient = state.get("context_sufficient", True)
     refined = state.get("refined_sub_questions") or []
     iteration = state.get("iteration_count", 0)
     max_iter = state.get("max_iterations", DEFAULT_MAX_ITERATIONS)
-    if not sufficient and refined and iteration < max_iter:
+    if not sufficient and refined and pending_queries(state) and iteration < max_iter:
         return "internal_research"
     return "strategic_reasoning"
 
@@ -40,13 +53,14 @@ def build_decision_graph(checkpointer=None):
     """
     graph = StateGraph(DecisionGraphState)
 
-    # Register nodes (extensible: add more nodes here)
-    graph.add_node("question_analyzer", question_analyzer_node)
-    graph.add_node("internal_research", internal_research_node)
-    graph.add_node("knowledge_gap", knowledge_gap_node)
-    graph.add_node("strategic_reasoning", strategic_reasoning_node)
-    graph.add_node("risk_assessment", risk_assessment_node)
-    graph.add_node("decision_synthesis", decision_synthesis_node)
+    # Register nodes (extensible: add more nodes here). Each pairs the sync node (graph.invoke)
+    # with its async twin (graph.ainvoke), so async callers never block the event loop.
+    graph.add_node("question_analyzer", RunnableLambda(question_analyzer_node, afunc=aquestion_analyzer_node))
+    graph.add_node("internal_research", RunnableLambda(internal_research_node, afunc=ainternal_research_node))
+    graph.add_node("knowledge_gap", RunnableLambda(knowledge_gap_node, afunc=aknowledge_gap_node))
+    graph.add_node("strategic_reasoning", RunnableLambda(strategic_reasoning_node, afunc=astrategic_reasoning_node))
+    graph.add_node("risk_assessment", RunnableLambda(risk_assessment_node, afunc=arisk_assessment_node))
+    graph.add_node("decision_synthesis", RunnableLambda(decision_synthesis_node, afunc=adecision_synthesis_node))
 
     # Entry
     graph.set_entry_point("question_analyzer")
@@ -64,11 +78,42 @@ def build_decision_graph(checkpointer=None):
     graph.add_edge("risk_assessment", "decision_synthesis")
     graph.add_edge("decision_synthesis", END)
 
-    # Optional: when looping to internal_research, we need to pass refined_sub_questions into retrieval.
-    # The internal_research node currently uses state["sub_questions"]; we can merge refined_sub_questions into sub_questions in knowledge_gap or in a small wrapper.
-    # For simplicity, internal_research_node already uses sub_questions; we'll have knowledge_gap_node set sub_questions to refined_sub_questions when we loop (so state update in knowledge_gap should add "sub_questions": refined_sub_questions when context_sufficient is False). Let me add that in knowledge_gap return.
-    # Actually when we loop, the state gets merged. So when we go back to internal_research, state["sub_questions"] will still be the original. We need to update sub_questions when we decide to re-query. So in the edge from knowledge_gap to internal_research we need the state to have sub_questions = refined_sub_questions. So in knowledge_gap_node return we add "sub_questions": state.get("refined_sub_questions") or state.get("sub_questions") when context_sufficient is False. Let me update knowledge_gap_node to return refined sub_questions as the new sub_questions when re-querying.
-    # I'll add in knowledge_gap return: if not context_sufficient and refined_sub_questions: also return {"sub_questions": refined_sub_questions, "iteration_count": (state.get("iteration_count") or 0) + 1}.
-    # And in initial state we pass iteration_count=0, max_iterations=DEFAULT_MAX_ITERATIONS.
-    comp = graph.compile(checkpointer=checkpointer or MemorySaver())
+    # Re-query loop (knowledge_gap -> internal_research) is incremental: when context is insufficient,
+    # knowledge_gap appends refined_sub_questions to sub_questions (keeping the earlier ones for the planner)
+    # and bumps iteration_count. internal_research then retrieves only queries not in executed_queries and
+    # appends the new chunk ids to chunk_ids, so earlier evidence and its numbering are kept.
+    # The initial state sets iteration_count=0 and max_iterations=DEFAULT_MAX_ITERATIONS.
+    comp = graph.compile(checkpointer=checkpointer or create_checkpointer())
     return comp
+
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_decision_graph():
+    """
+    The compiled Decision Agent graph, built once per process and shared by all requests (compiled graphs
+    are safe to run concurrently; runs are isolated by thread_id in their config). Its bounded checkpointer
+    holds each run's checkpoints until the caller deletes the thread or they are evicted.
+    """
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                _graph = build_decision_graph()
+                logger.info("Decision graph compiled")
+    return _graph
+
+
+def reset_decision_graph() -> None:
+    """Drop the shared graph so the next get_decision_graph() rebuilds it (e.g. after changing the node set)."""
+    global _graph
+    with _graph_lock:
+        _graph = None
+
+
+def get_checkpoint_stats() -> dict[str, Any]:
+    """Checkpoint store (and per-run chunk store) occupancy for health output."""
+    stats = getattr(get_decision_graph().checkpointer, "stats", None)
+    return {**(stats() if callable(stats) else {}), "chunk_store": get_chunk_store().stats()}
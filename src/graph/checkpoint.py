@@ -0,0 +1,151 @@
+"""Bounded in-memory LangGraph checkpointer: evicts whole run threads by age, count and serialized size."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import MemorySaver
+
+from config import get_settings
+from src.graph.chunk_store import get_chunk_store
+
+logger = logging.getLogger(__name__)
+
+
+def _typed_size(value: Any) -> int:
+    """Bytes in a serde.dumps_typed() result or a tuple containing them."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, tuple):
+        return sum(_typed_size(v) for v in value)
+    return 0
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    MemorySaver that keeps at most max_threads run threads and max_bytes of serialized checkpoints, and
+    drops threads idle for longer than ttl_seconds. Eviction is least-recently-used, one whole thread at a
+    time, and never touches the thread being written or a run marked in flight (mark_in_flight until
+    mark_done); an evicted thread's chunks are dropped from the chunk store too. Runs delete their own
+    thread when they finish, so in steady state only in-flight and abandoned or failed runs are held.
+    """
+
+    def __init__(self, max_threads: int, ttl_seconds: float, max_bytes: int) -> None:
+        super().__init__()
+        self.max_threads = max(1, max_threads)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max(1, max_bytes)
+        self._threads: "OrderedDict[str, list]" = OrderedDict()  # thread_id -> [last_used, bytes]
+        self._bytes = 0
+        self._evicted = 0
+        self._in_flight: set[str] = set()
+        self._lock = threading.RLock()
+
+    def mark_in_flight(self, thread_id: str) -> None:
+        """A run is executing on thread_id: its checkpoints and chunks must not be evicted under it."""
+        with self._lock:
+            self._in_flight.add(thread_id)
+
+    def mark_done(self, thread_id: str) -> None:
+        """The run on thread_id stopped (finished, failed or abandoned); it is evictable again."""
+        with self._lock:
+            self._in_flight.discard(thread_id)
+
+    def _track(self, thread_id: str, added_bytes: int = 0) -> None:
+        entry = self._threads.get(thread_id)
+        if entry is None:
+            entry = self._threads[thread_id] = [0.0, 0]
+        entry[0] = time.monotonic()
+        entry[1] += added_bytes
+        self._bytes += added_bytes
+        self._threads.move_to_end(thread_id)
+
+    def _evict(self, keep: str) -> None:
+        now = time.monotonic()
+        for thread_id in list(self._threads):
+            last_used = self._threads[thread_id][0]
+            over_capacity = len(self._threads) > self.max_threads or self._bytes > self.max_bytes
+            expired = now - last_used > self.ttl_seconds
+            if thread_id == keep or thread_id in self._in_flight:
+                continue
+            if not (expired or over_capacity):
+                break  # oldest first: the rest are newer and within limits
+            self._drop(thread_id)
+            self._evicted += 1
+
+    def _drop(self, thread_id: str) -> None:
+        entry = self._threads.pop(thread_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+        super().delete_thread(thread_id)
+        get_chunk_store().drop(thread_id)  # the run's retrieved chunks go with its checkpoints
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        with self._lock:
+            result = super().put(config, checkpoint, metadata, new_versions)
+            added = _typed_size(self.storage[thread_id][checkpoint_ns][checkpoint["id"]])
+            added += sum(_typed_size(self.blobs.get((thread_id, checkpoint_ns, k, v))) for k, v in new_versions.items())
+            self._track(thread_id, added)
+            self._evict(keep=thread_id)
+        return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        key = (thread_id, configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"])
+        with self._lock:
+            before = _typed_size(tuple(self.writes.get(key, {}).values()))
+            super().put_writes(config, writes, task_id, task_path)
+            after = _typed_size(tuple(self.writes.get(key, {}).values()))
+            self._track(thread_id, after - before)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            if thread_id in self._threads:
+                self._track(thread_id)
+            return super().get_tuple(config)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._drop(thread_id)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "threads": len(self._threads),
+                "in_flight": len(self._in_flight),
+                "bytes": self._bytes,
+                "max_threads": self.max_threads,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "evicted_threads": self._evicted,
+            }
+
+
+def create_checkpointer() -> BoundedMemorySaver:
+    """Checkpointer for the shared decision graph, sized from settings."""
+    settings = get_settings()
+    return BoundedMemorySaver(
+        max_threads=settings.checkpoint_max_threads,
+        ttl_seconds=settings.checkpoint_ttl_seconds,
+        max_bytes=int(settings.checkpoint_max_mb * 1024 * 1024),
+    )
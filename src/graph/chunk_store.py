@@ -0,0 +1,76 @@
+"""Per-run side store for retrieved chunks: graph state holds chunk ids, the bodies live here."""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Iterable, Optional
+
+from src.models.schemas import Source
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_id(source: Source) -> str:
+    """Deterministic id for a retrieved chunk: the same text from the same file always maps to the same id."""
+    key = json.dumps({"text": source.content, "source_file": source.metadata.get("source_file")}, sort_keys=True)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+class ChunkStore:
+    """
+    Chunks retrieved by each decision run, keyed by run (checkpoint thread) id and chunk id. Checkpoints then
+    snapshot a few short ids per chunk instead of every chunk body at every step. A run's chunks are dropped
+    with its checkpoints (run completion or checkpoint eviction), so the store never outlives them.
+    """
+
+    def __init__(self) -> None:
+        self._runs: dict[str, dict[str, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, run_id: str, sources: Iterable[Source]) -> list[str]:
+        """Store sources for run_id and return their ids in order. A chunk already stored keeps its first entry."""
+        ids = []
+        with self._lock:
+            chunks = self._runs.setdefault(run_id, {})
+            for source in sources:
+                cid = chunk_id(source)
+                chunks.setdefault(cid, source.model_dump())
+                ids.append(cid)
+        return ids
+
+    def get(self, run_id: str, ids: Iterable[str]) -> list[dict[str, Any]]:
+        """Stored chunks ({"content", "metadata", "score"}) for ids, in order; unknown ids are skipped (and logged)."""
+        ids = list(ids)
+        with self._lock:
+            chunks = self._runs.get(run_id) or {}
+            found = [chunks[cid] for cid in ids if cid in chunks]
+        if len(found) < len(ids):
+            logger.warning(
+                "Run %s: %d of %d chunks missing from the chunk store (run dropped?)",
+                run_id,
+                len(ids) - len(found),
+                len(ids),
+            )
+        return found
+
+    def drop(self, run_id: str) -> None:
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"runs": len(self._runs), "chunks": sum(len(c) for c in self._runs.values())}
+
+
+_store: Optional[ChunkStore] = None
+_store_lock = threading.Lock()
+
+
+def get_chunk_store() -> ChunkStore:
+    """Process-wide chunk store shared by all decision runs."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ChunkStore()
+        return _store
@@ -1,11 +1,11 @@
-"""LangGraph nodes for the Decision Agent workflow."""
+"""LangGraph nodes for the Decision Agent workflow. Each node has an async twin (a-prefixed) used by graph.ainvoke."""
 
-from src.graph.nodes.question_analyzer import question_analyzer_node
-from src.graph.nodes.internal_research import internal_research_node
-from src.graph.nodes.knowledge_gap import knowledge_gap_node
-from src.graph.nodes.strategic_reasoning import strategic_reasoning_node
-from src.graph.nodes.risk_assessment import risk_assessment_node
-from src.graph.nodes.decision_synthesis import decision_synthesis_node
+from src.graph.nodes.question_analyzer import aanalyze_question, analyze_question, question_analyzer_node, aquestion_analyzer_node
+from src.graph.nodes.internal_research import internal_research_node, ainternal_research_node
+from src.graph.nodes.knowledge_gap import knowledge_gap_node, aknowledge_gap_node
+from src.graph.nodes.strategic_reasoning import strategic_reasoning_node, astrategic_reasoning_node
+from src.graph.nodes.risk_assessment import risk_assessment_node, arisk_assessment_node
+from src.graph.nodes.decision_synthesis import decision_synthesis_node, adecision_synthesis_node
 
 __all__ = [
     "question_analyzer_node",
@@ -14,4 +14,12 @@ __all__ = [
     "strategic_reasoning_node",
     "risk_assessment_node",
     "decision_synthesis_node",
+    "aquestion_analyzer_node",
+    "ainternal_research_node",
+    "aknowledge_gap_node",
+    "astrategic_reasoning_node",
+    "arisk_assessment_node",
+    "adecision_synthesis_node",
+    "analyze_question",
+    "aanalyze_question",
 ]
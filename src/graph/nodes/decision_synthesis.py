@@ -3,28 +3,33 @@
 import logging
 from typing import Any
 
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
+
 from src.graph.state import DecisionGraphState
-from src.llm.factory import invoke_for_text
+from src.llm.factory import ainvoke_for_text, astream_text, invoke_for_text
+from src.llm.prompt_budget import PromptReport, build_prompt
 from src.prompts.synthesis_prompt import SYNTHESIS_SYSTEM_PROMPT, SYNTHESIS_USER_TEMPLATE
 
 logger = logging.getLogger(__name__)
 
 
-def decision_synthesis_node(state: DecisionGraphState) -> dict[str, Any]:
-    """Synthesize final recommendation with Executive Summary, Options, Risk, Recommendation, Assumptions, Confidence."""
-    question = state.get("question") or ""
-    strategic_options = state.get("strategic_options") or ""
-    risk_analysis = state.get("risk_analysis") or ""
-    trace = list(state.get("reasoning_trace") or [])
-    trace.append({"node": "decision_synthesis", "summary": "Synthesizing final recommendation"})
-
-    user = SYNTHESIS_USER_TEMPLATE.format(
-        question=question,
-        strategic_options=strategic_options[:5000],
-        risk_analysis=risk_analysis[:3000],
+def _synthesis_prompt(state: DecisionGraphState) -> tuple[str, PromptReport]:
+    return build_prompt(
+        "decision_synthesis",
+        SYNTHESIS_SYSTEM_PROMPT,
+        SYNTHESIS_USER_TEMPLATE,
+        fixed={"question": state.get("question") or ""},
+        texts={
+            "strategic_options": state.get("strategic_options") or "",
+            "risk_analysis": state.get("risk_analysis") or "",
+        },
+        shares={"strategic_options": 0.6, "risk_analysis": 0.4},
     )
-    full = f"{SYNTHESIS_SYSTEM_PROMPT}\n\n{user}"
-    final_answer = invoke_for_text(full)
+
+
+def _synthesis_update(state: DecisionGraphState, final_answer: str, report: PromptReport) -> dict[str, Any]:
+    step = {"node": "decision_synthesis", "summary": "Synthesizing final recommendation", "detail": report.summary()}
 
     # Extract confidence from text if present
     confidence = "MEDIUM"
@@ -37,6 +42,26 @@ def decision_synthesis_node(state: DecisionGraphState) -> dict[str, Any]:
     return {
         "final_answer": final_answer,
         "confidence_level": confidence,
-        "recommended_action": final_answer,
-        "reasoning_trace": trace,
+        "reasoning_trace": [step],
     }
+
+
+def decision_synthesis_node(state: DecisionGraphState) -> dict[str, Any]:
+    """Synthesize final recommendation with Executive Summary, Options, Risk, Recommendation, Assumptions, Confidence."""
+    prompt, report = _synthesis_prompt(state)
+    return _synthesis_update(state, invoke_for_text(prompt, purpose="synthesize"), report)
+
+
+async def adecision_synthesis_node(state: DecisionGraphState, config: RunnableConfig) -> dict[str, Any]:
+    """
+    Async variant of decision_synthesis_node (used by graph.ainvoke / astream_events). With
+    configurable.stream_tokens set, each generated chunk is dispatched as a "token" custom event.
+    """
+    prompt, report = _synthesis_prompt(state)
+    if not (config.get("configurable") or {}).get("stream_tokens"):
+        return _synthesis_update(state, await ainvoke_for_text(prompt, purpose="synthesize"), report)
+    parts: list[str] = []
+    async for delta in astream_text(prompt, purpose="synthesize"):
+        parts.append(delta)
+        await adispatch_custom_event("token", {"text": delta}, config=config)
+    return _synthesis_update(state, "".join(parts).strip(), report)
@@ -1,38 +1,117 @@
 """Internal Research node: query vector DB and gather company context."""
 
+import asyncio
 import logging
-from typing import Any
+from typing import Any, Optional
 
+from config import get_settings
+from src.graph.chunk_store import get_chunk_store
+from src.graph.pool import map_settled
 from src.graph.state import DecisionGraphState
+from src.models.schemas import Source
 from src.retrieval.vector_store import query_documents
 
 logger = logging.getLogger(__name__)
 
 
-def internal_research_node(state: DecisionGraphState) -> dict[str, Any]:
-    """Query Chroma for main question and sub-questions; aggregate context."""
+NO_CONTEXT = "No relevant internal documents found."
+
+
+def _research_update(state: DecisionGraphState, queries: list[str], results: list[Any]) -> dict[str, Any]:
+    """
+    Reduce step: store retrieved chunks in the run's chunk store and append the ids not already held, so
+    a re-query loop adds to the earlier evidence (and keeps its numbering) instead of replacing it. results
+    are in query order whatever order retrievals finished in, so the merge is deterministic. A failed
+    retrieval (an exception in results) is skipped and left out of executed_queries; if every one failed,
+    the first error is raised.
+    """
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    for query, result in zip(queries, results):
+        if isinstance(result, BaseException):
+            logger.warning("Retrieval failed for %r: %s", query, result)
+    queries = [q for q, r in zip(queries, results) if not isinstance(r, BaseException)]
+    results = [r for r in results if not isinstance(r, BaseException)]
+    store = get_chunk_store()
+    run_id = state.get("run_id") or ""
+    previous = list(state.get("chunk_ids") or [])
+    new_ids = (cid for sources in results for cid in store.put(run_id, sources))
+    chunk_ids = list(dict.fromkeys(previous + list(new_ids)))
+    detail = f"{len(queries)} queries retrieved, {len(chunk_ids) - len(previous)} chunks added"
+    return {
+        "chunk_ids": chunk_ids,
+        "retrieval_count": len(chunk_ids),
+        "executed_queries": list(state.get("executed_queries") or []) + queries,
+        "reasoning_trace": [{"node": "internal_research", "summary": "Retrieving internal company documents", "detail": detail}],
+    }
+
+
+def retrieved_sources(state: DecisionGraphState) -> list[dict[str, Any]]:
+    """The run's retrieved chunks ({"content", "metadata", "score"}) in context order, from the chunk store."""
+    return get_chunk_store().get(state.get("run_id") or "", state.get("chunk_ids") or [])
+
+
+def context_chunks(state: DecisionGraphState) -> list[str]:
+    """
+    Retrieved chunks as "[n] content" (n = position in chunk_ids, as in the sources returned to the user),
+    most relevant first, for token-budgeted prompts.
+    """
+    sources = retrieved_sources(state)
+    if not sources:
+        return [NO_CONTEXT]
+    numbered = [(i + 1, s) for i, s in enumerate(sources)]
+    numbered.sort(key=lambda item: -(item[1].get("score") or 0.0))
+    return [f"[{n}] {s.get('content', '')}" for n, s in numbered]
+
+
+def pending_queries(state: DecisionGraphState) -> list[str]:
+    """
+    Question then sub-questions, without repeats (a sub-question may restate the question) and without
+    queries already retrieved this run: on a knowledge-gap loop only the new refined sub-questions remain.
+    """
     question = state.get("question") or ""
     sub_questions = state.get("sub_questions") or []
-    trace = list(state.get("reasoning_trace") or [])
-    trace.append({"node": "internal_research", "summary": "Retrieving internal company documents"})
+    executed = set(state.get("executed_queries") or [])
+    return [q for q in dict.fromkeys([question] + list(sub_questions)) if q not in executed]
 
-    all_sources: list[dict[str, Any]] = []
-    seen = set()
 
-    for q in [question] + list(sub_questions):
-        sources = query_documents(q)
-        for s in sources:
-            key = (s.content[:100], s.metadata.get("source_file", ""))
-            if key not in seen:
-                seen.add(key)
-                all_sources.append({"content": s.content, "metadata": s.metadata, "score": s.score})
+def _prefetched(state: DecisionGraphState, query: str) -> Optional[list[Source]]:
+    """Results the router already retrieved for query (speculative retrieval), if any."""
+    ids = (state.get("prefetched_chunk_ids") or {}).get(query)
+    if ids is None:
+        return None
+    return [Source(**s) for s in get_chunk_store().get(state.get("run_id") or "", ids)]
 
-    context_parts = [f"[{i+1}] {s['content']}" for i, s in enumerate(all_sources)]
-    internal_context = "\n\n".join(context_parts) if context_parts else "No relevant internal documents found."
 
-    return {
-        "internal_context": internal_context,
-        "retrieved_sources": all_sources,
-        "retrieval_count": len(all_sources),
-        "reasoning_trace": trace,
-    }
+def internal_research_node(state: DecisionGraphState) -> dict[str, Any]:
+    """
+    Query Chroma for main question and sub-questions not yet retrieved this run; add to the context already
+    gathered. Retrievals not already prefetched run concurrently on the shared node pool (map), then merge in
+    query order (reduce).
+    """
+    queries = pending_queries(state)
+    prefetched = [_prefetched(state, q) for q in queries]
+    pending = [q for q, p in zip(queries, prefetched) if p is None]
+    fetched = iter(map_settled(query_documents, pending))
+    results = [p if p is not None else next(fetched) for p in prefetched]
+    return _research_update(state, queries, results)
+
+
+async def ainternal_research_node(state: DecisionGraphState) -> dict[str, Any]:
+    """
+    Async variant of internal_research_node: retrievals run in worker threads, at most RESEARCH_PARALLELISM
+    at a time, so the loop stays free.
+    """
+    queries = pending_queries(state)
+    limit = asyncio.Semaphore(max(1, get_settings().research_parallelism))
+
+    async def retrieve(query: str) -> list[Source]:
+        prefetched = _prefetched(state, query)
+        if prefetched is not None:
+            return prefetched
+        async with limit:
+            return await asyncio.to_thread(query_documents, query)
+
+    results = await asyncio.gather(*(retrieve(q) for q in queries), return_exceptions=True)
+    return _research_update(state, queries, list(results))
@@ -4,8 +4,10 @@ import json
 import logging
 from typing import Any
 
+from src.graph.nodes.internal_research import context_chunks
 from src.graph.state import DecisionGraphState
-from src.llm.factory import invoke_for_text
+from src.llm.factory import ainvoke_for_text, invoke_for_text
+from src.llm.prompt_budget import PromptReport, build_prompt
 
 logger = logging.getLogger(__name__)
 
@@ -24,32 +26,37 @@ Output valid JSON only:
 """
 
 
-def knowledge_gap_node(state: DecisionGraphState) -> dict[str, Any]:
-    """Detect gaps, list assumptions, set context_sufficient and optionally refined_sub_questions."""
-    question = state.get("question") or ""
-    intent = state.get("intent", "")
-    internal_context = state.get("internal_context") or ""
-    trace = list(state.get("reasoning_trace") or [])
-    trace.append({"node": "knowledge_gap", "summary": "Assessing knowledge gaps and assumptions"})
-
-    user = f"Question: {question}\nIntent: {intent}\n\nInternal context:\n{internal_context[:4000]}"
-    full = f"{KNOWLEDGE_GAP_SYSTEM}\n\n{user}"
-    try:
-        raw = invoke_for_text(full)
-        text = raw.strip()
-        if text.startswith("```"):
-            lines = text.split("\n")
-            text = "\n".join(lines[1:-1] if lines[-1].strip() == "```" else lines[1:])
-        data = json.loads(text)
-    except (json.JSONDecodeError, Exception) as e:
-        logger.warning("Knowledge gap JSON parse failed: %s", e)
-        data = {
-            "knowledge_gaps": [],
-            "assumptions": ["Limited internal data available."],
-            "context_sufficient": True,
-            "refined_sub_questions": [],
-        }
+KNOWLEDGE_GAP_USER_TEMPLATE = "Question: {question}\nIntent: {intent}\n\nInternal context:\n{context}"
+
+
+def _gap_prompt(state: DecisionGraphState) -> tuple[str, PromptReport]:
+    return build_prompt(
+        "knowledge_gap",
+        KNOWLEDGE_GAP_SYSTEM,
+        KNOWLEDGE_GAP_USER_TEMPLATE,
+        fixed={"question": state.get("question") or "", "intent": state.get("intent", "")},
+        chunks={"context": context_chunks(state)},
+    )
+
+
+def _parse_gaps(raw: str) -> dict[str, Any]:
+    text = raw.strip()
+    if text.startswith("```"):
+        lines = text.split("\n")
+        text = "\n".join(lines[1:-1] if lines[-1].strip() == "```" else lines[1:])
+    return json.loads(text)
+
+
+_DEFAULT_GAPS: dict[str, Any] = {
+    "knowledge_gaps": [],
+    "assumptions": ["Limited internal data available."],
+    "context_sufficient": True,
+    "refined_sub_questions": [],
+}
+
 
+def _gap_update(state: DecisionGraphState, data: dict[str, Any], report: PromptReport) -> dict[str, Any]:
+    step = {"node": "knowledge_gap", "summary": "Assessing knowledge gaps and assumptions", "detail": report.summary()}
     refined = data.get("refined_sub_questions", [])
     sufficient = bool(data.get("context_sufficient", True))
     out: dict[str, Any] = {
@@ -57,9 +64,32 @@ def knowledge_gap_node(state: DecisionGraphState) -> dict[str, Any]:
         "assumptions": data.get("assumptions", []),
         "context_sufficient": sufficient,
         "refined_sub_questions": refined,
-        "reasoning_trace": trace,
+        "reasoning_trace": [step],
     }
     if not sufficient and refined:
-        out["sub_questions"] = refined
+        # Keep the earlier sub-questions: research only retrieves the ones not run yet, and the planner sees all
+        out["sub_questions"] = list(dict.fromkeys(list(state.get("sub_questions") or []) + list(refined)))
         out["iteration_count"] = (state.get("iteration_count") or 0) + 1
     return out
+
+
+def knowledge_gap_node(state: DecisionGraphState) -> dict[str, Any]:
+    """Detect gaps, list assumptions, set context_sufficient and optionally refined_sub_questions."""
+    prompt, report = _gap_prompt(state)
+    try:
+        data = _parse_gaps(invoke_for_text(prompt, purpose="gap"))
+    except (json.JSONDecodeError, Exception) as e:
+        logger.warning("Knowledge gap JSON parse failed: %s", e)
+        data = dict(_DEFAULT_GAPS)
+    return _gap_update(state, data, report)
+
+
+async def aknowledge_gap_node(state: DecisionGraphState) -> dict[str, Any]:
+    """Async variant of knowledge_gap_node (used by graph.ainvoke)."""
+    prompt, report = _gap_prompt(state)
+    try:
+        data = _parse_gaps(await ainvoke_for_text(prompt, purpose="gap"))
+    except (json.JSONDecodeError, Exception) as e:
+        logger.warning("Knowledge gap JSON parse failed: %s", e)
+        data = dict(_DEFAULT_GAPS)
+    return _gap_update(state, data, report)
@@ -2,10 +2,10 @@
 
 import json
 import logging
-from typing import Any
+from typing import Any, Optional
 
 from src.graph.state import DecisionGraphState
-from src.llm.factory import get_llm, invoke_for_text
+from src.llm.factory import ainvoke_for_text, invoke_for_text
 from src.prompts.question_analyzer_prompt import (
     QUESTION_ANALYZER_SYSTEM_PROMPT,
     QUESTION_ANALYZER_USER_TEMPLATE,
@@ -14,33 +14,98 @@ from src.prompts.question_analyzer_prompt import (
 logger = logging.getLogger(__name__)
 
 
-def question_analyzer_node(state: DecisionGraphState) -> dict[str, Any]:
-    """Classify question, extract intent, generate sub-questions. Updates state."""
-    question = state.get("question") or ""
-    trace = list(state.get("reasoning_trace") or [])
-    trace.append({"node": "question_analyzer", "summary": "Analyzing question and generating sub-questions"})
-
+def _analyzer_prompt(question: str) -> str:
     user_prompt = QUESTION_ANALYZER_USER_TEMPLATE.format(question=question)
-    full_prompt = f"{QUESTION_ANALYZER_SYSTEM_PROMPT}\n\n{user_prompt}"
-    try:
-        raw = invoke_for_text(full_prompt)
-        # Strip markdown code block if present
-        text = raw.strip()
-        if text.startswith("```"):
-            lines = text.split("\n")
-            text = "\n".join(lines[1:-1] if lines[-1].strip() == "```" else lines[1:])
-        data = json.loads(text)
-    except (json.JSONDecodeError, Exception) as e:
-        logger.warning("Question analyzer JSON parse failed: %s. Using defaults.", e)
-        data = {
-            "classification": "strategic",
-            "intent": question,
-            "sub_questions": [question],
-        }
+    return f"{QUESTION_ANALYZER_SYSTEM_PROMPT}\n\n{user_prompt}"
+
+
+def _parse_analysis(raw: str) -> dict[str, Any]:
+    """Parse the analyzer's JSON, tolerating a markdown code fence."""
+    text = raw.strip()
+    if text.startswith("```"):
+        lines = text.split("\n")
+        text = "\n".join(lines[1:-1] if lines[-1].strip() == "```" else lines[1:])
+    return json.loads(text)
+
+
+def _default_analysis(question: str) -> dict[str, Any]:
+    return {
+        "classification": "strategic",
+        "intent": question,
+        "sub_questions": [question],
+    }
+
+
+def _normalize_analysis(question: str, data: dict[str, Any]) -> dict[str, Any]:
+    classification = str(data.get("classification", "strategic")).strip().lower()
+    sub_questions = [str(q) for q in (data.get("sub_questions") or []) if str(q).strip()]
+    return {
+        "classification": "factual" if classification == "factual" else "strategic",
+        "intent": data.get("intent") or question,
+        "sub_questions": sub_questions or [question],
+    }
+
+
+def analyze_question(question: str) -> dict[str, Any]:
+    """
+    One analyzer generation: {"classification": "factual" | "strategic", "intent", "sub_questions"}.
+    Raises on LLM or JSON failure. The router uses it to classify and analyze in a single call.
+    """
+    return _normalize_analysis(question, _parse_analysis(invoke_for_text(_analyzer_prompt(question), purpose="analyze")))
 
+
+async def aanalyze_question(question: str) -> dict[str, Any]:
+    """Async variant of analyze_question."""
+    raw = await ainvoke_for_text(_analyzer_prompt(question), purpose="analyze")
+    return _normalize_analysis(question, _parse_analysis(raw))
+
+
+def _analysis_update(
+    state: DecisionGraphState,
+    question: str,
+    data: dict[str, Any],
+    summary: str = "Analyzing question and generating sub-questions",
+) -> dict[str, Any]:
+    step = {"node": "question_analyzer", "summary": summary}
     return {
         "classification": data.get("classification", "strategic"),
         "intent": data.get("intent", question),
         "sub_questions": data.get("sub_questions", [question]),
-        "reasoning_trace": trace,
+        "reasoning_trace": [step],
     }
+
+
+def _prefilled_update(state: DecisionGraphState, question: str) -> Optional[dict[str, Any]]:
+    """When the router already analyzed the question (state has sub_questions), reuse it instead of generating."""
+    if not state.get("sub_questions"):
+        return None
+    data = {key: state[key] for key in ("classification", "intent", "sub_questions") if state.get(key)}
+    return _analysis_update(state, question, data, summary="Using question analysis from routing")
+
+
+def question_analyzer_node(state: DecisionGraphState) -> dict[str, Any]:
+    """Classify question, extract intent, generate sub-questions. Updates state."""
+    question = state.get("question") or ""
+    prefilled = _prefilled_update(state, question)
+    if prefilled is not None:
+        return prefilled
+    try:
+        data = analyze_question(question)
+    except (json.JSONDecodeError, Exception) as e:
+        logger.warning("Question analyzer JSON parse failed: %s. Using defaults.", e)
+        data = _default_analysis(question)
+    return _analysis_update(state, question, data)
+
+
+async def aquestion_analyzer_node(state: DecisionGraphState) -> dict[str, Any]:
+    """Async variant of question_analyzer_node (used by graph.ainvoke)."""
+    question = state.get("question") or ""
+    prefilled = _prefilled_update(state, question)
+    if prefilled is not None:
+        return prefilled
+    try:
+        data = await aanalyze_question(question)
+    except (json.JSONDecodeError, Exception) as e:
+        logger.warning("Question analyzer JSON parse failed: %s. Using defaults.", e)
+        data = _default_analysis(question)
+    return _analysis_update(state, question, data)
@@ -1,14 +1,20 @@
-"""Risk Assessment node: risks per option, score risk level."""
+"""Risk Assessment node: risks per option (one concurrent call each), score risk level."""
 
+import asyncio
 import logging
 import re
 from typing import Any
 
+from src.graph.nodes.internal_research import context_chunks
+from src.graph.pool import map_settled
 from src.graph.state import DecisionGraphState
-from src.llm.factory import invoke_for_text
+from src.llm.factory import ainvoke_for_text, invoke_for_text
+from src.llm.prompt_budget import PromptReport, build_prompt
 from src.prompts.risk_analysis_prompt import (
     RISK_ANALYSIS_SYSTEM_PROMPT,
     RISK_ANALYSIS_USER_TEMPLATE,
+    RISK_OPTION_SYSTEM_PROMPT,
+    RISK_OPTION_USER_TEMPLATE,
 )
 
 logger = logging.getLogger(__name__)
@@ -34,24 +40,113 @@ def _parse_risk_scores(text: str) -> tuple[dict[str, float], dict[str, str]]:
     return scores, levels
 
 
-def risk_assessment_node(state: DecisionGraphState) -> dict[str, Any]:
-    """Identify risks per option and score risk level."""
-    strategic_options = state.get("strategic_options") or ""
-    internal_context = state.get("internal_context") or ""
-    trace = list(state.get("reasoning_trace") or [])
-    trace.append({"node": "risk_assessment", "summary": "Assessing risks per strategic option"})
-
-    user = RISK_ANALYSIS_USER_TEMPLATE.format(
-        strategic_options=strategic_options[:5000],
-        context=internal_context[:3000],
+_OPTION_HEADER_RE = re.compile(r"^##\s*Option\s+([A-Z])\s*:\s*(.+?)\s*$", re.I | re.M)
+_ANY_HEADER_RE = re.compile(r"^##\s", re.M)
+
+
+def split_options(strategic_options: str) -> list[tuple[str, str, str]]:
+    """
+    (letter, name, block) for each "## Option X: name" section of the planner output, in order. A block runs
+    to the next "## " header, so "## Summary of trade-offs" and the like are not included.
+    """
+    options = []
+    for m in _OPTION_HEADER_RE.finditer(strategic_options or ""):
+        end = _ANY_HEADER_RE.search(strategic_options, m.end())
+        block = strategic_options[m.start(): end.start() if end else len(strategic_options)].strip()
+        options.append((m.group(1).upper(), m.group(2).strip(), block))
+    return options
+
+
+def _option_prompt(state: DecisionGraphState, letter: str, name: str, block: str) -> tuple[str, PromptReport]:
+    system = RISK_OPTION_SYSTEM_PROMPT.replace("{letter}", letter).replace("{name}", name)
+    return build_prompt(
+        "risk_option",
+        system,
+        RISK_OPTION_USER_TEMPLATE,
+        fixed={"question": state.get("question") or ""},
+        texts={"option": block},
+        chunks={"context": context_chunks(state)},
+        shares={"option": 0.4, "context": 0.6},
     )
-    full = f"{RISK_ANALYSIS_SYSTEM_PROMPT}\n\n{user}"
-    risk_analysis = invoke_for_text(full)
-    risk_scores, risk_levels = _parse_risk_scores(risk_analysis)
 
+
+def _option_block(letter: str, name: str, text: str) -> str:
+    """One option's assessment, with its header forced to the planner's letter and name for parsing."""
+    body = _OPTION_HEADER_RE.sub("", text.strip(), count=1).strip()
+    return f"## Option {letter}: {name}\n{body}"
+
+
+def _merge_options(
+    state: DecisionGraphState,
+    options: list[tuple[str, str, str]],
+    outcomes: list[Any],
+    reports: list[PromptReport],
+) -> dict[str, Any]:
+    """Join per-option results in option order; a failed option is noted, and if every option failed the first error is raised."""
+    errors = [o for o in outcomes if isinstance(o, BaseException)]
+    if len(errors) == len(outcomes):
+        raise errors[0]
+    blocks = []
+    for (letter, name, _), outcome in zip(options, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning("Risk assessment for option %s failed: %s", letter, outcome)
+            blocks.append(f"## Option {letter}: {name}\n- Risk assessment unavailable for this option.")
+        else:
+            blocks.append(_option_block(letter, name, outcome))
+    largest = max(reports, key=lambda r: r.prompt_tokens)
+    detail = f"{len(options)} options assessed concurrently ({len(errors)} failed); largest {largest.summary()}"
+    return _risk_update(state, "\n\n".join(blocks), detail)
+
+
+def _risk_prompt(state: DecisionGraphState) -> tuple[str, PromptReport]:
+    # The options under assessment get the larger share; unused room flows to the context excerpt
+    return build_prompt(
+        "risk_assessment",
+        RISK_ANALYSIS_SYSTEM_PROMPT,
+        RISK_ANALYSIS_USER_TEMPLATE,
+        texts={"strategic_options": state.get("strategic_options") or ""},
+        chunks={"context": context_chunks(state)},
+        shares={"strategic_options": 0.6, "context": 0.4},
+    )
+
+
+def _risk_update(state: DecisionGraphState, risk_analysis: str, detail: str) -> dict[str, Any]:
+    step = {"node": "risk_assessment", "summary": "Assessing risks per strategic option", "detail": detail}
+    risk_scores, risk_levels = _parse_risk_scores(risk_analysis)
     return {
         "risk_analysis": risk_analysis,
         "risk_scores": risk_scores,
         "risk_levels": risk_levels,
-        "reasoning_trace": trace,
+        "reasoning_trace": [step],
     }
+
+
+def _call(prompt: str) -> str:
+    return invoke_for_text(prompt, purpose="risk_option")
+
+
+def risk_assessment_node(state: DecisionGraphState) -> dict[str, Any]:
+    """
+    Identify risks per option and score risk level. Each "## Option X" from strategic_reasoning is assessed in
+    its own concurrent call and merged in option order; if no options can be split out, one call covers all.
+    """
+    options = split_options(state.get("strategic_options") or "")
+    if not options:
+        prompt, report = _risk_prompt(state)
+        return _risk_update(state, invoke_for_text(prompt, purpose="risk"), report.summary())
+    prompts = [_option_prompt(state, *option) for option in options]
+    outcomes = map_settled(_call, [p for p, _ in prompts])
+    return _merge_options(state, options, outcomes, [r for _, r in prompts])
+
+
+async def arisk_assessment_node(state: DecisionGraphState) -> dict[str, Any]:
+    """Async variant of risk_assessment_node (used by graph.ainvoke): per-option calls run with asyncio.gather."""
+    options = split_options(state.get("strategic_options") or "")
+    if not options:
+        prompt, report = _risk_prompt(state)
+        return _risk_update(state, await ainvoke_for_text(prompt, purpose="risk"), report.summary())
+    prompts = [_option_prompt(state, *option) for option in options]
+    outcomes = await asyncio.gather(
+        *(ainvoke_for_text(p, purpose="risk_option") for p, _ in prompts), return_exceptions=True
+    )
+    return _merge_options(state, options, list(outcomes), [r for _, r in prompts])
@@ -3,8 +3,10 @@
 import logging
 from typing import Any
 
+from src.graph.nodes.internal_research import context_chunks
 from src.graph.state import DecisionGraphState
-from src.llm.factory import invoke_for_text
+from src.llm.factory import ainvoke_for_text, invoke_for_text
+from src.llm.prompt_budget import PromptReport, build_prompt
 from src.prompts.strategic_planner_prompt import (
     STRATEGIC_PLANNER_SYSTEM_PROMPT,
     STRATEGIC_PLANNER_USER_TEMPLATE,
@@ -13,25 +15,33 @@ from src.prompts.strategic_planner_prompt import (
 logger = logging.getLogger(__name__)
 
 
-def strategic_reasoning_node(state: DecisionGraphState) -> dict[str, Any]:
-    """Generate strategic options with pros/cons from context."""
-    question = state.get("question") or ""
+def _planner_prompt(state: DecisionGraphState) -> tuple[str, PromptReport]:
     sub_questions = state.get("sub_questions") or []
-    internal_context = state.get("internal_context") or ""
-    trace = list(state.get("reasoning_trace") or [])
-    trace.append({"node": "strategic_reasoning", "summary": "Generating strategic options and trade-offs"})
-
     sub_q_str = "\n".join(f"- {q}" for q in sub_questions)
-    user = STRATEGIC_PLANNER_USER_TEMPLATE.format(
-        context=internal_context[:6000],
-        question=question,
-        sub_questions=sub_q_str or "None",
+    return build_prompt(
+        "strategic_reasoning",
+        STRATEGIC_PLANNER_SYSTEM_PROMPT,
+        STRATEGIC_PLANNER_USER_TEMPLATE,
+        fixed={"question": state.get("question") or "", "sub_questions": sub_q_str or "None"},
+        chunks={"context": context_chunks(state)},
     )
-    full = f"{STRATEGIC_PLANNER_SYSTEM_PROMPT}\n\n{user}"
-    strategic_options = invoke_for_text(full)
 
+
+def _planner_update(state: DecisionGraphState, strategic_options: str, report: PromptReport) -> dict[str, Any]:
+    step = {"node": "strategic_reasoning", "summary": "Generating strategic options and trade-offs", "detail": report.summary()}
     return {
         "strategic_options": strategic_options,
-        "trade_offs": strategic_options,
-        "reasoning_trace": trace,
+        "reasoning_trace": [step],
     }
+
+
+def strategic_reasoning_node(state: DecisionGraphState) -> dict[str, Any]:
+    """Generate strategic options with pros/cons from context."""
+    prompt, report = _planner_prompt(state)
+    return _planner_update(state, invoke_for_text(prompt, purpose="plan"), report)
+
+
+async def astrategic_reasoning_node(state: DecisionGraphState) -> dict[str, Any]:
+    """Async variant of strategic_reasoning_node (used by graph.ainvoke)."""
+    prompt, report = _planner_prompt(state)
+    return _planner_update(state, await ainvoke_for_text(prompt, purpose="plan"), report)
@@ -0,0 +1,36 @@
+"""Shared worker pool for fan-out inside sync graph nodes (sub-question retrieval, per-option risk calls)."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+from config import get_settings
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_node_pool() -> ThreadPoolExecutor:
+    """Process-wide pool, RESEARCH_PARALLELISM wide, shared by every node that fans out."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=max(1, get_settings().research_parallelism), thread_name_prefix="graph-node"
+            )
+        return _pool
+
+
+def _settled(fn: Callable[[Any], Any], item: Any) -> Any:
+    try:
+        return fn(item)
+    except Exception as e:
+        return e
+
+
+def map_settled(fn: Callable[[Any], Any], items: Iterable[Any]) -> list[Any]:
+    """
+    fn over items on the node pool, in input order. A failed call yields its exception in place of a result
+    (like asyncio.gather(..., return_exceptions=True)), so one failure does not discard the others.
+    """
+    return list(get_node_pool().map(lambda item: _settled(fn, item), items))
@@ -1,24 +1,33 @@
 """Shared state for the Decision Agent LangGraph. TypedDict for extensibility."""
 
-from typing import Any, Literal, TypedDict
+import operator
+from typing import Annotated, Literal, TypedDict
 
 
 class DecisionGraphState(TypedDict, total=False):
-    """State passed between nodes. All fields optional for flexibility and looping."""
+    """
+    State passed between nodes. All fields optional for flexibility and looping. It is checkpointed after
+    every step, so it holds references rather than bulk: retrieved chunks live in the run's chunk store
+    (src/graph/chunk_store.py) under run_id, and state keeps only their ids.
+    """
 
     # Input
     question: str
     mode: str
+    run_id: str
 
     # Question analyzer
     classification: Literal["factual", "strategic"]
     intent: str
     sub_questions: list[str]
 
-    # Internal research
-    internal_context: str
-    retrieved_sources: list[dict[str, Any]]
+    # Retrieval results already fetched by the router (query -> chunk ids), reused by internal research
+    prefetched_chunk_ids: dict[str, list[str]]
+
+    # Internal research: retrieved chunk ids in context order, and every query already retrieved this run
+    chunk_ids: list[str]
     retrieval_count: int
+    executed_queries: list[str]
 
     # Knowledge gap
     knowledge_gaps: list[str]
@@ -28,7 +37,6 @@ class DecisionGraphState(TypedDict, total=False):
 
     # Strategic reasoning
     strategic_options: str
-    trade_offs: str
 
     # Risk assessment
     risk_analysis: str
@@ -38,12 +46,11 @@ class DecisionGraphState(TypedDict, total=False):
     # Synthesis
     final_answer: str
     confidence_level: str
-    recommended_action: str
 
     # Control / routing
     next_step: str
     iteration_count: int
     max_iterations: int
 
-    # Trace for API response
-    reasoning_trace: list[dict[str, str]]
+    # Trace for API response; each node returns only its own step(s), which are appended
+    reasoning_trace: Annotated[list[dict[str, str]], operator.add]
@@ -1,11 +1,16 @@
 """Document ingestion and file monitoring."""
 
-from src.ingestion.document_processor import process_file, process_directory
+from src.ingestion.document_processor import process_file, process_directory, remove_document
+from src.ingestion.jobs import submit_ingestion_job, get_ingestion_job, shutdown_ingestion_jobs
 from src.ingestion.watcher import start_document_watcher, stop_document_watcher
 
 __all__ = [
     "process_file",
     "process_directory",
+    "remove_document",
+    "submit_ingestion_job",
+    "get_ingestion_job",
+    "shutdown_ingestion_jobs",
     "start_document_watcher",
     "stop_document_watcher",
 ]
@@ -0,0 +1,170 @@
+"""
+Bulk import of pre-chunked (optionally pre-embedded) corpora from JSONL or Parquet.
+Records stream straight into Chroma in large batches; only records without a vector are embedded,
+and the BM25 keyword index is extended in the same pass.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional
+
+from src.retrieval.embeddings import embed_texts
+from src.retrieval.keyword_index import KeywordIndex
+from src.retrieval.vector_store import bump_corpus_version, get_collection, get_keyword_index, save_keyword_index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 2000
+SUPPORTED_IMPORT_FORMATS = {".jsonl", ".parquet"}
+
+
+@dataclass
+class ImportStats:
+    """Counters reported by import_corpus."""
+
+    records: int = 0
+    imported: int = 0
+    embedded: int = 0
+    skipped: int = 0
+    batches: int = 0
+
+
+def _record_id(text: str, metadata: dict) -> str:
+    """Deterministic id for records that do not carry one (re-imports upsert instead of duplicating)."""
+    key = json.dumps({"text": text, "source_file": metadata.get("source_file")}, sort_keys=True)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _clean_metadata(metadata: Any) -> dict:
+    """Chroma accepts only str/int/float/bool values; serialise anything else to JSON."""
+    if not isinstance(metadata, dict):
+        return {}
+    cleaned: dict = {}
+    for key, value in metadata.items():
+        if value is None:
+            continue
+        if isinstance(value, (str, int, float, bool)):
+            cleaned[str(key)] = value
+        else:
+            cleaned[str(key)] = json.dumps(value, default=str)
+    return cleaned
+
+
+def iter_jsonl(path: Path) -> Iterator[dict]:
+    """Yield one record per non-empty line."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning("Skipping malformed JSONL line %d in %s: %s", line_no, path.name, e)
+
+
+def iter_parquet(path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[dict]:
+    """Yield records from a Parquet file, reading one row group batch at a time."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet import requires pyarrow: pip install pyarrow") from e
+    parquet_file = pq.ParquetFile(str(path))
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def iter_records(path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[dict]:
+    """Dispatch on file suffix."""
+    suffix = path.suffix.lower()
+    if suffix == ".jsonl":
+        return iter_jsonl(path)
+    if suffix == ".parquet":
+        return iter_parquet(path, batch_size=batch_size)
+    raise ValueError(f"Unsupported import format: {suffix}. Use .jsonl or .parquet")
+
+
+def _write_batch(batch: List[dict], index: KeywordIndex, stats: ImportStats) -> None:
+    """Embed records lacking a vector, upsert into Chroma, extend the keyword index."""
+    missing = [i for i, r in enumerate(batch) if r["embedding"] is None]
+    if missing:
+        vectors = embed_texts([batch[i]["text"] for i in missing])
+        for i, vector in zip(missing, vectors):
+            batch[i]["embedding"] = vector
+        stats.embedded += len(missing)
+
+    ids = [r["id"] for r in batch]
+    texts = [r["text"] for r in batch]
+    metadatas = [r["metadata"] for r in batch]
+    get_collection().upsert(
+        ids=ids,
+        documents=texts,
+        metadatas=[m or None for m in metadatas],
+        embeddings=[list(r["embedding"]) for r in batch],
+    )
+    index.add(ids, texts, metadatas)
+    bump_corpus_version(index)
+    stats.imported += len(batch)
+    stats.batches += 1
+    logger.info("Imported batch %d (%d records, %d total)", stats.batches, len(batch), stats.imported)
+
+
+def import_records(records: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> ImportStats:
+    """
+    Import an iterable of records shaped {"id", "text", "metadata", "embedding"}.
+    Only "text" is required; embedding may be omitted or null.
+    """
+    stats = ImportStats()
+    # Load (or build) the keyword index before writing so each batch is added to it exactly once.
+    index = get_keyword_index()
+    collection = get_collection()
+    client = getattr(collection, "_client", None)
+    max_batch = getattr(client, "get_max_batch_size", None)
+    if callable(max_batch):
+        batch_size = min(batch_size, max_batch())
+    batch: List[dict] = []
+
+    for record in records:
+        stats.records += 1
+        text = record.get("text") or record.get("content")
+        if not text or not str(text).strip():
+            stats.skipped += 1
+            continue
+        text = str(text)
+        metadata = _clean_metadata(record.get("metadata"))
+        embedding: Optional[list] = record.get("embedding")
+        if embedding is not None and len(embedding) == 0:
+            embedding = None
+        batch.append({
+            "id": str(record.get("id") or _record_id(text, metadata)),
+            "text": text,
+            "metadata": metadata,
+            "embedding": embedding,
+        })
+        if len(batch) >= batch_size:
+            _write_batch(batch, index, stats)
+            batch = []
+
+    if batch:
+        _write_batch(batch, index, stats)
+    return stats
+
+
+def import_corpus(path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> ImportStats:
+    """Import a JSONL or Parquet corpus file, then persist the keyword index snapshot."""
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(str(path))
+    stats = import_records(iter_records(path, batch_size=batch_size), batch_size=batch_size)
+    save_keyword_index()
+    logger.info(
+        "Imported %s: %d records, %d embedded locally, %d skipped",
+        path.name,
+        stats.imported,
+        stats.embedded,
+        stats.skipped,
+    )
+    return stats
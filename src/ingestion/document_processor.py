@@ -2,24 +2,32 @@
 
 import logging
 from pathlib import Path
-from typing import List
+from typing import Callable, List, Optional
 
 from langchain_core.documents import Document
-from langchain_community.document_loaders import (
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredWordDocumentLoader,
-)
+from langchain_community.document_loaders import PyPDFLoader, TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from config import get_settings
+from src.ingestion.docx_loader import load_docx
+from src.ingestion.table_extractor import extract_metrics
 from src.retrieval.embeddings import get_embedding_model
-from src.retrieval.vector_store import get_vector_store, invalidate_corpus_cache
+from src.retrieval.metrics_store import delete_source_metrics, replace_source_metrics
+from src.retrieval.vector_store import (
+    delete_chunks,
+    delete_document_chunks,
+    get_document_chunk_ids,
+    get_vector_store,
+    index_chunks,
+)
 
 logger = logging.getLogger(__name__)
 
 SUPPORTED_EXTENSIONS = {".pdf", ".txt", ".docx"}
 
+# Chunks embedded and written per vector store call; progress is reported after each batch.
+ADD_BATCH_SIZE = 64
+
 # Chunking: prefer paragraph/sentence boundaries so retrieved excerpts have complete meaning.
 # Separators tried in order: paragraph, line, sentence end, space, char.
 TEXT_SPLITTER = RecursiveCharacterTextSplitter(
@@ -30,48 +38,102 @@ TEXT_SPLITTER = RecursiveCharacterTextSplitter(
 )
 
 
+def _load_docx_unstructured(path_str: str) -> List[Document]:
+    """Opt-in: the unstructured stack is heavy to import, so it is only loaded when asked for."""
+    from langchain_community.document_loaders import UnstructuredWordDocumentLoader
+
+    return UnstructuredWordDocumentLoader(path_str).load()
+
+
+def _load_docx(file_path: Path) -> List[Document]:
+    """Native python-docx loader by default; unstructured when configured, or as an opt-in fallback on failure."""
+    settings = get_settings()
+    if settings.docx_loader == "unstructured":
+        return _load_docx_unstructured(str(file_path))
+    try:
+        return load_docx(file_path)
+    except Exception as e:
+        if not settings.docx_unstructured_fallback:
+            raise
+        logger.warning("Native DOCX load failed for %s (%s), falling back to unstructured", file_path.name, e)
+        return _load_docx_unstructured(str(file_path))
+
+
 def _load_document(file_path: Path) -> List[Document]:
     """Load a single file into LangChain Documents."""
     suffix = file_path.suffix.lower()
     path_str = str(file_path)
 
     if suffix == ".pdf":
-        loader = PyPDFLoader(path_str)
+        docs = PyPDFLoader(path_str).load()
     elif suffix == ".txt":
-        loader = TextLoader(path_str, encoding="utf-8", autodetect_encoding=True)
+        docs = TextLoader(path_str, encoding="utf-8", autodetect_encoding=True).load()
     elif suffix == ".docx":
-        loader = UnstructuredWordDocumentLoader(path_str)
+        docs = _load_docx(file_path)
     else:
         raise ValueError(f"Unsupported file type: {suffix}")
 
-    docs = loader.load()
     for d in docs:
         d.metadata["source_file"] = file_path.name
         d.metadata["source_path"] = path_str
     return docs
 
 
-def process_file(file_path: Path) -> int:
-    """Load, split, and add one file to the vector store. Returns number of chunks added."""
+def process_file(
+    file_path: Path,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Load, split, and add one file to the vector store. Returns number of chunks added.
+    on_progress(chunks_added, total_chunks) is called after each batch is embedded and stored.
+    Re-ingesting a file replaces its previous chunks: the new ones are stored first and the old ones
+    deleted afterwards, so the document never drops out of search while it is re-embedded.
+    """
     if file_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
         logger.warning("Skipping unsupported file: %s", file_path)
         return 0
 
     try:
         raw_docs = _load_document(file_path)
+        try:
+            replace_source_metrics(file_path.name, extract_metrics(raw_docs, file_path.name))
+        except Exception as e:
+            logger.warning("Metric table extraction failed for %s: %s", file_path.name, e)
         chunks = TEXT_SPLITTER.split_documents(raw_docs)
-        if not chunks:
-            return 0
-        store = get_vector_store()
-        store.add_documents(chunks)
-        invalidate_corpus_cache()
-        logger.info("Ingested %s: %d chunks", file_path.name, len(chunks))
-        return len(chunks)
+        old_ids = get_document_chunk_ids(file_path.name)
+        total = len(chunks)
+        if on_progress:
+            on_progress(0, total)
+        added: List[str] = []
+        try:
+            store = get_vector_store() if chunks else None
+            for start in range(0, total, ADD_BATCH_SIZE):
+                batch = chunks[start:start + ADD_BATCH_SIZE]
+                ids = store.add_documents(batch)
+                added.extend(ids)
+                index_chunks(ids, [c.page_content for c in batch], [c.metadata for c in batch])
+                if on_progress:
+                    on_progress(start + len(batch), total)
+        except Exception:
+            # Keep the previous version whole rather than a mix of old and partial new chunks
+            delete_chunks(added)
+            raise
+        # Metrics were already replaced above; now drop the previous version's chunks (all of them, even
+        # when the new version split into none)
+        delete_chunks(old_ids)
+        logger.info("Ingested %s: %d chunks", file_path.name, total)
+        return total
     except Exception as e:
         logger.exception("Failed to process %s: %s", file_path, e)
         raise
 
 
+def remove_document(source_file: str) -> int:
+    """Remove a document's chunks from the vector store and keyword index, and its extracted metrics. Returns chunks removed."""
+    delete_source_metrics(source_file)
+    return delete_document_chunks(source_file)
+
+
 def process_directory(directory: Path) -> int:
     """Process all supported files in directory. Returns total chunks added."""
     directory = Path(directory)
@@ -0,0 +1,127 @@
+"""Native DOCX loader: walks paragraphs and tables with python-docx, keeping heading structure in metadata."""
+
+import logging
+import re
+from pathlib import Path
+from typing import List
+
+from docx import Document as open_docx
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Cells in table Documents are tab-separated, one row per line (the metrics extractor relies on this).
+TABLE_CELL_SEPARATOR = "\t"
+
+_HEADING_RE = re.compile(r"^(?:heading\s*(\d)|title)$", re.I)
+
+
+def _heading_levels(doc) -> dict[str, int]:
+    """Map paragraph style id -> heading level (1-9 for Heading N, 0 for Title), built once per document."""
+    levels: dict[str, int] = {}
+    for style in doc.styles:
+        m = _HEADING_RE.match(style.name or "")
+        if m and style.style_id:
+            levels[style.style_id] = int(m.group(1)) if m.group(1) else 0
+    return levels
+
+
+def _heading_level(paragraph: Paragraph, levels: dict[str, int]) -> int:
+    """
+    Heading level of a paragraph, -1 for body text. Reads the style id straight from the XML:
+    python-docx's paragraph.style resolves through the whole style table on every call.
+    """
+    style_id = paragraph._p.style
+    return levels.get(style_id, -1) if style_id else -1
+
+
+def _table_rows(table: Table) -> List[List[str]]:
+    """Cell texts per row; horizontally merged cells (repeated by python-docx) are collapsed."""
+    rows: List[List[str]] = []
+    for row in table.rows:
+        cells: List[str] = []
+        previous = None
+        for cell in row.cells:
+            if cell._tc is previous:
+                continue
+            previous = cell._tc
+            cells.append(" ".join(cell.text.split()))
+        if any(cells):
+            rows.append(cells)
+    return rows
+
+
+def load_docx(file_path: Path) -> List[Document]:
+    """
+    One Document per heading section (body paragraphs under that heading) and one per table.
+    Metadata: element_type ("section" | "table"), heading (innermost), heading_path ("A > B"),
+    and for tables table_index plus the header row.
+    """
+    doc = open_docx(str(file_path))
+    levels = _heading_levels(doc)
+    documents: List[Document] = []
+    heading_stack: List[tuple[int, str]] = []
+    section_lines: List[str] = []
+    table_index = 0
+
+    def heading_meta() -> dict:
+        return {
+            "heading": heading_stack[-1][1] if heading_stack else "",
+            "heading_path": " > ".join(text for _, text in heading_stack),
+        }
+
+    def flush_section() -> None:
+        body = "\n".join(section_lines).strip()
+        section_lines.clear()
+        if not body:
+            return
+        meta = heading_meta()
+        title = meta["heading_path"]
+        documents.append(
+            Document(
+                page_content=f"{title}\n\n{body}" if title else body,
+                metadata={"element_type": "section", **meta},
+            )
+        )
+
+    for child in doc.element.body.iterchildren():
+        if child.tag == qn("w:p"):
+            paragraph = Paragraph(child, doc)
+            text = paragraph.text.strip()
+            if not text:
+                continue
+            level = _heading_level(paragraph, levels)
+            if level >= 0:
+                flush_section()
+                while heading_stack and heading_stack[-1][0] >= level:
+                    heading_stack.pop()
+                heading_stack.append((level, text))
+            else:
+                section_lines.append(text)
+        elif child.tag == qn("w:tbl"):
+            rows = _table_rows(Table(child, doc))
+            if not rows:
+                continue
+            flush_section()
+            table_index += 1
+            meta = heading_meta()
+            lines = [TABLE_CELL_SEPARATOR.join(r) for r in rows]
+            if meta["heading_path"]:
+                lines.insert(0, meta["heading_path"])  # context for retrieval; ignored by the metrics extractor
+            documents.append(
+                Document(
+                    page_content="\n".join(lines),
+                    metadata={
+                        "element_type": "table",
+                        "table_index": table_index,
+                        "table_header": " | ".join(rows[0]),
+                        **meta,
+                    },
+                )
+            )
+    flush_section()
+    logger.debug("Loaded %s: %d sections/tables", file_path.name, len(documents))
+    return documents
@@ -0,0 +1,127 @@
+"""Background ingestion jobs. Uploads are queued here so parsing and embedding run off the event loop."""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from config import get_settings
+from src.ingestion.document_processor import process_file
+from src.models.schemas import IngestionFileStatus, IngestionJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared worker pool (created on first use)."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            settings = get_settings()
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.ingestion_workers),
+                thread_name_prefix="ingest",
+            )
+        return _executor
+
+
+def _evict_old_jobs() -> None:
+    """Keep at most ingestion_job_history jobs, dropping the oldest finished ones first. Caller holds _lock."""
+    limit = max(1, get_settings().ingestion_job_history)
+    if len(_jobs) <= limit:
+        return
+    for job_id in list(_jobs.keys()):
+        if len(_jobs) <= limit:
+            break
+        if _jobs[job_id].status in (JobStatus.COMPLETED, JobStatus.FAILED):
+            del _jobs[job_id]
+
+
+def _update_file(job_id: str, index: int, **fields) -> None:
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        entry = job.files[index]
+        for key, value in fields.items():
+            setattr(entry, key, value)
+        job.chunks_added = sum(f.chunks for f in job.files)
+
+
+def _run_job(job_id: str, paths: list[Optional[Path]]) -> None:
+    """Worker: ingest each queued file in order, recording per-file progress."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        job.status = JobStatus.RUNNING
+
+    for index, path in enumerate(paths):
+        if path is None:
+            continue  # rejected at upload time; status already recorded
+        _update_file(job_id, index, status=JobStatus.RUNNING)
+        try:
+            chunks = process_file(
+                path,
+                on_progress=lambda done, total, i=index: _update_file(job_id, i, chunks=done, total_chunks=total),
+            )
+            _update_file(job_id, index, status=JobStatus.COMPLETED, chunks=chunks)
+        except Exception as e:
+            logger.exception("Ingestion job %s failed for %s: %s", job_id, path.name, e)
+            _update_file(job_id, index, status=JobStatus.FAILED, chunks=0, error=str(e))
+
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        ok = any(f.status == JobStatus.COMPLETED for f in job.files)
+        job.status = JobStatus.COMPLETED if ok or not job.files else JobStatus.FAILED
+        job.finished_at = time.time()
+    logger.info("Ingestion job %s finished: %d chunks", job_id, job.chunks_added)
+
+
+def submit_ingestion_job(files: list[tuple[str, Optional[Path], Optional[str]]]) -> IngestionJob:
+    """
+    Queue files for ingestion and return the job immediately.
+    Each entry is (filename, saved_path, error); entries with an error are recorded as failed and skipped.
+    """
+    job_id = uuid.uuid4().hex
+    statuses = [
+        IngestionFileStatus(filename=name, status=JobStatus.FAILED, error=error)
+        if error
+        else IngestionFileStatus(filename=name)
+        for name, _, error in files
+    ]
+    job = IngestionJob(job_id=job_id, files=statuses, created_at=time.time())
+    with _lock:
+        _jobs[job_id] = job
+        _evict_old_jobs()
+        snapshot = job.model_copy(deep=True)
+
+    paths = [None if error else path for _, path, error in files]
+    _get_executor().submit(_run_job, job_id, paths)
+    return snapshot
+
+
+def get_ingestion_job(job_id: str) -> Optional[IngestionJob]:
+    """Return a snapshot of the job, or None if unknown or evicted."""
+    with _lock:
+        job = _jobs.get(job_id)
+        return job.model_copy(deep=True) if job is not None else None
+
+
+def shutdown_ingestion_jobs(wait: bool = False) -> None:
+    """Stop the worker pool. Queued jobs are abandoned unless wait is True."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=not wait)
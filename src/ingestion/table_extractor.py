@@ -0,0 +1,161 @@
+"""
+Extract metric tables (label + one value per period column) from loaded documents.
+Conservative by design: a row is kept only when its value count matches the period header exactly.
+"""
+
+import logging
+import re
+from typing import List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+from src.ingestion.docx_loader import TABLE_CELL_SEPARATOR
+from src.retrieval.metrics_store import MetricRow, find_periods, strip_periods
+
+logger = logging.getLogger(__name__)
+
+_NUMBER_RE = re.compile(r"^\(?[-–]?\$?\(?\d[\d,]*(?:\.\d+)?\)?%?[xX]?\)?$")
+_EMPTY_CELLS = {"-", "–", "—", "n/a", "na", "nm", "n.m."}
+_SCALE_RE = re.compile(r"\bin\s+(thousands|millions|billions)\b", re.I)
+_MAX_HEADER_RESIDUAL_WORDS = 4
+_MAX_LABEL_WORDS = 8
+
+
+def _parse_number(cell: str) -> Optional[tuple[float, str]]:
+    """'$1,234.5' -> (1234.5, '$'); '(3.2)%' -> (-3.2, '%'); None if not a number."""
+    text = cell.strip().replace(" ", "")
+    if not _NUMBER_RE.match(text):
+        return None
+    unit = "%" if "%" in text else ("$" if "$" in text else ("x" if text[-1:] in "xX" else ""))
+    negative = text.startswith("(") or text.lstrip("($").startswith(("-", "–"))
+    digits = re.sub(r"[^\d.]", "", text)
+    try:
+        value = float(digits)
+    except ValueError:
+        return None
+    return (-value if negative else value), unit
+
+
+def _header_periods(cells: Sequence[str]) -> List[str]:
+    """Periods if this row is a column header (periods plus at most a short caption), else []."""
+    joined = " ".join(c for c in cells if c)
+    periods = find_periods(joined)
+    if len(periods) < 2 or len(set(periods)) != len(periods):
+        return []
+    residual = re.findall(r"[A-Za-z]+", strip_periods(joined))
+    return periods if len(residual) <= _MAX_HEADER_RESIDUAL_WORDS else []
+
+
+def _split_text_row(line: str) -> List[str]:
+    """Split a text line into [label, value, value, ...] by peeling numeric tokens off the end."""
+    tokens = line.split()
+    values: List[str] = []
+    percent_pending = False
+    while tokens:
+        token = tokens[-1]
+        if token == "%":
+            percent_pending = True
+            tokens.pop()
+            continue
+        if token == "$":
+            if values:
+                values[0] = "$" + values[0]
+            tokens.pop()
+            continue
+        if token.lower() in _EMPTY_CELLS or _parse_number(token) is not None:
+            values.insert(0, tokens.pop() + ("%" if percent_pending else ""))
+            percent_pending = False
+            continue
+        break
+    return [" ".join(tokens)] + values if values else [line]
+
+
+def extract_metrics_from_rows(
+    rows: Sequence[Sequence[str]],
+    source_file: str,
+    page: Optional[int] = None,
+    scale: str = "",
+) -> List[MetricRow]:
+    """
+    Walk table rows: a header row of periods sets the columns; following rows whose trailing cells
+    are exactly one value per period become MetricRows. A new header row resets the columns.
+    """
+    metrics: List[MetricRow] = []
+    periods: List[str] = []
+    for raw in rows:
+        cells = [(c or "").strip() for c in raw]
+        header = _header_periods(cells)
+        if header:
+            periods = header
+            scale_match = _SCALE_RE.search(" ".join(cells))
+            if scale_match:
+                scale = scale_match.group(1).lower()
+            continue
+        if not periods or len(cells) < len(periods) + 1:
+            continue
+        label_cells = [c for c in cells[: -len(periods)] if c]
+        values = cells[-len(periods):]
+        if any(_parse_number(c) is not None for c in label_cells):
+            continue  # more values than period columns: ambiguous, skip
+        label = " ".join(label_cells)
+        if not re.search(r"[A-Za-z]", label) or find_periods(label) or len(label.split()) > _MAX_LABEL_WORDS:
+            continue
+        parsed = [None if v.lower() in _EMPTY_CELLS else _parse_number(v) for v in values]
+        if not any(parsed) or any(p is None and v.lower() not in _EMPTY_CELLS for p, v in zip(parsed, values)):
+            continue
+        for period, value_text, value in zip(periods, values, parsed):
+            if value is None:
+                continue
+            number, unit = value
+            if scale and unit == "$":
+                unit = f"$ in {scale}"
+            metrics.append(
+                MetricRow(
+                    metric=label,
+                    period=period,
+                    value=number,
+                    value_text=value_text,
+                    source_file=source_file,
+                    unit=unit,
+                    page=page,
+                )
+            )
+    return metrics
+
+
+def extract_metrics_from_text(text: str, source_file: str, page: Optional[int] = None) -> List[MetricRow]:
+    """Treat each line of extracted page text as a table row."""
+    scale_match = _SCALE_RE.search(text or "")
+    rows = [_split_text_row(line) for line in (text or "").splitlines() if line.strip()]
+    return extract_metrics_from_rows(
+        rows,
+        source_file,
+        page=page,
+        scale=scale_match.group(1).lower() if scale_match else "",
+    )
+
+
+def extract_metrics(docs: List[Document], source_file: str) -> List[MetricRow]:
+    """
+    Extract metric rows from every loaded page/section of a document (first occurrence of a metric/period wins).
+    Native DOCX tables (element_type "table") arrive with tab-separated cells and are read as real rows.
+    """
+    seen: set[tuple[str, str]] = set()
+    metrics: List[MetricRow] = []
+    for doc in docs:
+        page = doc.metadata.get("page")
+        page_no = page + 1 if isinstance(page, int) else None
+        if doc.metadata.get("element_type") == "table":
+            rows = [line.split(TABLE_CELL_SEPARATOR) for line in doc.page_content.splitlines()]
+            scale_match = _SCALE_RE.search(doc.page_content)
+            found = extract_metrics_from_rows(
+                rows, source_file, page=page_no, scale=scale_match.group(1).lower() if scale_match else ""
+            )
+        else:
+            found = extract_metrics_from_text(doc.page_content, source_file, page=page_no)
+        for row in found:
+            key = (row.metric_key, row.period)
+            if key not in seen:
+                seen.add(key)
+                metrics.append(row)
+    return metrics
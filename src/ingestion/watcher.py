@@ -1,14 +1,14 @@
-"""Watchdog-based document monitoring. Auto-ingest new/changed files in documents_dir."""
+"""Watchdog-based document monitoring. Auto-ingest new/changed files in documents_dir; drop deleted ones."""
 
 import logging
 import threading
 from pathlib import Path
 
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileModifiedEvent
+from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileDeletedEvent, FileModifiedEvent
 
 from config import get_settings
-from src.ingestion.document_processor import process_file
+from src.ingestion.document_processor import process_file, remove_document
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +19,7 @@ SUPPORTED_SUFFIXES = {".pdf", ".txt", ".docx"}
 
 
 class DocumentEventHandler(FileSystemEventHandler):
-    """Handle new or modified documents and ingest them."""
+    """Handle new or modified documents (ingest) and deleted ones (remove their chunks)."""
 
     def __init__(self, watch_dir: Path) -> None:
         self.watch_dir = Path(watch_dir)
@@ -48,9 +48,27 @@ class DocumentEventHandler(FileSystemEventHandler):
             except Exception as e:
                 logger.exception("Watcher ingest failed: %s", e)
 
+    def _name_still_present(self, name: str) -> bool:
+        """Chunks are keyed by file name, so a same-named file elsewhere in the tree still owns them."""
+        return any(other.is_file() for other in self.watch_dir.rglob(name))
+
+    def on_deleted(self, event: FileDeletedEvent) -> None:
+        if event.is_directory:
+            return
+        p = Path(event.src_path)
+        if p.suffix.lower() in SUPPORTED_SUFFIXES:
+            logger.info("Deleted file detected: %s", event.src_path)
+            if self._name_still_present(p.name):
+                logger.info("Keeping chunks of %s: another file with that name is still watched", p.name)
+                return
+            try:
+                remove_document(p.name)
+            except Exception as e:
+                logger.exception("Watcher delete failed: %s", e)
+
 
 def start_document_watcher() -> None:
-    """Start watching documents_dir for new/modified files."""
+    """Start watching documents_dir for new, modified and deleted files."""
     global _observer
     with _lock:
         if _observer is not None:
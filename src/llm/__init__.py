@@ -1,5 +1,9 @@
 """LLM factory and shared chat model."""
 
-from src.llm.factory import get_llm
+from src.llm.factory import ainvoke_for_text, astream_text, get_llm, invoke_for_text
+from src.llm.cache import get_llm_cache, get_llm_cache_stats
+from src.llm.hedging import get_hedging_stats
+from src.llm.profiles import LLMProfile, get_profile
+from src.llm.resilience import CircuitOpenError, get_circuit_breaker_stats
 
-__all__ = ["get_llm"]
+__all__ = ["get_llm", "invoke_for_text", "ainvoke_for_text", "astream_text", "get_llm_cache", "get_llm_cache_stats", "CircuitOpenError", "get_circuit_breaker_stats", "get_hedging_stats", "LLMProfile", "get_profile"]
@@ -0,0 +1,168 @@
+"""
+Chat-completions HTTP clients: one pooled httpx.AsyncClient per event loop, plus one shared sync client.
+Speaks the OpenAI-compatible /chat/completions API, served by the HuggingFace Inference router
+(LLM_BACKEND=hf_endpoint) or any compatible server at LLM_BASE_URL (LLM_BACKEND=openai_compatible).
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import weakref
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# httpx connection pools (and asyncio semaphores) belong to the loop that created them.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_sync_client: Optional[httpx.Client] = None
+_sync_client_lock = threading.Lock()
+
+
+def _client_options() -> dict[str, Any]:
+    """base_url, auth header, pool limits and timeout for the configured backend."""
+    settings = get_settings()
+    if settings.llm_backend == "openai_compatible":
+        base_url, token = settings.llm_base_url, settings.llm_api_key
+    else:
+        base_url, token = settings.hf_inference_base_url, settings.huggingface_hub_token
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return {
+        "base_url": base_url.rstrip("/"),
+        "headers": headers,
+        "limits": httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_connections,
+        ),
+        "timeout": httpx.Timeout(settings.llm_timeout_seconds, connect=10.0),
+    }
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Shared pooled client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**_client_options())
+        _clients[loop] = client
+    return client
+
+
+def get_http_client() -> httpx.Client:
+    """Shared pooled sync client (blocking invoke_for_text on the openai_compatible backend)."""
+    global _sync_client
+    with _sync_client_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(**_client_options())
+        return _sync_client
+
+
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """Global (per event loop) cap on in-flight async LLM calls."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, get_settings().llm_max_concurrency))
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def close_async_http_client() -> None:
+    """Close the running loop's pooled client (call on app shutdown)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def _chat_payload(prompt: str, model: str, max_new_tokens: int, temperature: float, stream: bool = False) -> dict[str, Any]:
+    return {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_new_tokens,
+        "temperature": temperature,
+        "stream": stream,
+    }
+
+
+def _message_text(data: dict[str, Any]) -> str:
+    choices = data.get("choices") or []
+    if not choices:
+        return ""
+    return (choices[0].get("message") or {}).get("content") or ""
+
+
+def chat_completion(
+    prompt: str,
+    model: str,
+    max_new_tokens: int,
+    temperature: float,
+    timeout: Optional[float] = None,
+) -> str:
+    """Blocking chat completion on the shared sync client. Raises httpx errors on transport/HTTP failure."""
+    response = get_http_client().post(
+        "/chat/completions",
+        json=_chat_payload(prompt, model, max_new_tokens, temperature),
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return _message_text(response.json())
+
+
+async def achat_completion(
+    prompt: str,
+    model: str,
+    max_new_tokens: int,
+    temperature: float,
+    timeout: Optional[float] = None,
+) -> str:
+    """One chat completion; returns the message text. Raises httpx errors on transport/HTTP failure."""
+    client = get_async_http_client()
+    response = await client.post(
+        "/chat/completions",
+        json=_chat_payload(prompt, model, max_new_tokens, temperature),
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return _message_text(response.json())
+
+
+async def astream_chat_completion(
+    prompt: str,
+    model: str,
+    max_new_tokens: int,
+    temperature: float,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """Streamed chat completion: yields content deltas as the server-sent chunks arrive."""
+    client = get_async_http_client()
+    async with client.stream(
+        "POST",
+        "/chat/completions",
+        json=_chat_payload(prompt, model, max_new_tokens, temperature, stream=True),
+        timeout=timeout,
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+            except json.JSONDecodeError:
+                logger.debug("Skipping malformed stream chunk: %s", data[:200])
+                continue
+            choices = chunk.get("choices") or []
+            if choices:
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    yield delta
@@ -1,11 +1,17 @@
 """
-HuggingFace LLM factory.
-Config-driven singleton factory using HuggingFace Hub.
+LLM factory.
+Config-driven factory with one cached client per purpose profile; LLM_BACKEND selects the HuggingFace Hub endpoint (default), any
+OpenAI-compatible HTTP server, or an in-process transformers pipeline.
 Compatible with latest langchain + langchain-huggingface.
+invoke_for_text is the blocking entry point; ainvoke_for_text awaits the pooled async client and
+astream_text yields tokens from it as they are generated.
 """
 
+import asyncio
 import logging
-from typing import Optional, Union
+import threading
+import time
+from typing import Any, AsyncIterator, Optional, Union
 
 from config import get_settings
 
@@ -13,24 +19,64 @@ from langchain_core.language_models import BaseChatModel, BaseLLM
 from langchain_core.messages import HumanMessage
 from langchain_huggingface import HuggingFaceEndpoint, ChatHuggingFace
 
+from src.llm.async_client import achat_completion, astream_chat_completion, chat_completion, get_llm_semaphore
+from src.llm.cache import LLMCache, get_llm_cache, make_cache_key
+from src.llm.hedging import get_request_hedger
+from src.llm.profiles import LLMProfile, get_backend, get_profile
+from src.llm.prompt_budget import count_tokens
+from src.llm.resilience import (
+    CircuitOpenError,
+    EmptyResponseError,
+    acall_with_resilience,
+    backoff_delay,
+    call_with_resilience,
+    get_circuit_breaker,
+    is_retryable,
+)
+from src.observability.metrics import (
+    LLM_CACHE_LOOKUPS,
+    LLM_CALL_SECONDS,
+    LLM_COMPLETION_TOKENS,
+    LLM_ERRORS,
+    LLM_PROMPT_TOKENS,
+    LLM_RETRIES,
+)
+
 logger = logging.getLogger(__name__)
 
-_llm: Optional[Union[BaseLLM, BaseChatModel]] = None
+# One LangChain client per profile (model + generation params); transformers pipelines are keyed by model
+# only, since generation params are passed per call and weights should be loaded once.
+_llms: dict[Any, Union[BaseLLM, BaseChatModel]] = {}
+_llms_lock = threading.Lock()
+# transformers pipelines are not safe to call from several threads at once
+_local_llm_lock = threading.Lock()
 
 
-def get_llm() -> Union[BaseLLM, BaseChatModel]:
-    """
-    Return singleton HuggingFace LLM (Hub API).
-    Wrapped as ChatHuggingFace for chat-style invocation.
-    """
-    global _llm
+def _pipeline_kwargs(profile: LLMProfile) -> dict[str, Any]:
+    return {
+        "max_new_tokens": profile.max_new_tokens,
+        "temperature": profile.temperature,
+        "do_sample": profile.temperature > 0,
+        "return_full_text": False,
+    }
 
-    if _llm is not None:
-        return _llm
 
-    settings = get_settings()
-    model_name = settings.llm_model_name
-    token = settings.huggingface_hub_token
+def _build_transformers_llm(profile: LLMProfile) -> BaseChatModel:
+    """In-process CPU text-generation pipeline, wrapped as a chat model so the model's chat template applies."""
+    from langchain_huggingface import HuggingFacePipeline
+
+    pipeline_llm = HuggingFacePipeline.from_model_id(
+        model_id=profile.model,
+        task="text-generation",
+        device=-1,
+        pipeline_kwargs=_pipeline_kwargs(profile),
+    )
+    logger.info("Using local transformers LLM: %s", profile.model)
+    return ChatHuggingFace(llm=pipeline_llm)
+
+
+def _build_endpoint_llm(profile: LLMProfile) -> BaseChatModel:
+    token = get_settings().huggingface_hub_token
 
     if not token:
         raise ValueError(
@@ -40,52 +86,310 @@ def get_llm() -> Union[BaseLLM, BaseChatModel]:
 
     # Create base endpoint LLM
     base_llm = HuggingFaceEndpoint(
-        repo_id=model_name,
+        repo_id=profile.model,
         huggingfacehub_api_token=token,
-        max_new_tokens=1024,
-        temperature=0.3,
+        max_new_tokens=profile.max_new_tokens,
+        temperature=profile.temperature,
     )
 
+    logger.info("Using HuggingFace Hub LLM: %s (%s)", profile.model, profile.purpose)
+
     # Wrap endpoint as chat model
-    _llm = ChatHuggingFace(llm=base_llm)
+    return ChatHuggingFace(llm=base_llm)
+
+
+def get_llm(purpose: Optional[str] = None) -> Union[BaseLLM, BaseChatModel]:
+    """
+    Return the cached LangChain LLM for a purpose's profile (see src/llm/profiles.py) on the hf_endpoint
+    (Hub API) or transformers (local pipeline) backend. Wrapped as ChatHuggingFace for chat-style
+    invocation. The openai_compatible backend has no LangChain model; it is called over HTTP by
+    invoke_for_text / ainvoke_for_text.
+    """
+    backend = get_backend()
+    if backend == "openai_compatible":
+        raise ValueError("LLM_BACKEND=openai_compatible is served over HTTP; use invoke_for_text / ainvoke_for_text")
+    profile = get_profile(purpose)
+    key = ("transformers", profile.model) if backend == "transformers" else profile
+    with _llms_lock:
+        llm = _llms.get(key)
+        if llm is None:
+            llm = _build_transformers_llm(profile) if backend == "transformers" else _build_endpoint_llm(profile)
+            _llms[key] = llm
+        return llm
 
-    logger.info("Using HuggingFace Hub LLM: %s", model_name)
 
-    return _llm
+def _invoke_langchain(prompt: str, profile: LLMProfile) -> str:
+    """One blocking call on the profile's LangChain model (hf_endpoint / transformers)."""
+    llm = get_llm(profile.purpose)
+    if isinstance(llm, BaseChatModel):
+        if get_backend() == "transformers":
+            with _local_llm_lock:
+                response = llm.invoke([HumanMessage(content=prompt)], pipeline_kwargs=_pipeline_kwargs(profile))
+        else:
+            response = llm.invoke([HumanMessage(content=prompt)])
+        return str(getattr(response, "content", response))
+    return str(llm.invoke(prompt))
 
 
-def invoke_for_text(prompt: str, max_retries: int = 2) -> str:
+def _cache_lookup(
+    prompt: str, profile: LLMProfile, use_cache: bool
+) -> tuple[Optional[LLMCache], Optional[str], Optional[str]]:
+    """Return (cache, key, cached_text); cache is None when disabled, opted out or unavailable."""
+    if not use_cache:
+        return None, None, None
+    try:
+        cache = get_llm_cache()
+        if cache is None:
+            return None, None, None
+        key = make_cache_key(prompt, profile.model, profile.cache_params())
+        cached = cache.get(key)
+        LLM_CACHE_LOOKUPS.inc(purpose=profile.purpose, result="hit" if cached is not None else "miss")
+        return cache, key, cached
+    except Exception as e:
+        logger.warning("LLM cache read failed: %s", e)
+        return None, None, None
+
+
+def _cache_store(cache: Optional[LLMCache], key: Optional[str], model: str, text: str) -> None:
+    if cache is None or key is None:
+        return
+    try:
+        cache.put(key, model, text)
+    except Exception as e:
+        logger.warning("LLM cache write failed: %s", e)
+
+
+def _record_call(
+    profile: LLMProfile,
+    mode: str,
+    started: float,
+    prompt: str,
+    attempts: int,
+    text: Optional[str] = None,
+    error: Optional[BaseException] = None,
+) -> None:
+    """Latency, token, retry and error metrics for one call that reached the endpoint (see /metrics)."""
+    try:
+        purpose = profile.purpose
+        LLM_CALL_SECONDS.observe(
+            time.perf_counter() - started, purpose=purpose, mode=mode, outcome="error" if error else "ok"
+        )
+        if attempts > 1:
+            LLM_RETRIES.inc(attempts - 1, purpose=purpose)
+        if attempts:
+            LLM_PROMPT_TOKENS.inc(count_tokens(prompt, profile.model) * attempts, purpose=purpose)
+        if text:
+            LLM_COMPLETION_TOKENS.inc(count_tokens(text, profile.model), purpose=purpose)
+        if error is not None:
+            LLM_ERRORS.inc(purpose=purpose, error=type(error).__name__)
+    except Exception as e:
+        logger.debug("LLM metrics not recorded: %s", e)
+
+
+def invoke_for_text(prompt: str, max_retries: int = 2, use_cache: bool = True, purpose: Optional[str] = None) -> str:
     """
     Invoke LLM with a string prompt.
     Works with both ChatModel and BaseLLM.
-    Retries automatically on failure.
+    Transient failures are retried with jittered exponential backoff; fatal ones (e.g. 401/404) raise at once,
+    and CircuitOpenError is raised without calling the endpoint while it is marked unhealthy.
+    Identical prompts (same model and generation params) are served from the response cache
+    unless use_cache is False. purpose selects the model profile (classify, analyze, gap, plan, risk, risk_option,
+    synthesize, insight); None uses the global model settings.
     """
-    llm = get_llm()
-    last_error = None
+    profile = get_profile(purpose)
+    cache, cache_key, cached = _cache_lookup(prompt, profile, use_cache)
+    if cached is not None:
+        return cached
 
-    for attempt in range(max_retries + 1):
-        try:
-            if isinstance(llm, BaseChatModel):
-                response = llm.invoke([HumanMessage(content=prompt)])
-                text = getattr(response, "content", str(response))
-            else:
-                text = llm.invoke(prompt)
+    settings = get_settings()
+    backend = get_backend()
+    if backend != "openai_compatible":
+        get_llm(purpose)  # configuration errors (missing token, unknown backend) surface before any retry
 
-            if text and str(text).strip():
-                return str(text).strip()
+    started = time.perf_counter()
+    attempts = 0
 
-        except Exception as e:
-            last_error = e
-            if attempt < max_retries:
-                logger.warning(
-                    "LLM attempt %s failed (%s), retrying...",
-                    attempt + 1,
-                    e,
-                )
+    def attempt() -> str:
+        nonlocal attempts
+        attempts += 1
+        if backend == "openai_compatible":
+            text = chat_completion(
+                prompt,
+                model=profile.model,
+                max_new_tokens=profile.max_new_tokens,
+                temperature=profile.temperature,
+                timeout=settings.llm_timeout_seconds,
+            )
+        else:
+            text = _invoke_langchain(prompt, profile)
+        if not (text and str(text).strip()):
+            raise EmptyResponseError("LLM returned no response")
+        return str(text).strip()
+
+    try:
+        text = call_with_resilience(attempt, max_retries)
+    except Exception as e:
+        logger.error("LLM call failed: %s", e)
+        _record_call(profile, "sync", started, prompt, attempts, error=e)
+        raise
+    _record_call(profile, "sync", started, prompt, attempts, text=text)
+    _cache_store(cache, cache_key, profile.model, text)
+    return text
+
+
+async def ainvoke_for_text(
+    prompt: str,
+    max_retries: int = 2,
+    use_cache: bool = True,
+    timeout: Optional[float] = None,
+    purpose: Optional[str] = None,
+) -> str:
+    """
+    Async counterpart of invoke_for_text: same cache, retry and circuit-breaker semantics, but awaits the
+    pooled async client instead of holding a worker thread. At most LLM_MAX_CONCURRENCY calls are in flight
+    per event loop; each attempt is bounded by timeout (default LLM_TIMEOUT_SECONDS).
+    With LLM_HEDGE_ENABLED, an HTTP attempt still running after the model's recent latency percentile is
+    duplicated (within the hedge budget) and the first answer wins; see src/llm/hedging.py.
+    """
+    profile = get_profile(purpose)
+    cache, cache_key, cached = await asyncio.to_thread(_cache_lookup, prompt, profile, use_cache)
+    if cached is not None:
+        return cached
+
+    settings = get_settings()
+    timeout = timeout if timeout is not None else settings.llm_timeout_seconds
+
+    local = get_backend() == "transformers"
+    if local:
+        await asyncio.to_thread(get_llm, purpose)  # model load happens once, off the event loop
+
+    # The local pipeline runs one call at a time, so a duplicate would only queue behind the original
+    hedger = None if local else get_request_hedger()
+
+    async def request() -> str:
+        async with get_llm_semaphore():
+            if local:
+                call = asyncio.to_thread(_invoke_langchain, prompt, profile)
             else:
-                logger.exception(
-                    "LLM failed after %s attempts",
-                    max_retries + 1,
+                call = achat_completion(
+                    prompt,
+                    model=profile.model,
+                    max_new_tokens=profile.max_new_tokens,
+                    temperature=profile.temperature,
+                    timeout=timeout,
                 )
+            text = await asyncio.wait_for(call, timeout=timeout)
+        if not (text and text.strip()):
+            raise EmptyResponseError("LLM returned no response")
+        return text.strip()
+
+    started = time.perf_counter()
+    attempts = 0
+
+    async def attempt() -> str:
+        nonlocal attempts
+        attempts += 1
+        if hedger is None:
+            return await request()
+        return await hedger.run(profile.model, request)
 
-    raise last_error or RuntimeError("LLM returned no response")
+    try:
+        text = await acall_with_resilience(attempt, max_retries)
+    except Exception as e:
+        logger.error("Async LLM call failed: %s", e)
+        _record_call(profile, "async", started, prompt, attempts, error=e)
+        raise
+    _record_call(profile, "async", started, prompt, attempts, text=text)
+    await asyncio.to_thread(_cache_store, cache, cache_key, profile.model, text)
+    return text
+
+
+async def astream_text(
+    prompt: str,
+    max_retries: int = 2,
+    use_cache: bool = True,
+    timeout: Optional[float] = None,
+    purpose: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of ainvoke_for_text: yields text deltas as they arrive. A cache hit is yielded
+    as one chunk; the full text is cached once the stream completes. Failures are retried only while
+    nothing has been yielded yet; a stream that breaks midway raises. timeout bounds the total time spent
+    waiting on the endpoint; time the consumer spends between chunks is not counted, and the concurrency
+    slot is held only while a chunk is awaited. The transformers backend does not stream and yields the
+    whole answer as one chunk.
+    """
+    if get_backend() == "transformers":
+        yield await ainvoke_for_text(prompt, max_retries=max_retries, use_cache=use_cache, timeout=timeout, purpose=purpose)
+        return
+
+    profile = get_profile(purpose)
+    cache, cache_key, cached = await asyncio.to_thread(_cache_lookup, prompt, profile, use_cache)
+    if cached is not None:
+        yield cached
+        return
+
+    settings = get_settings()
+    timeout = timeout if timeout is not None else settings.llm_timeout_seconds
+    breaker = get_circuit_breaker()
+    started = time.perf_counter()
+    for attempt in range(max_retries + 1):
+        parts: list[str] = []
+        try:
+            probe = breaker.before_call()
+        except CircuitOpenError as e:
+            _record_call(profile, "stream", started, prompt, attempt, error=e)
+            raise
+        try:
+            stream = astream_chat_completion(
+                prompt,
+                model=profile.model,
+                max_new_tokens=profile.max_new_tokens,
+                temperature=profile.temperature,
+                timeout=timeout,
+            )
+            remaining = timeout
+            try:
+                while True:
+                    # Only the read is under the deadline and the semaphore, never the yield to the consumer
+                    read_started = time.perf_counter()
+                    try:
+                        async with get_llm_semaphore(), asyncio.timeout(max(0.0, remaining)):
+                            delta = await anext(stream)
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        remaining -= time.perf_counter() - read_started
+                    if not parts:
+                        delta = delta.lstrip()
+                        if not delta:
+                            continue
+                    parts.append(delta)
+                    yield delta
+            finally:
+                await stream.aclose()
+            text = "".join(parts).strip()
+            if not text:
+                raise EmptyResponseError("LLM returned no response")
+            breaker.record_success()
+            _record_call(profile, "stream", started, prompt, attempt + 1, text=text)
+            await asyncio.to_thread(_cache_store, cache, cache_key, profile.model, text)
+            return
+
+        except Exception as e:
+            breaker.record_failure(e)
+            if parts:
+                logger.warning("LLM stream failed after %d chunks: %s", len(parts), e)
+                _record_call(profile, "stream", started, prompt, attempt + 1, text="".join(parts), error=e)
+                raise
+            if attempt >= max_retries or not is_retryable(e):
+                logger.error("LLM stream failed: %s", e)
+                _record_call(profile, "stream", started, prompt, attempt + 1, error=e)
+                raise
+            delay = backoff_delay(attempt + 1)
+            logger.warning("LLM stream attempt %s failed (%s), retrying in %.1fs...", attempt + 1, e, delay)
+            await asyncio.sleep(delay)
+        except BaseException:  # consumer closed the stream (GeneratorExit) or the task was cancelled
+            if probe:
+                breaker.release_probe()
+            raise
@@ -0,0 +1,169 @@
+"""Hedged LLM requests: duplicate a call that outlives the recent latency percentile, keep the first result."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Rolling window of recent successful call latencies per model."""
+
+    def __init__(self, window: int) -> None:
+        self.window = max(1, window)
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(model)
+            if samples is None:
+                samples = self._samples[model] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, model: str, pct: float, min_samples: int = 1) -> Optional[float]:
+        """pct-th percentile (nearest rank) of the window, or None with fewer than min_samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(model) or ())
+        if len(samples) < max(1, min_samples):
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(pct / 100.0 * len(samples))) - 1))
+        return samples[rank]
+
+    def stats(self) -> dict[str, Any]:
+        out: dict[str, Any] = {}
+        for model in list(self._samples):
+            with self._lock:
+                count = len(self._samples.get(model) or ())
+            out[model] = {
+                "samples": count,
+                "p50_seconds": self.percentile(model, 50),
+                "p95_seconds": self.percentile(model, 95),
+                "p99_seconds": self.percentile(model, 99),
+            }
+        return out
+
+
+class HedgeBudget:
+    """
+    Token bucket capping hedges at ratio x primary calls: every primary call earns ratio tokens
+    (up to burst), every hedge spends one.
+    """
+
+    def __init__(self, ratio: float, burst: float = 5.0) -> None:
+        self.ratio = max(0.0, ratio)
+        self.burst = max(1.0, burst)
+        self._tokens = 0.0
+        self.primary_calls = 0
+        self.hedges = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def on_call(self) -> None:
+        with self._lock:
+            self.primary_calls += 1
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self.hedges += 1
+                return True
+            self.denied += 1
+            return False
+
+
+class RequestHedger:
+    """Runs calls with an optional hedge; shared by all async LLM calls in the process."""
+
+    def __init__(self, percentile: float, min_samples: int, window: int, budget_ratio: float) -> None:
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.latency = LatencyTracker(window)
+        self.budget = HedgeBudget(budget_ratio)
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    async def run(self, model: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await call(). If it has not finished after the model's latency percentile and the budget allows,
+        start a duplicate, return whichever succeeds first and cancel the other. A failure of one copy
+        waits for the other before raising.
+        """
+        self.budget.on_call()
+        started = time.monotonic()
+        primary = asyncio.ensure_future(call())
+        threshold = self.latency.percentile(model, self.percentile, self.min_samples)
+        tasks = {primary}
+        hedge: Optional[asyncio.Future] = None
+        try:
+            if threshold is not None:
+                done, _ = await asyncio.wait(tasks, timeout=threshold)
+                if not done and self.budget.try_spend():
+                    logger.info("Hedging %s call after %.2fs (p%.0f)", model, threshold, self.percentile)
+                    hedge = asyncio.ensure_future(call())
+                    tasks.add(hedge)
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        self.latency.record(model, time.monotonic() - started)
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": True,
+            "percentile": self.percentile,
+            "budget_ratio": self.budget.ratio,
+            "primary_calls": self.budget.primary_calls,
+            "hedges": self.budget.hedges,
+            "hedge_wins": self.hedge_wins,
+            "denied_by_budget": self.budget.denied,
+            "latency": self.latency.stats(),
+        }
+
+
+_hedger: Optional[RequestHedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_request_hedger() -> Optional[RequestHedger]:
+    """Process-wide hedger, or None when disabled (LLM_HEDGE_ENABLED=false)."""
+    global _hedger
+    settings = get_settings()
+    if not settings.llm_hedge_enabled:
+        return None
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = RequestHedger(
+                percentile=settings.llm_hedge_percentile,
+                min_samples=settings.llm_hedge_min_samples,
+                window=settings.llm_hedge_window,
+                budget_ratio=settings.llm_hedge_budget_ratio,
+            )
+        return _hedger
+
+
+def get_hedging_stats() -> dict[str, Any]:
+    """Hedging counters and per-model latency percentiles for health output."""
+    hedger = get_request_hedger()
+    return hedger.stats() if hedger is not None else {"enabled": False}
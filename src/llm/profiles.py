@@ -0,0 +1,69 @@
+"""Per-purpose LLM profiles: which model, token limit and temperature each call site uses."""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from config import get_settings
+
+LLM_BACKENDS = ("hf_endpoint", "openai_compatible", "transformers")
+
+# Call sites. Cheap, structured steps (one-word labels, short JSON) run on LLM_FAST_MODEL when set.
+PURPOSES = ("classify", "analyze", "gap", "plan", "risk", "risk_option", "synthesize", "insight")
+FAST_PURPOSES = {"classify", "analyze", "gap"}
+
+# Built-in defaults; None means "use the global setting" (LLM_MAX_NEW_TOKENS / LLM_TEMPERATURE).
+# LLM_PROFILES overrides any field, e.g. {"classify": {"model": "Qwen/Qwen2.5-0.5B-Instruct", "max_new_tokens": 4}}
+DEFAULT_PROFILES: dict[str, dict[str, Any]] = {
+    "classify": {"max_new_tokens": 8, "temperature": 0.0},
+    "analyze": {"max_new_tokens": 384, "temperature": 0.0},
+    "gap": {"max_new_tokens": 384, "temperature": 0.0},
+    "plan": {},
+    "risk": {},
+    "risk_option": {"max_new_tokens": 256},
+    "synthesize": {},
+    "insight": {"max_new_tokens": 512},
+}
+
+
+@dataclass(frozen=True)
+class LLMProfile:
+    """Resolved generation settings for one purpose (hashable: used as the client cache key)."""
+
+    purpose: str
+    model: str
+    max_new_tokens: int
+    temperature: float
+
+    def cache_params(self) -> dict[str, Any]:
+        """Parameters that change the output; part of the response-cache key."""
+        return {"backend": get_backend(), "max_new_tokens": self.max_new_tokens, "temperature": self.temperature}
+
+
+def get_backend() -> str:
+    backend = get_settings().llm_backend.strip().lower()
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM_BACKEND {backend!r}; expected one of {', '.join(LLM_BACKENDS)}")
+    return backend
+
+
+def default_model() -> str:
+    settings = get_settings()
+    return settings.llm_local_model if get_backend() == "transformers" else settings.llm_model_name
+
+
+def get_profile(purpose: Optional[str] = None) -> LLMProfile:
+    """Profile for a call site; None (or an unknown purpose) gives the global defaults."""
+    settings = get_settings()
+    purpose = purpose or "default"
+    spec = {**DEFAULT_PROFILES.get(purpose, {}), **(settings.llm_profiles.get(purpose) or {})}
+    model = spec.get("model")
+    if not model and purpose in FAST_PURPOSES and settings.llm_fast_model:
+        model = settings.llm_fast_model
+    max_new_tokens = spec.get("max_new_tokens")
+    temperature = spec.get("temperature")
+    return LLMProfile(
+        purpose=purpose,
+        model=model or default_model(),
+        max_new_tokens=int(max_new_tokens if max_new_tokens is not None else settings.llm_max_new_tokens),
+        temperature=float(temperature if temperature is not None else settings.llm_temperature),
+    )
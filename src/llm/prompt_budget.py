@@ -0,0 +1,219 @@
+"""Tokenizer-aware prompt building: fit whole context chunks and long inputs into per-node token budgets."""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from config import get_settings
+from src.llm.profiles import default_model, get_profile
+
+logger = logging.getLogger(__name__)
+
+# Prompt-side token budget per call site (system prompt + template + context). The effective budget is
+# also capped by LLM_CONTEXT_WINDOW minus LLM_MAX_NEW_TOKENS, so generation always has room.
+NODE_PROMPT_BUDGETS: dict[str, int] = {
+    "knowledge_gap": 1500,
+    "strategic_reasoning": 2500,
+    "risk_assessment": 2500,
+    "risk_option": 1500,
+    "decision_synthesis": 2500,
+    "insight": 2500,
+    "insight_fallback": 800,
+}
+DEFAULT_PROMPT_BUDGET = 2000
+
+# Model profile (purpose) behind each call site, for the generation reserve
+NODE_PURPOSES: dict[str, str] = {
+    "knowledge_gap": "gap",
+    "strategic_reasoning": "plan",
+    "risk_assessment": "risk",
+    "risk_option": "risk_option",
+    "decision_synthesis": "synthesize",
+    "insight": "insight",
+    "insight_fallback": "insight",
+}
+
+# Heuristic used when no tokenizer can be loaded (offline, gated model, LLM_TOKENIZER=chars)
+CHARS_PER_TOKEN = 4
+
+# Loaded tokenizers by name (None = unavailable, character heuristic); one per model the profiles use
+_tokenizers: dict[str, Any] = {}
+_tokenizer_lock = threading.Lock()
+
+
+def _tokenizer_name(model: Optional[str] = None) -> str:
+    """LLM_TOKENIZER when set (one tokenizer for every model), else the model's own (default: the global model)."""
+    return get_settings().llm_tokenizer or model or default_model()
+
+
+def get_tokenizer(model: Optional[str] = None) -> Any:
+    """
+    The (fast) tokenizer of model, or of the default model, loaded once per name; None when unavailable
+    (the character heuristic is used).
+    """
+    name = _tokenizer_name(model)
+    if name in _tokenizers:
+        return _tokenizers[name]
+    with _tokenizer_lock:
+        if name not in _tokenizers:
+            tokenizer = None
+            if name.lower() != "chars":
+                try:
+                    from transformers import AutoTokenizer
+
+                    tokenizer = AutoTokenizer.from_pretrained(name, token=get_settings().huggingface_hub_token)
+                    logger.info("Prompt budgeting with tokenizer: %s", name)
+                except Exception as e:
+                    logger.warning("Tokenizer %s unavailable (%s); estimating %d chars/token", name, e, CHARS_PER_TOKEN)
+            _tokenizers[name] = tokenizer
+    return _tokenizers[name]
+
+
+def preload_tokenizers() -> None:
+    """Load the tokenizer of every call site's model now (startup) rather than inside the first request."""
+    for model in {get_profile(purpose).model for purpose in NODE_PURPOSES.values()} | {default_model()}:
+        get_tokenizer(model)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Token count of text under model's tokenizer (default: the global model), without special tokens."""
+    if not text:
+        return 0
+    tokenizer = get_tokenizer(model)
+    if tokenizer is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """
+    Longest prefix of text within max_tokens (counted for model), cut back to the last paragraph, line or
+    sentence break when one falls in the final fifth of the kept text (so the cut is not mid-sentence).
+    """
+    if max_tokens <= 0 or not text:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    tokenizer = get_tokenizer(model)
+    end = max_tokens * CHARS_PER_TOKEN
+    if tokenizer is not None and getattr(tokenizer, "is_fast", False):
+        offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+        end = offsets[max_tokens - 1][1] if len(offsets) >= max_tokens else len(text)
+    elif tokenizer is not None:
+        ids = tokenizer.encode(text, add_special_tokens=False)[:max_tokens]
+        end = len(tokenizer.decode(ids, skip_special_tokens=True))
+    kept = text[:end]
+    floor = int(len(kept) * 0.8)
+    for boundary in ("\n\n", "\n", ". "):
+        cut = kept.rfind(boundary)
+        if cut >= floor:
+            return kept[: cut + (1 if boundary == ". " else 0)].rstrip()
+    return kept.rstrip()
+
+
+def fit_chunks(
+    chunks: Sequence[str], max_tokens: int, separator: str = "\n\n", model: Optional[str] = None
+) -> tuple[str, int]:
+    """
+    Join whole chunks, taken in the given (relevance) order, while they fit in max_tokens; chunks that do
+    not fit are skipped so a later, shorter one can still be used. If not even the first chunk fits, it is
+    truncated rather than returning no context. Returns (text, number of chunks included).
+    """
+    if not chunks or max_tokens <= 0:
+        return "", 0
+    sep_tokens = count_tokens(separator, model)
+    kept: list[str] = []
+    used = 0
+    for chunk in chunks:
+        cost = count_tokens(chunk, model) + (sep_tokens if kept else 0)
+        if used + cost <= max_tokens:
+            kept.append(chunk)
+            used += cost
+    if not kept:
+        return truncate_to_tokens(chunks[0], max_tokens, model), 1
+    return separator.join(kept), len(kept)
+
+
+@dataclass
+class PromptReport:
+    """Token accounting for one built prompt."""
+
+    node: str
+    prompt_tokens: int
+    budget: int
+    reserved_new_tokens: int
+    chunks_used: int = 0
+    chunks_total: int = 0
+    truncated: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        text = f"prompt {self.prompt_tokens}/{self.budget} tokens (+{self.reserved_new_tokens} reserved for output)"
+        if self.chunks_total:
+            text += f", {self.chunks_used}/{self.chunks_total} chunks"
+        if self.truncated:
+            text += f", truncated: {', '.join(self.truncated)}"
+        return text
+
+
+def prompt_budget(node: str) -> tuple[int, int]:
+    """(prompt token budget, tokens reserved for generation) for a call site."""
+    settings = get_settings()
+    reserved = get_profile(NODE_PURPOSES.get(node)).max_new_tokens
+    window_room = max(256, settings.llm_context_window - reserved)
+    return min(NODE_PROMPT_BUDGETS.get(node, DEFAULT_PROMPT_BUDGET), window_room), reserved
+
+
+def build_prompt(
+    node: str,
+    system: str,
+    template: str,
+    fixed: Optional[dict[str, str]] = None,
+    chunks: Optional[dict[str, Sequence[str]]] = None,
+    texts: Optional[dict[str, str]] = None,
+    shares: Optional[dict[str, float]] = None,
+    separator: str = "\n\n",
+) -> tuple[str, PromptReport]:
+    """
+    Render f"{system}\\n\\n{template}" within the node's token budget, counted with the tokenizer of the
+    model the node's profile calls. fixed fields are inserted as-is;
+    chunks fields (lists in relevance order) are filled with whole chunks joined by separator; texts fields
+    are truncated at a clean boundary. Room left after the fixed parts is split across variable fields by
+    shares (default equal; chunks fields first, then texts); room a field does not use passes on to the next.
+    """
+    fixed = dict(fixed or {})
+    chunks = dict(chunks or {})
+    texts = dict(texts or {})
+    budget, reserved = prompt_budget(node)
+    model = get_profile(NODE_PURPOSES.get(node)).model
+
+    def render(values: dict[str, str]) -> str:
+        user = template.format(**fixed, **values)
+        return f"{system}\n\n{user}" if system else user
+
+    variable = list(chunks) + list(texts)
+    base_tokens = count_tokens(render({name: "" for name in variable}), model)
+    room = max(0, budget - base_tokens)
+    weights = {name: (shares or {}).get(name, 1.0) for name in variable}
+    total_weight = sum(weights.values()) or 1.0
+
+    values: dict[str, str] = {}
+    report = PromptReport(node=node, prompt_tokens=0, budget=budget, reserved_new_tokens=reserved)
+    carry = 0
+    for name in variable:
+        allowance = int(room * weights[name] / total_weight) + carry
+        if name in chunks:
+            items = [c for c in chunks[name] if c]
+            values[name], used_count = fit_chunks(items, allowance, separator, model)
+            report.chunks_used += used_count
+            report.chunks_total += len(items)
+        else:
+            values[name] = truncate_to_tokens(texts[name], allowance, model)
+            if len(values[name]) < len(texts[name]):
+                report.truncated.append(name)
+        carry = max(0, allowance - count_tokens(values[name], model))
+
+    prompt = render(values)
+    report.prompt_tokens = count_tokens(prompt, model)
+    logger.info("%s: %s", node, report.summary())
+    return prompt, report
@@ -0,0 +1,233 @@
+"""Retry with exponential backoff + jitter and a process-wide circuit breaker around LLM endpoint calls."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from tenacity import AsyncRetrying, RetryCallState, Retrying, retry_if_exception, stop_after_attempt
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeouts, rate limits, and server-side failures
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the endpoint while the circuit breaker is open."""
+
+
+class EmptyResponseError(RuntimeError):
+    """The endpoint answered but produced no text (treated as a transient failure)."""
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status from httpx / requests / huggingface_hub errors (all carry .response.status_code)."""
+    response = getattr(exc, "response", None)
+    code = getattr(response, "status_code", None) or getattr(exc, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Transient failures (timeouts, connection errors, 408/429/5xx, empty output) are retried.
+    Fatal ones (other 4xx such as bad token or unknown model, configuration and programming errors)
+    are raised immediately, as is CircuitOpenError.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    if isinstance(exc, (httpx.TransportError, asyncio.TimeoutError, TimeoutError, ConnectionError, EmptyResponseError)):
+        return True
+    if isinstance(exc, (ValueError, TypeError, KeyError, AttributeError, NotImplementedError)):
+        return False
+    return True
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(max, base * 2**(attempt-1))) for attempt >= 1."""
+    settings = get_settings()
+    ceiling = min(settings.llm_retry_max_seconds, settings.llm_retry_base_seconds * (2 ** max(0, attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    closed: calls pass; consecutive retryable failures are counted and at failure_threshold the breaker opens.
+    open: calls fail fast with CircuitOpenError until recovery_seconds have passed.
+    half_open: one probe call is let through; success closes the breaker, failure re-opens it.
+    Fatal (non-retryable) errors say nothing about endpoint health and do not count.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_seconds: float) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_seconds = recovery_seconds
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._rejected = 0
+        self._times_opened = 0
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """
+        Raise CircuitOpenError if the call must not go out; otherwise admit it. Returns True when it was
+        admitted as the half-open probe (see release_probe).
+        """
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_seconds:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+                logger.info("LLM circuit half-open: probing endpoint")
+            if self._state == self.CLOSED:
+                return False
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            retry_in = max(0.0, self.recovery_seconds - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(f"LLM endpoint circuit is open (retry in {retry_in:.0f}s)")
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("LLM circuit closed: endpoint recovered")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """
+        The probe ended without an outcome (cancelled, generator closed): free the slot so the next call
+        probes. Not counted as an endpoint failure.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_failure(self, exc: BaseException) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+            if not is_retryable(exc):
+                return
+            self._failures += 1
+            self._last_error = f"{type(exc).__name__}: {exc}"[:300]
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._times_opened += 1
+                    logger.warning("LLM circuit open after %d failures: %s", self._failures, self._last_error)
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            state = self._state
+            if state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_seconds:
+                state = self.HALF_OPEN  # the next call will probe
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_seconds": self.recovery_seconds,
+                "times_opened": self._times_opened,
+                "rejected_calls": self._rejected,
+                "last_error": self._last_error,
+            }
+
+
+_breaker: Optional[CircuitBreaker] = None
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Process-wide breaker shared by sync, async and streaming LLM calls."""
+    global _breaker
+    with _breaker_lock:
+        if _breaker is None:
+            settings = get_settings()
+            _breaker = CircuitBreaker(
+                failure_threshold=settings.llm_breaker_failure_threshold,
+                recovery_seconds=settings.llm_breaker_recovery_seconds,
+            )
+        return _breaker
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    logger.warning(
+        "LLM attempt %s failed (%s), retrying in %.1fs...",
+        retry_state.attempt_number,
+        exc,
+        retry_state.next_action.sleep if retry_state.next_action else 0.0,
+    )
+
+
+def _retry_kwargs(max_retries: int) -> dict[str, Any]:
+    return {
+        "stop": stop_after_attempt(max_retries + 1),
+        "wait": lambda retry_state: backoff_delay(retry_state.attempt_number),
+        "retry": retry_if_exception(is_retryable),
+        "before_sleep": _log_retry,
+        "reraise": True,
+    }
+
+
+def call_with_resilience(fn: Callable[[], T], max_retries: int) -> T:
+    """Run fn through the circuit breaker, retrying transient failures with jittered backoff."""
+    breaker = get_circuit_breaker()
+
+    for attempt in Retrying(**_retry_kwargs(max_retries)):
+        with attempt:
+            probe = breaker.before_call()
+            try:
+                result = fn()
+            except Exception as e:
+                breaker.record_failure(e)
+                raise
+            except BaseException:
+                if probe:
+                    breaker.release_probe()
+                raise
+            breaker.record_success()
+    return result
+
+
+async def acall_with_resilience(fn: Callable[[], Awaitable[T]], max_retries: int) -> T:
+    """Async counterpart of call_with_resilience; fn is a zero-argument coroutine factory (called per attempt)."""
+    breaker = get_circuit_breaker()
+
+    async for attempt in AsyncRetrying(**_retry_kwargs(max_retries)):
+        with attempt:
+            probe = breaker.before_call()
+            try:
+                result = await fn()
+            except Exception as e:
+                breaker.record_failure(e)
+                raise
+            except BaseException:  # CancelledError (client gone, outer wait_for, hedge loser), KeyboardInterrupt
+                if probe:
+                    breaker.release_probe()
+                raise
+            breaker.record_success()
+    return result
+
+
+def get_circuit_breaker_stats() -> dict[str, Any]:
+    """Breaker state for health output."""
+    return get_circuit_breaker().stats()
@@ -7,6 +7,9 @@ from src.models.schemas import (
     Source,
     RiskSummary,
     ReasoningStep,
+    JobStatus,
+    IngestionFileStatus,
+    IngestionJob,
 )
 
 __all__ = [
@@ -16,4 +19,7 @@ __all__ = [
     "Source",
     "RiskSummary",
     "ReasoningStep",
+    "JobStatus",
+    "IngestionFileStatus",
+    "IngestionJob",
 ]
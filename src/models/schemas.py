@@ -3,7 +3,11 @@
 from enum import Enum
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+# Strategic run ids (checkpoint threads) as issued by the Decision Agent
+RUN_ID_PATTERN = r"^decision-[0-9a-f]{32}$"
 
 
 class AgentType(str, Enum):
@@ -18,6 +22,11 @@ class AskRequest(BaseModel):
 
     question: str = Field(..., min_length=1, description="User question")
     mode: str = Field(default="auto", description="auto | insight | strategic")
+    resume_run_id: Optional[str] = Field(
+        default=None,
+        pattern=RUN_ID_PATTERN,
+        description="run_id of a failed strategic run to continue from its last completed step",
+    )
 
 
 class Source(BaseModel):
@@ -53,3 +62,40 @@ class AskResponse(BaseModel):
     sources: list[Source] = Field(default_factory=list)
     reasoning_trace: Optional[list[ReasoningStep]] = None
     risk_summary: Optional[RiskSummary] = None
+    cached: bool = Field(default=False, description="True when served from the semantic answer cache")
+    run_id: Optional[str] = Field(
+        default=None, description="Set when a strategic run failed; send it back as resume_run_id to continue that run"
+    )
+
+    # Set False by agents on degraded/error answers so they are never cached (not serialised).
+    _cacheable: bool = PrivateAttr(default=True)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background ingestion job or one of its files."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class IngestionFileStatus(BaseModel):
+    """Per-file progress inside an ingestion job."""
+
+    filename: str = Field(..., description="Stored file name under data/documents")
+    status: JobStatus = JobStatus.QUEUED
+    chunks: int = Field(default=0, description="Chunks written to the vector store so far")
+    total_chunks: Optional[int] = Field(default=None, description="Chunks produced by splitting (known once loaded)")
+    error: Optional[str] = None
+
+
+class IngestionJob(BaseModel):
+    """GET /jobs/{id} response body; also returned (queued) by POST /upload."""
+
+    job_id: str = Field(..., description="Identifier to poll at GET /jobs/{job_id}")
+    status: JobStatus = JobStatus.QUEUED
+    files: list[IngestionFileStatus] = Field(default_factory=list)
+    chunks_added: int = 0
+    created_at: float = Field(..., description="Unix timestamp")
+    finished_at: Optional[float] = None
@@ -0,0 +1,5 @@
+"""Observability: in-process metrics exported in Prometheus format."""
+
+from src.observability.metrics import REGISTRY, Counter, Histogram, MetricsRegistry, render_metrics
+
+__all__ = ["REGISTRY", "Counter", "Histogram", "MetricsRegistry", "render_metrics"]
@@ -1,6 +1,6 @@
 """Prompt for the Question Analyzer node: classify, extract intent, generate sub-questions."""
 
-QUESTION_ANALYZER_SYSTEM_PROMPT = """You are analyzing a strategic or open-ended question to drive a research and decision workflow.
+QUESTION_ANALYZER_SYSTEM_PROMPT = """You are analyzing a business question to route it and, if strategic, drive a research and decision workflow.
 
 Your tasks:
 1. Classify the question as "factual" (answerable from documents alone) or "strategic" (needs reasoning, options, trade-offs).
@@ -28,3 +28,29 @@ Company context (relevant excerpt):
 
 Produce risk analysis for each option with level and score. Use the section headers from the system prompt.
 """
+
+# Per-option variant: one call per option, run concurrently, with a shorter prompt and output
+RISK_OPTION_SYSTEM_PROMPT = """You are a risk analyst. Assess the risks of ONE strategic option.
+
+Rules:
+- Consider operational, financial, reputational, and strategic risks.
+- List 2-4 key risks. Be specific and brief.
+- Assign a risk level (LOW, MEDIUM, or HIGH) and a numeric score from 1 (low) to 10 (high).
+- If internal context mentions specific risks, use them; otherwise reason from the option description.
+
+Output format (exactly this, nothing else):
+## Option {letter}: {name}
+- Risk level: LOW | MEDIUM | HIGH (score: 1-10)
+- Risks: (bullet list)
+"""
+
+RISK_OPTION_USER_TEMPLATE = """Strategic question: {question}
+
+Option under assessment:
+{option}
+
+Company context (relevant excerpt):
+{context}
+
+Produce the risk assessment for this option only, using the header from the system prompt.
+"""
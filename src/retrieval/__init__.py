@@ -5,6 +5,19 @@ from src.retrieval.vector_store import (
     get_vector_store,
     query_documents,
     invalidate_corpus_cache,
+    get_keyword_index,
+    delete_document_chunks,
+    get_corpus_version,
 )
+from src.retrieval.keyword_index import KeywordIndex
 
-__all__ = ["get_embedding_model", "get_vector_store", "query_documents", "invalidate_corpus_cache"]
+__all__ = [
+    "get_embedding_model",
+    "get_vector_store",
+    "query_documents",
+    "invalidate_corpus_cache",
+    "get_keyword_index",
+    "delete_document_chunks",
+    "get_corpus_version",
+    "KeywordIndex",
+]
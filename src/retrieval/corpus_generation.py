@@ -0,0 +1,76 @@
+"""Persisted corpus generation: a counter on disk bumped by every process that changes the stored chunks."""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: bumps are serialized within a process only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusGeneration:
+    """
+    Integer stored in a small file next to the keyword index snapshot. Every add or delete of chunks, in any
+    process (API, ingestion jobs, scripts/import_corpus.py), bumps it; indexes and caches remember the
+    generation they were built at and are stale when it differs. Reads stat the file and re-read it only
+    when it was replaced, so checking on every query is cheap.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stat_key: Optional[tuple] = None
+        self._value = 0
+
+    def _read(self) -> int:
+        try:
+            return int(self.path.read_text(encoding="utf-8").strip() or 0)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read corpus generation %s: %s", self.path, e)
+            return 0
+
+    def current(self) -> int:
+        """The latest generation written by any process."""
+        try:
+            st = os.stat(self.path)
+            key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            key = None
+        with self._lock:
+            if key is None or key != self._stat_key:
+                self._value = self._read() if key is not None else 0
+                self._stat_key = key
+            return self._value
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def bump(self) -> tuple[int, int]:
+        """Increment the generation (atomic replace); returns (before, after)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._file_lock():
+            before = self._read()
+            after = before + 1
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(str(after), encoding="utf-8")
+            tmp.replace(self.path)
+            self._stat_key = None  # re-stat on next current()
+        return before, after
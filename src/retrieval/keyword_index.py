@@ -0,0 +1,181 @@
+"""In-memory BM25 keyword index over stored chunks, keyed by Chroma id, with an on-disk snapshot."""
+
+import logging
+import pickle
+import re
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from rank_bm25 import BM25Okapi
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Simple tokenizer for BM25: lowercase, split on non-alphanumeric."""
+    return re.findall(r"\w+", (text or "").lower())
+
+
+class KeywordIndex:
+    """
+    BM25 corpus that can be extended in place. Adds are O(batch); the BM25 statistics are
+    rebuilt lazily on the next search after a change. Removals only tombstone entries
+    (search skips them) until compact() drops them and rebuilds the statistics.
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[dict] = []
+        self._tokens: List[List[str]] = []
+        self._positions: dict[str, int] = {}
+        self._tombstones: set[int] = set()
+        self._generation = 0  # bumped on every mutation; lets compact() detect concurrent changes
+        self._bm25: Optional[BM25Okapi] = None
+        self._lock = threading.RLock()
+        # Persisted corpus generation this index reflects (see corpus_generation.py); None = unknown
+        self.corpus_generation: Optional[int] = None
+
+    def __len__(self) -> int:
+        """Number of live (non-tombstoned) chunks."""
+        return len(self.ids) - len(self._tombstones)
+
+    @property
+    def tombstone_ratio(self) -> float:
+        """Fraction of stored entries that are tombstoned."""
+        with self._lock:
+            return len(self._tombstones) / len(self.ids) if self.ids else 0.0
+
+    def add(self, ids: Iterable[str], texts: Iterable[str], metadatas: Iterable[Optional[dict]]) -> None:
+        """Insert or replace chunks by id."""
+        with self._lock:
+            for chunk_id, text, meta in zip(ids, texts, metadatas):
+                text = text or ""
+                tokens = tokenize(text)
+                pos = self._positions.get(chunk_id)
+                if pos is None:
+                    self._positions[chunk_id] = len(self.ids)
+                    self.ids.append(chunk_id)
+                    self.texts.append(text)
+                    self.metadatas.append(meta or {})
+                    self._tokens.append(tokens)
+                else:
+                    self.texts[pos] = text
+                    self.metadatas[pos] = meta or {}
+                    self._tokens[pos] = tokens
+            self._bm25 = None
+            self._generation += 1
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Tombstone chunks by id. O(len(ids)); BM25 statistics are left as-is until compaction."""
+        removed = 0
+        with self._lock:
+            for chunk_id in ids:
+                pos = self._positions.pop(chunk_id, None)
+                if pos is not None:
+                    self._tombstones.add(pos)
+                    removed += 1
+            if removed:
+                self._generation += 1
+        return removed
+
+    def compact(self) -> int:
+        """
+        Drop tombstoned entries and rebuild BM25. The rebuild runs outside the lock so searches
+        continue meanwhile; if the index changed in the meantime the result is discarded and 0 returned.
+        """
+        with self._lock:
+            if not self._tombstones:
+                return 0
+            generation = self._generation
+            live = [i for i in range(len(self.ids)) if i not in self._tombstones]
+            ids = [self.ids[i] for i in live]
+            texts = [self.texts[i] for i in live]
+            metadatas = [self.metadatas[i] for i in live]
+            tokens = [self._tokens[i] for i in live]
+            dropped = len(self._tombstones)
+
+        bm25 = BM25Okapi(tokens) if tokens else None
+
+        with self._lock:
+            if self._generation != generation:
+                logger.debug("Keyword index changed during compaction; will retry later")
+                return 0
+            self.ids, self.texts, self.metadatas, self._tokens = ids, texts, metadatas, tokens
+            self._positions = {chunk_id: i for i, chunk_id in enumerate(ids)}
+            self._tombstones = set()
+            self._bm25 = bm25
+            self._generation += 1
+        logger.info("Keyword index compacted: dropped %d tombstoned chunks, %d live", dropped, len(ids))
+        return dropped
+
+    def _get_bm25(self) -> Optional[BM25Okapi]:
+        with self._lock:
+            if self._bm25 is None and self._tokens:
+                self._bm25 = BM25Okapi(self._tokens)
+                logger.debug("BM25 statistics rebuilt: %d chunks", len(self._tokens))
+            return self._bm25
+
+    def search(self, query: str, n: int) -> List[Tuple[str, dict]]:
+        """Top-n (content, metadata) by BM25 score; zero-score chunks are dropped."""
+        tokenized_query = tokenize(query)
+        if not tokenized_query:
+            return []
+        with self._lock:
+            bm25 = self._get_bm25()
+            if bm25 is None:
+                return []
+            texts, metadatas = self.texts, self.metadatas
+            tombstones = frozenset(self._tombstones)
+        doc_scores = bm25.get_scores(tokenized_query)
+        ranked = sorted(
+            (i for i in range(len(doc_scores)) if i not in tombstones),
+            key=lambda i: -doc_scores[i],
+        )[:n]
+        return [(texts[i], metadatas[i]) for i in ranked if doc_scores[i] > 0]
+
+    def save(self, path: Path) -> None:
+        """Write a snapshot (atomic replace) so the next process can skip rebuilding from Chroma."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            live = [i for i in range(len(self.ids)) if i not in self._tombstones]
+            payload = {
+                "version": SNAPSHOT_VERSION,
+                "ids": [self.ids[i] for i in live],
+                "texts": [self.texts[i] for i in live],
+                "metadatas": [self.metadatas[i] for i in live],
+                "tokens": [self._tokens[i] for i in live],
+                "corpus_generation": self.corpus_generation,
+            }
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+        logger.debug("Keyword index snapshot saved: %s (%d chunks)", path, len(self))
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["KeywordIndex"]:
+        """Load a snapshot written by save(); None if missing or incompatible."""
+        path = Path(path)
+        if not path.is_file():
+            return None
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            logger.warning("Could not read keyword index snapshot %s: %s", path, e)
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+            return None
+        index = cls()
+        index.ids = list(payload["ids"])
+        index.texts = list(payload["texts"])
+        index.metadatas = list(payload["metadatas"])
+        index._tokens = list(payload["tokens"])
+        index._positions = {chunk_id: i for i, chunk_id in enumerate(index.ids)}
+        index.corpus_generation = payload.get("corpus_generation")
+        return index
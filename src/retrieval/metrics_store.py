@@ -0,0 +1,153 @@
+"""Structured metrics store (SQLite): metric / period / value rows extracted from document tables at ingest time."""
+
+import logging
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_init_lock = threading.Lock()
+_initialized = False
+
+_PERIOD_RE = re.compile(
+    r"\b(?:"
+    r"Q(?P<q>[1-4])\s*['’]?\s*(?:FY\s*['’]?)?(?P<qy>\d{4}|\d{2})"
+    r"|H(?P<h>[12])\s*['’]?\s*(?:FY\s*['’]?)?(?P<hy>\d{4}|\d{2})"
+    r"|FY\s*['’]?(?P<fy>\d{4}|\d{2})"
+    r"|(?P<y>20\d{2})"
+    r")\b",
+    re.I,
+)
+
+
+@dataclass
+class MetricRow:
+    """One table cell: a metric's value for a period, with its source."""
+
+    metric: str
+    period: str
+    value: float
+    value_text: str
+    source_file: str
+    unit: str = ""
+    page: Optional[int] = None
+
+    @property
+    def metric_key(self) -> str:
+        return normalize_metric(self.metric)
+
+
+def _full_year(digits: str) -> str:
+    return digits if len(digits) == 4 else f"20{digits}"
+
+
+def find_periods(text: str) -> List[str]:
+    """Normalised periods mentioned in text, in order: 'Q4 FY2025', 'H1 FY2025', 'FY2025' (bare years count as fiscal)."""
+    periods: List[str] = []
+    for m in _PERIOD_RE.finditer(text or ""):
+        if m.group("q"):
+            periods.append(f"Q{m.group('q')} FY{_full_year(m.group('qy'))}")
+        elif m.group("h"):
+            periods.append(f"H{m.group('h')} FY{_full_year(m.group('hy'))}")
+        elif m.group("fy"):
+            periods.append(f"FY{_full_year(m.group('fy'))}")
+        else:
+            periods.append(f"FY{m.group('y')}")
+    return periods
+
+
+def strip_periods(text: str) -> str:
+    """Text with period mentions removed (used to tell header rows from data rows)."""
+    return _PERIOD_RE.sub(" ", text or "")
+
+
+def normalize_metric(name: str) -> str:
+    """Lowercase, drop punctuation and footnote markers, collapse whitespace."""
+    text = re.sub(r"\(\s*\d+\s*\)|\[\s*\d+\s*\]", " ", (name or "").lower())
+    text = re.sub(r"[^a-z0-9%&]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    """Connection for one operation: commits on success, always closed (never shared across threads)."""
+    global _initialized
+    path = get_settings().metrics_db_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=10.0)
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS metrics (
+                        metric TEXT NOT NULL,
+                        metric_key TEXT NOT NULL,
+                        period TEXT NOT NULL,
+                        value REAL NOT NULL,
+                        value_text TEXT NOT NULL,
+                        unit TEXT NOT NULL DEFAULT '',
+                        source_file TEXT NOT NULL,
+                        page INTEGER
+                    )
+                    """
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_lookup ON metrics (metric_key, period)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_source ON metrics (source_file)")
+                conn.commit()
+                _initialized = True
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def replace_source_metrics(source_file: str, rows: Iterable[MetricRow]) -> int:
+    """Replace all metrics for a document with rows. Returns rows written."""
+    data = [
+        (r.metric, r.metric_key, r.period, r.value, r.value_text, r.unit, r.source_file, r.page)
+        for r in rows
+    ]
+    with _connect() as conn:
+        conn.execute("DELETE FROM metrics WHERE source_file = ?", (source_file,))
+        if data:
+            conn.executemany(
+                "INSERT INTO metrics (metric, metric_key, period, value, value_text, unit, source_file, page) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                data,
+            )
+    if data:
+        logger.info("Stored %d metrics from %s", len(data), source_file)
+    return len(data)
+
+
+def delete_source_metrics(source_file: str) -> int:
+    """Remove all metrics extracted from a document."""
+    with _connect() as conn:
+        cur = conn.execute("DELETE FROM metrics WHERE source_file = ?", (source_file,))
+        return cur.rowcount
+
+
+def list_metric_keys() -> List[str]:
+    """Distinct normalised metric names in the store."""
+    with _connect() as conn:
+        return [row[0] for row in conn.execute("SELECT DISTINCT metric_key FROM metrics")]
+
+
+def lookup_metric(metric_key: str, period: str) -> List[MetricRow]:
+    """Exact lookup on normalised metric name and period."""
+    with _connect() as conn:
+        cur = conn.execute(
+            "SELECT metric, period, value, value_text, source_file, unit, page FROM metrics "
+            "WHERE metric_key = ? AND period = ?",
+            (metric_key, period),
+        )
+        return [MetricRow(*row) for row in cur.fetchall()]
@@ -2,17 +2,21 @@
 
 import logging
 import re
+import threading
+import time
 from typing import List, Optional, Tuple
 
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 from langchain_community.vectorstores import Chroma
 from langchain_chroma import Chroma
-from rank_bm25 import BM25Okapi
 
 from config import get_settings
 from src.models.schemas import Source
+from src.observability.metrics import RETRIEVAL_RESULTS, RETRIEVAL_SECONDS
+from src.retrieval.corpus_generation import CorpusGeneration
 from src.retrieval.embeddings import get_embedding_model
+from src.retrieval.keyword_index import KeywordIndex
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +24,15 @@ logger = logging.getLogger(__name__)
 HYBRID_TOP_K = 5
 RRF_K = 60  # Reciprocal Rank Fusion constant
 
+# Background compaction discarded because the index changed meanwhile: retry this many times, this far apart
+COMPACTION_ATTEMPTS = 5
+COMPACTION_RETRY_SECONDS = 2.0
+
 _vector_store: Optional[Chroma] = None
-_bm25_corpus_cache: Optional[Tuple[List[str], List[dict], BM25Okapi]] = None  # (texts, metadatas, bm25)
+_keyword_index: Optional[KeywordIndex] = None
+_keyword_index_lock = threading.Lock()
+_compaction_thread: Optional[threading.Thread] = None
+_corpus_generation: Optional[CorpusGeneration] = None
 
 
 def _normalize_text(text: str) -> str:
@@ -29,11 +40,6 @@ def _normalize_text(text: str) -> str:
     return re.sub(r"\s+", " ", (text or "").strip())
 
 
-def _tokenize(text: str) -> List[str]:
-    """Simple tokenizer for BM25: lowercase, split on non-alphanumeric."""
-    return re.findall(r"\w+", (text or "").lower())
-
-
 def get_vector_store() -> Chroma:
     """Return singleton Chroma vector store."""
     global _vector_store
@@ -53,12 +59,35 @@ def get_vector_store() -> Chroma:
     return _vector_store
 
 
-def _get_bm25_corpus() -> Tuple[List[str], List[dict], BM25Okapi]:
-    """Get or build BM25 corpus from Chroma (all stored chunks). Returns (texts, metadatas, bm25)."""
-    global _bm25_corpus_cache
-    if _bm25_corpus_cache is not None:
-        return _bm25_corpus_cache
+def _generation() -> CorpusGeneration:
+    global _corpus_generation
+    if _corpus_generation is None:
+        _corpus_generation = CorpusGeneration(get_settings().corpus_generation_path)
+    return _corpus_generation
+
+
+def get_corpus_version() -> int:
+    """
+    Persisted corpus generation, shared by every process using the store; caches keyed on it go stale
+    when it moves (including after a CLI import or a change made by another worker).
+    """
+    return _generation().current()
+
+
+def bump_corpus_version(index: Optional[KeywordIndex] = None) -> None:
+    """
+    Record that chunks were added to or removed from the store. index: the keyword index the change was
+    also applied to; it stays current only if no other change landed since it was last current, otherwise
+    the next query reloads or rebuilds it.
+    """
+    before, after = _generation().bump()
+    with _keyword_index_lock:
+        if index is not None and index.corpus_generation == before:
+            index.corpus_generation = after
+
 
+def get_collection():
+    """Return the underlying chromadb collection (for bulk reads and writes)."""
     store = get_vector_store()
     coll = getattr(store, "_collection", None)
     if coll is None:
@@ -68,34 +97,145 @@ def _get_bm25_corpus() -> Tuple[List[str], List[dict], BM25Okapi]:
             settings = get_settings()
             coll = client.get_collection(settings.chroma_collection_name)
     if coll is None:
-        raise RuntimeError("Could not access Chroma collection for BM25 corpus")
+        raise RuntimeError("Could not access Chroma collection")
+    return coll
+
 
-    raw = coll.get(include=["documents", "metadatas"])
+def _build_keyword_index_from_chroma() -> KeywordIndex:
+    """Read all stored chunks from Chroma into a fresh keyword index."""
+    raw = get_collection().get(include=["documents", "metadatas"])
     ids_list = raw.get("ids") or []
     docs_list = raw.get("documents") or []
     metadatas_list = raw.get("metadatas") or [{}] * len(docs_list)
     if len(metadatas_list) != len(docs_list):
         metadatas_list = [{}] * len(docs_list)
+    index = KeywordIndex()
+    index.add(ids_list, docs_list, metadatas_list)
+    logger.debug("Keyword index built from Chroma: %d chunks", len(index))
+    return index
+
+
+def get_keyword_index() -> KeywordIndex:
+    """
+    Return the BM25 keyword index, checked against the persisted corpus generation on every call: when
+    another process (or a change this index missed) moved it, the on-disk snapshot is loaded if it was
+    saved at the current generation, otherwise the index is rebuilt from Chroma (and the snapshot refreshed).
+    """
+    global _keyword_index
+    generation = get_corpus_version()
+    with _keyword_index_lock:
+        if _keyword_index is not None and _keyword_index.corpus_generation == generation:
+            return _keyword_index
+        settings = get_settings()
+        index = KeywordIndex.load(settings.keyword_index_path)
+        if index is None or index.corpus_generation != generation:
+            index = _build_keyword_index_from_chroma()
+            index.corpus_generation = generation  # read before Chroma, so a concurrent change marks it stale
+            try:
+                index.save(settings.keyword_index_path)
+            except OSError as e:
+                logger.warning("Could not save keyword index snapshot: %s", e)
+        _keyword_index = index
+        return _keyword_index
+
+
+def index_chunks(ids: List[str], texts: List[str], metadatas: List[Optional[dict]]) -> None:
+    """
+    Add freshly stored chunks to the keyword index if it is loaded. If it is not loaded yet,
+    it will pick them up from Chroma on first use.
+    """
+    with _keyword_index_lock:
+        index = _keyword_index
+    if index is not None:
+        index.add(ids, texts, metadatas)
+    bump_corpus_version(index)
 
-    texts = [d or "" for d in docs_list]
-    if not texts:
-        tokenized = []
-        bm25 = BM25Okapi(tokenized)
-        _bm25_corpus_cache = (texts, metadatas_list, bm25)
-        return _bm25_corpus_cache
 
-    tokenized_corpus = [_tokenize(t) for t in texts]
-    bm25 = BM25Okapi(tokenized_corpus)
-    _bm25_corpus_cache = (texts, metadatas_list, bm25)
-    logger.debug("BM25 corpus built: %d chunks", len(texts))
-    return _bm25_corpus_cache
+def _compact_keyword_index(index: KeywordIndex) -> None:
+    """
+    Compaction thread. compact() gives up (returns 0) when the index changed during the rebuild, so retry
+    while the tombstoned fraction is still over the threshold and the index is still the loaded one.
+    """
+    try:
+        for attempt in range(COMPACTION_ATTEMPTS):
+            if attempt:
+                time.sleep(COMPACTION_RETRY_SECONDS)
+            if index.compact():
+                save_keyword_index()
+                return
+            with _keyword_index_lock:
+                current = _keyword_index is index
+            if not current or index.tombstone_ratio < get_settings().keyword_index_compact_ratio:
+                return
+        logger.info("Keyword index compaction kept losing to concurrent changes; next delete retries it")
+    except Exception as e:
+        logger.warning("Keyword index compaction failed: %s", e)
+
+
+def _maybe_schedule_compaction(index: KeywordIndex) -> None:
+    """Start a background compaction once the tombstoned fraction passes the configured ratio."""
+    global _compaction_thread
+    if index.tombstone_ratio < get_settings().keyword_index_compact_ratio:
+        return
+    with _keyword_index_lock:
+        if _compaction_thread is not None and _compaction_thread.is_alive():
+            return
+        _compaction_thread = threading.Thread(
+            target=_compact_keyword_index,
+            args=(index,),
+            name="keyword-index-compaction",
+            daemon=True,
+        )
+        _compaction_thread.start()
+
+
+def get_document_chunk_ids(source_file: str) -> List[str]:
+    """Ids of every stored chunk of a document (matched on metadata source_file)."""
+    raw = get_collection().get(where={"source_file": source_file}, include=[])
+    return list(raw.get("ids") or [])
+
+
+def delete_chunks(ids: List[str]) -> int:
+    """Remove chunks by id from Chroma and tombstone them in the keyword index. Returns the number removed."""
+    if not ids:
+        return 0
+    get_collection().delete(ids=ids)
+    with _keyword_index_lock:
+        index = _keyword_index
+    if index is not None:
+        index.remove(ids)
+    bump_corpus_version(index)
+    if index is not None:
+        _maybe_schedule_compaction(index)
+    return len(ids)
+
+
+def delete_document_chunks(source_file: str) -> int:
+    """
+    Remove every chunk of a document from Chroma and tombstone it in the keyword index.
+    Returns the number of chunks removed.
+    """
+    removed = delete_chunks(get_document_chunk_ids(source_file))
+    if removed:
+        logger.info("Deleted %s: %d chunks", source_file, removed)
+    return removed
+
+
+def save_keyword_index() -> None:
+    """Persist the loaded keyword index so later processes can skip the Chroma rebuild."""
+    with _keyword_index_lock:
+        index = _keyword_index
+    if index is not None:
+        index.save(get_settings().keyword_index_path)
 
 
 def invalidate_corpus_cache() -> None:
-    """Call after adding or removing documents so BM25 corpus is rebuilt on next query."""
-    global _bm25_corpus_cache
-    _bm25_corpus_cache = None
-    logger.debug("BM25 corpus cache invalidated")
+    """Call after adding or removing documents outside index_chunks so BM25 is rebuilt on next query."""
+    global _keyword_index
+    with _keyword_index_lock:
+        _keyword_index = None
+    bump_corpus_version()
+    logger.debug("Keyword index invalidated")
 
 
 def _reciprocal_rank_fusion(
@@ -148,15 +288,32 @@ def query_documents(
     """
     Hybrid retrieval: semantic (Chroma top 5) + keyword (BM25 top 5) → RRF → final top 5.
     If use_hybrid is False or BM25 corpus is empty, falls back to Chroma-only.
+    Stage latencies (embed, semantic, keyword, fusion, total) are recorded for /metrics.
     """
+    started = time.perf_counter()
+    sources = _query_documents(query, top_k, score_threshold, use_hybrid)
+    RETRIEVAL_SECONDS.observe(time.perf_counter() - started, stage="total")
+    RETRIEVAL_RESULTS.inc(len(sources))
+    return sources
+
+
+def _query_documents(
+    query: str,
+    top_k: Optional[int],
+    score_threshold: Optional[float],
+    use_hybrid: bool,
+) -> List[Source]:
     store = get_vector_store()
     settings = get_settings()
     k = top_k or settings.top_k_retrieve
     threshold = score_threshold if score_threshold is not None else settings.retrieval_score_threshold
     n = min(k, HYBRID_TOP_K)  # per-system and final top
 
-    # 1) Semantic: Chroma similarity search (top 5)
-    chroma_results = store.similarity_search_with_score(query, k=n)
+    # 1) Semantic: embed the query, then Chroma similarity search (top 5); distances as in similarity_search_with_score
+    with RETRIEVAL_SECONDS.time(stage="embed"):
+        query_embedding = get_embedding_model().embed_query(query)
+    with RETRIEVAL_SECONDS.time(stage="semantic"):
+        chroma_results = store.similarity_search_by_vector_with_relevance_scores(query_embedding, k=n)
     chroma_list: List[Tuple[str, dict, float]] = []
     for doc, score in chroma_results:
         relevance = 1.0 - score if score <= 1.0 else 1.0 / (1.0 + score)
@@ -166,22 +323,15 @@ def query_documents(
     # 2) Keyword: BM25 over all stored chunks (top 5)
     bm25_list: List[Tuple[str, dict]] = []
     try:
-        texts, metadatas_list, bm25 = _get_bm25_corpus()
-        if texts and bm25 is not None:
-            tokenized_query = _tokenize(query)
-            if tokenized_query:
-                doc_scores = bm25.get_scores(tokenized_query)
-                # top n indices by score
-                indices = sorted(range(len(doc_scores)), key=lambda i: -doc_scores[i])[:n]
-                for i in indices:
-                    if doc_scores[i] > 0:
-                        bm25_list.append((texts[i], metadatas_list[i] if i < len(metadatas_list) else {}))
+        with RETRIEVAL_SECONDS.time(stage="keyword"):
+            bm25_list = get_keyword_index().search(query, n)
     except Exception as e:
         logger.warning("BM25 retrieval failed (%s), using semantic-only", e)
 
     # 3) RRF fusion → final top 5
     if use_hybrid and (chroma_list or bm25_list):
-        return _reciprocal_rank_fusion(chroma_list, bm25_list, k=RRF_K, top_n=n)
+        with RETRIEVAL_SECONDS.time(stage="fusion"):
+            return _reciprocal_rank_fusion(chroma_list, bm25_list, k=RRF_K, top_n=n)
     # Fallback: Chroma-only
     return [
         Source(content=content, metadata=meta, score=rel)
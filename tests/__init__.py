@@ -0,0 +1 @@
+"""Unit tests (pytest). Run from the project root: python -m pytest -q tests"""
@@ -0,0 +1,25 @@
+"""Shared pytest setup: project root on sys.path and per-test settings overrides."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import get_settings  # noqa: E402
+
+
+@pytest.fixture
+def override_settings(monkeypatch):
+    """Set fields on the settings singleton for one test: override_settings(checkpoint_max_threads=2)."""
+    settings = get_settings()
+
+    def _override(**fields):
+        for name, value in fields.items():
+            monkeypatch.setattr(settings, name, value)
+        return settings
+
+    return _override
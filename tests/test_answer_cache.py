@@ -0,0 +1,52 @@
+"""Semantic answer cache: paraphrase hits, exact periods/numbers, and corpus-generation invalidation."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("chromadb")
+
+from src.agents import answer_cache  # noqa: E402
+from src.agents.answer_cache import SemanticAnswerCache, exact_terms  # noqa: E402
+from src.models.schemas import AgentType, AskResponse  # noqa: E402
+
+
+@pytest.fixture
+def corpus(monkeypatch):
+    version = {"value": 1}
+    monkeypatch.setattr(answer_cache, "get_corpus_version", lambda: version["value"])
+    return version
+
+
+def _vector(*values):
+    v = np.asarray(values, dtype=np.float32)
+    return v / np.linalg.norm(v)
+
+
+def _response(answer):
+    return AskResponse(agent_type=AgentType.INSIGHT, answer=answer)
+
+
+def test_exact_terms_separate_periods_and_numbers():
+    assert exact_terms("Revenue in Q4 FY2025 above 10%?") == (("Q4 FY2025",), ("10",))
+    assert exact_terms("revenue in Q3 FY2025") != exact_terms("revenue in Q4 FY2025")
+
+
+def test_paraphrase_hits_only_with_same_period(corpus):
+    cache = SemanticAnswerCache(capacity=4, threshold=0.9, ttl_seconds=0)
+    cache.store("What was revenue in Q4 FY2025?", _vector(1, 0), "insight", _response("120"), corpus_version=1)
+
+    hit = cache.lookup("Revenue for Q4 FY2025?", _vector(0.99, 0.05), "insight")
+    assert hit is not None and hit.cached and hit.answer == "120"
+    assert cache.lookup("Revenue for Q3 FY2025?", _vector(1, 0), "insight") is None
+    assert cache.lookup("Revenue for Q4 FY2025?", _vector(1, 0), "strategic") is None
+
+
+def test_corpus_change_drops_entries_and_stale_stores(corpus):
+    cache = SemanticAnswerCache(capacity=4, threshold=0.9, ttl_seconds=0)
+    cache.store("What was revenue in Q4 FY2025?", _vector(1, 0), "insight", _response("120"), corpus_version=1)
+
+    corpus["value"] = 2
+    assert cache.lookup("What was revenue in Q4 FY2025?", _vector(1, 0), "insight") is None
+
+    cache.store("What was revenue in Q4 FY2025?", _vector(1, 0), "insight", _response("120"), corpus_version=1)
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,123 @@
+"""BoundedMemorySaver: whole-thread LRU eviction by count, bytes and idle time, with the run's chunks."""
+
+from typing import TypedDict
+
+import pytest
+
+pytest.importorskip("langchain_huggingface")
+
+from langgraph.graph import END, START, StateGraph  # noqa: E402
+
+from src.graph.checkpoint import BoundedMemorySaver  # noqa: E402
+from src.graph.chunk_store import get_chunk_store  # noqa: E402
+from src.models.schemas import Source  # noqa: E402
+
+
+class _State(TypedDict):
+    n: int
+
+
+def _graph(saver):
+    graph = StateGraph(_State)
+    graph.add_node("step", lambda state: {"n": state["n"] + 1})
+    graph.add_edge(START, "step")
+    graph.add_edge("step", END)
+    return graph.compile(checkpointer=saver)
+
+
+def _run(graph, thread_id):
+    return graph.invoke({"n": 0}, config={"configurable": {"thread_id": thread_id}})
+
+
+def _has_checkpoint(graph, thread_id):
+    return bool(graph.get_state({"configurable": {"thread_id": thread_id}}).values)
+
+
+def test_least_recently_used_thread_is_evicted():
+    saver = BoundedMemorySaver(max_threads=2, ttl_seconds=3600, max_bytes=10**9)
+    graph = _graph(saver)
+    store = get_chunk_store()
+    ids = store.put("t1", [Source(content="kept with t1", metadata={"source_file": "a.txt"})])
+
+    _run(graph, "t1")
+    _run(graph, "t2")
+    _has_checkpoint(graph, "t1")  # reading t1 makes t2 the least recently used
+    _run(graph, "t3")
+
+    assert _has_checkpoint(graph, "t1") and _has_checkpoint(graph, "t3")
+    assert not _has_checkpoint(graph, "t2")
+    assert saver.stats()["threads"] == 2 and saver.stats()["evicted_threads"] == 1
+    assert len(store.get("t1", ids)) == 1
+    store.drop("t1")
+
+
+def test_evicted_thread_drops_its_chunks():
+    saver = BoundedMemorySaver(max_threads=1, ttl_seconds=3600, max_bytes=10**9)
+    graph = _graph(saver)
+    store = get_chunk_store()
+    ids = store.put("old", [Source(content="old chunk", metadata={"source_file": "a.txt"})])
+
+    _run(graph, "old")
+    _run(graph, "new")
+
+    assert store.get("old", ids) == []
+
+
+def test_idle_threads_expire():
+    saver = BoundedMemorySaver(max_threads=100, ttl_seconds=0, max_bytes=10**9)
+    graph = _graph(saver)
+
+    _run(graph, "t1")
+    _run(graph, "t2")
+
+    assert not _has_checkpoint(graph, "t1")
+    assert _has_checkpoint(graph, "t2")
+
+
+def test_byte_limit_never_evicts_the_thread_being_written():
+    saver = BoundedMemorySaver(max_threads=100, ttl_seconds=3600, max_bytes=1)
+    graph = _graph(saver)
+
+    assert _run(graph, "t1") == {"n": 1}
+    _run(graph, "t2")
+
+    assert _has_checkpoint(graph, "t2") and not _has_checkpoint(graph, "t1")
+
+
+def test_delete_thread_releases_its_bytes():
+    saver = BoundedMemorySaver(max_threads=10, ttl_seconds=3600, max_bytes=10**9)
+    graph = _graph(saver)
+    _run(graph, "t1")
+    assert saver.stats()["bytes"] > 0
+
+    saver.delete_thread("t1")
+
+    assert saver.stats()["threads"] == 0
+    assert saver.stats()["bytes"] == 0
+
+
+def test_in_flight_threads_are_never_evicted():
+    saver = BoundedMemorySaver(max_threads=1, ttl_seconds=0, max_bytes=1)
+    graph = _graph(saver)
+    store = get_chunk_store()
+    ids = store.put("running", [Source(content="in use", metadata={"source_file": "a.txt"})])
+    saver.mark_in_flight("running")
+
+    _run(graph, "running")
+    _run(graph, "other")
+
+    assert _has_checkpoint(graph, "running")
+    assert len(store.get("running", ids)) == 1
+
+    saver.mark_done("running")
+    _run(graph, "third")
+
+    assert not _has_checkpoint(graph, "running")
+    assert saver.stats()["in_flight"] == 0
+
+
+def test_missing_chunks_are_logged(caplog):
+    store = get_chunk_store()
+
+    assert store.get("gone-run", ["abc"]) == []
+    assert "1 of 1 chunks missing" in caplog.text
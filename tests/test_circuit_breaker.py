@@ -0,0 +1,88 @@
+"""Circuit breaker: opening on retryable failures, the single half-open probe, and releasing a cancelled probe."""
+
+import asyncio
+
+import httpx
+import pytest
+
+pytest.importorskip("langchain_huggingface")
+
+from src.llm import resilience  # noqa: E402
+from src.llm.resilience import CircuitBreaker, CircuitOpenError  # noqa: E402
+
+
+def _timeout():
+    return httpx.ConnectTimeout("timed out")
+
+
+def _opened(recovery_seconds=0.0):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=recovery_seconds)
+    breaker.record_failure(_timeout())
+    breaker.record_failure(_timeout())
+    return breaker
+
+
+def test_opens_after_threshold_retryable_failures():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=60)
+    breaker.record_failure(ValueError("bad prompt"))  # fatal: not an endpoint health signal
+    breaker.record_failure(_timeout())
+    assert breaker.before_call() is False
+
+    breaker.record_failure(_timeout())
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()["times_opened"] == 1
+
+
+def test_half_open_admits_one_probe():
+    breaker = _opened()
+
+    assert breaker.before_call() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.before_call() is False
+    assert breaker.stats()["state"] == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens():
+    breaker = _opened(recovery_seconds=0.0)
+    assert breaker.before_call() is True
+
+    breaker.recovery_seconds = 60
+    breaker.record_failure(_timeout())
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_release_probe_lets_the_next_call_probe():
+    breaker = _opened()
+    assert breaker.before_call() is True
+
+    breaker.release_probe()
+
+    assert breaker.before_call() is True
+
+
+def test_cancelled_async_probe_is_released(monkeypatch):
+    breaker = _opened()
+    monkeypatch.setattr(resilience, "get_circuit_breaker", lambda: breaker)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(3600)
+
+        task = asyncio.create_task(resilience.acall_with_resilience(hang, max_retries=0))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+    assert breaker.before_call() is True
+    assert breaker.stats()["consecutive_failures"] == 2
@@ -0,0 +1,109 @@
+"""Decision runs: when a resume_run_id resumes its checkpoints and when the run starts over on a new thread."""
+
+import uuid
+from typing import TypedDict
+
+import pytest
+
+pytest.importorskip("langchain_huggingface")
+pytest.importorskip("chromadb")
+
+from langgraph.graph import END, START, StateGraph  # noqa: E402
+
+from src.agents.decision_agent import _failed_run_id, _release_run, _start_run  # noqa: E402
+from src.graph.checkpoint import BoundedMemorySaver  # noqa: E402
+
+
+class _State(TypedDict, total=False):
+    question: str
+    fail: bool
+    done: bool
+
+
+def _second(state):
+    if state.get("fail"):
+        raise RuntimeError("endpoint down")
+    return {"done": True}
+
+
+@pytest.fixture
+def graph():
+    builder = StateGraph(_State)
+    builder.add_node("first", lambda state: {})
+    builder.add_node("second", _second)
+    builder.add_edge(START, "first")
+    builder.add_edge("first", "second")
+    builder.add_edge("second", END)
+    return builder.compile(checkpointer=BoundedMemorySaver(max_threads=100, ttl_seconds=3600, max_bytes=10**9))
+
+
+def _run(graph, question, fail):
+    run_id = f"decision-{uuid.uuid4().hex}"
+    config = {"configurable": {"thread_id": run_id}}
+    try:
+        graph.invoke({"question": question, "fail": fail}, config=config)
+    except RuntimeError:
+        pass
+    return run_id
+
+
+def test_failed_run_for_the_same_question_resumes_its_thread(graph):
+    run_id = _run(graph, "Enter the EU?", fail=True)
+
+    config, run_input = _start_run(graph, "Enter the EU?", None, None, run_id)
+
+    assert config["configurable"]["thread_id"] == run_id
+    assert run_input is None
+
+
+@pytest.mark.parametrize("question, fail", [("Another question?", True), ("Enter the EU?", False)])
+def test_different_question_or_finished_run_starts_over(graph, question, fail):
+    run_id = _run(graph, "Enter the EU?", fail=fail)
+
+    config, run_input = _start_run(graph, question, None, None, run_id)
+
+    assert config["configurable"]["thread_id"] != run_id
+    assert run_input["question"] == question
+    assert run_input["run_id"] == config["configurable"]["thread_id"]
+
+
+def test_unknown_run_id_starts_over(graph):
+    run_id = f"decision-{uuid.uuid4().hex}"
+
+    config, run_input = _start_run(graph, "Enter the EU?", None, None, run_id)
+
+    assert config["configurable"]["thread_id"] != run_id
+    assert run_input is not None
+
+
+@pytest.mark.parametrize("run_id", ["decision-xyz", "other-thread", f"decision-{uuid.uuid4().hex}/../x"])
+def test_foreign_run_ids_are_rejected(graph, run_id):
+    with pytest.raises(ValueError):
+        _start_run(graph, "Enter the EU?", None, None, run_id)
+
+
+def test_failed_run_id_is_kept_only_when_resumable(graph):
+    resumable = _run(graph, "Enter the EU?", fail=True)
+    finished = _run(graph, "Enter the EU?", fail=False)
+
+    assert _failed_run_id(graph, {"configurable": {"thread_id": resumable}}) == resumable
+    assert _failed_run_id(graph, {"configurable": {"thread_id": finished}}) is None
+    assert not graph.get_state({"configurable": {"thread_id": finished}}).values
+
+
+def test_started_runs_are_in_flight_until_released(graph):
+    config, _ = _start_run(graph, "Enter the EU?", None, None, None)
+    assert graph.checkpointer.stats()["in_flight"] == 1
+
+    _release_run(graph, config)
+
+    assert graph.checkpointer.stats()["in_flight"] == 0
+
+
+def test_resumable_failed_run_is_no_longer_in_flight(graph):
+    run_id = _run(graph, "Enter the EU?", fail=True)
+    config, _ = _start_run(graph, "Enter the EU?", None, None, run_id)
+    assert graph.checkpointer.stats()["in_flight"] == 1
+
+    assert _failed_run_id(graph, config) == run_id
+    assert graph.checkpointer.stats()["in_flight"] == 0
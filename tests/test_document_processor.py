@@ -0,0 +1,63 @@
+"""Re-ingesting a file: new chunks are stored before the previous version's chunks are deleted."""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from langchain_core.documents import Document  # noqa: E402
+
+from src.ingestion import document_processor  # noqa: E402
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    calls = []
+    store = SimpleNamespace(added=0)
+
+    def add_documents(batch):
+        if getattr(store, "fail", False):
+            raise RuntimeError("embedding failed")
+        ids = [f"new-{store.added + i}" for i in range(len(batch))]
+        store.added += len(batch)
+        calls.append(("add", ids))
+        return ids
+
+    store.add_documents = add_documents
+    monkeypatch.setattr(document_processor, "get_vector_store", lambda: store)
+    monkeypatch.setattr(document_processor, "get_document_chunk_ids", lambda name: ["old-0", "old-1"])
+    monkeypatch.setattr(document_processor, "delete_chunks", lambda ids: calls.append(("delete", list(ids))))
+    monkeypatch.setattr(document_processor, "index_chunks", lambda ids, texts, metadatas: None)
+    monkeypatch.setattr(document_processor, "replace_source_metrics", lambda name, metrics: None)
+    monkeypatch.setattr(document_processor, "extract_metrics", lambda docs, name: [])
+    store.calls = calls
+    return store
+
+
+def _load(monkeypatch, text):
+    docs = [Document(page_content=text, metadata={"source_file": "plan.txt"})] if text else []
+    monkeypatch.setattr(document_processor, "_load_document", lambda path: docs)
+
+
+def test_reingest_adds_new_chunks_before_deleting_old(fake_store, monkeypatch, tmp_path):
+    _load(monkeypatch, "Our plan for next year.")
+
+    assert document_processor.process_file(tmp_path / "plan.txt") == 1
+    assert fake_store.calls == [("add", ["new-0"]), ("delete", ["old-0", "old-1"])]
+
+
+def test_reingest_with_no_chunks_still_deletes_old(fake_store, monkeypatch, tmp_path):
+    _load(monkeypatch, "")
+
+    assert document_processor.process_file(tmp_path / "plan.txt") == 0
+    assert fake_store.calls == [("delete", ["old-0", "old-1"])]
+
+
+def test_failed_reingest_keeps_old_chunks(fake_store, monkeypatch, tmp_path):
+    _load(monkeypatch, "Our plan for next year.")
+    fake_store.fail = True
+
+    with pytest.raises(RuntimeError):
+        document_processor.process_file(tmp_path / "plan.txt")
+    assert fake_store.calls == [("delete", [])]
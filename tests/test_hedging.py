@@ -0,0 +1,53 @@
+"""Hedged requests: the budget caps duplicates, and a slow primary is raced by one hedge."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain_huggingface")
+
+from src.llm.hedging import HedgeBudget, LatencyTracker, RequestHedger  # noqa: E402
+
+
+def test_budget_allows_ratio_of_primary_calls():
+    budget = HedgeBudget(ratio=0.25, burst=5)
+
+    spent = 0
+    for _ in range(100):
+        budget.on_call()
+        spent += budget.try_spend()
+
+    assert spent == 25
+    assert budget.denied == 75
+
+
+def test_budget_tokens_are_capped_at_burst():
+    budget = HedgeBudget(ratio=1.0, burst=2)
+    for _ in range(10):
+        budget.on_call()
+
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+
+
+def test_percentile_needs_min_samples():
+    tracker = LatencyTracker(window=10)
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        tracker.record("m", seconds)
+
+    assert tracker.percentile("m", 50, min_samples=5) is None
+    assert tracker.percentile("m", 50, min_samples=4) == 0.2
+    assert tracker.percentile("m", 100) == 0.4
+
+
+def test_slow_primary_is_hedged_and_the_faster_copy_wins():
+    hedger = RequestHedger(percentile=50, min_samples=1, window=10, budget_ratio=1.0)
+    hedger.latency.record("m", 0.01)
+    delays = iter([10.0, 0.0])
+
+    async def call():
+        await asyncio.sleep(next(delays))
+        return "ok"
+
+    assert asyncio.run(hedger.run("m", call)) == "ok"
+    assert hedger.budget.hedges == 1
+    assert hedger.hedge_wins == 1
@@ -0,0 +1,41 @@
+"""Ingestion job history: bounded, oldest finished jobs dropped first."""
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from src.ingestion import jobs  # noqa: E402
+from src.models.schemas import IngestionJob, JobStatus  # noqa: E402
+
+
+@pytest.fixture
+def job_table(monkeypatch):
+    table = jobs.OrderedDict()
+    monkeypatch.setattr(jobs, "_jobs", table)
+    return table
+
+
+def _add(table, job_id, status):
+    table[job_id] = IngestionJob(job_id=job_id, status=status, created_at=0.0)
+
+
+def test_evicts_oldest_finished_jobs_beyond_history(job_table, override_settings):
+    override_settings(ingestion_job_history=2)
+    _add(job_table, "a", JobStatus.COMPLETED)
+    _add(job_table, "b", JobStatus.FAILED)
+    _add(job_table, "c", JobStatus.COMPLETED)
+
+    jobs._evict_old_jobs()
+
+    assert list(job_table) == ["b", "c"]
+
+
+def test_never_evicts_unfinished_jobs(job_table, override_settings):
+    override_settings(ingestion_job_history=1)
+    _add(job_table, "a", JobStatus.RUNNING)
+    _add(job_table, "b", JobStatus.QUEUED)
+    _add(job_table, "c", JobStatus.COMPLETED)
+
+    jobs._evict_old_jobs()
+
+    assert list(job_table) == ["a", "b"]
@@ -0,0 +1,61 @@
+"""KeywordIndex: in-place adds, tombstoned removals, compaction and snapshots."""
+
+import pytest
+
+pytest.importorskip("chromadb")
+pytest.importorskip("rank_bm25")
+
+from src.retrieval.keyword_index import KeywordIndex  # noqa: E402
+
+
+def _index():
+    index = KeywordIndex()
+    index.add(
+        ["a", "b", "c", "d"],
+        ["revenue grew in q4", "churn fell sharply", "hiring plan for engineering", "office lease renewal"],
+        [{"source_file": "a.txt"}, {"source_file": "b.txt"}, {"source_file": "c.txt"}, {"source_file": "d.txt"}],
+    )
+    return index
+
+
+def test_removed_chunks_are_skipped_until_compaction():
+    index = _index()
+
+    assert index.remove(["a", "missing"]) == 1
+    assert len(index) == 3
+    assert index.tombstone_ratio == 0.25
+    assert index.search("revenue", 5) == []
+    assert [m["source_file"] for _, m in index.search("churn", 5)] == ["b.txt"]
+
+
+def test_compact_drops_tombstones_and_keeps_live_chunks():
+    index = _index()
+    index.remove(["a"])
+
+    assert index.compact() == 1
+    assert index.ids == ["b", "c", "d"]
+    assert index.tombstone_ratio == 0.0
+    assert [m["source_file"] for _, m in index.search("lease", 5)] == ["d.txt"]
+    assert index.compact() == 0
+
+
+def test_add_replaces_existing_id():
+    index = _index()
+    index.add(["b"], ["churn rose"], [{"source_file": "b2.txt"}])
+
+    assert len(index) == 4
+    assert [m["source_file"] for _, m in index.search("churn", 5)] == ["b2.txt"]
+
+
+def test_snapshot_round_trip_skips_tombstones(tmp_path):
+    index = _index()
+    index.remove(["a"])
+    index.corpus_generation = 7
+    path = tmp_path / "keyword_index.pkl"
+    index.save(path)
+
+    loaded = KeywordIndex.load(path)
+
+    assert loaded.ids == ["b", "c", "d"]
+    assert loaded.corpus_generation == 7
+    assert [m["source_file"] for _, m in loaded.search("hiring", 5)] == ["c.txt"]
@@ -0,0 +1,49 @@
+"""LLM response cache: key stability, TTL expiry and least-recently-used eviction."""
+
+import pytest
+
+pytest.importorskip("langchain_huggingface")
+
+from src.llm import cache as cache_module  # noqa: E402
+from src.llm.cache import LLMCache, make_cache_key  # noqa: E402
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1000.0}
+    monkeypatch.setattr(cache_module.time, "time", lambda: now["t"])
+    return now
+
+
+def test_key_depends_on_prompt_model_and_params_not_their_order():
+    key = make_cache_key("p", "m", {"temperature": 0.1, "max_new_tokens": 8})
+
+    assert key == make_cache_key("p", "m", {"max_new_tokens": 8, "temperature": 0.1})
+    assert key != make_cache_key("p", "other", {"temperature": 0.1, "max_new_tokens": 8})
+    assert key != make_cache_key("p", "m", {"temperature": 0.2, "max_new_tokens": 8})
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = LLMCache(tmp_path / "llm_cache.sqlite", ttl_seconds=60, max_entries=10)
+    cache.put("k", "m", "answer")
+
+    clock["t"] += 30
+    assert cache.get("k") == "answer"
+    clock["t"] += 31
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = LLMCache(tmp_path / "llm_cache.sqlite", ttl_seconds=0, max_entries=2)
+    cache.put("a", "m", "A")
+    clock["t"] += 1
+    cache.put("b", "m", "B")
+    clock["t"] += 1
+    assert cache.get("a") == "A"  # b is now the least recently used
+    clock["t"] += 1
+    cache.put("c", "m", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,55 @@
+"""Metrics fast path: only exact metric/period lookups are answered from the metrics store."""
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from src.agents.insight_agent import _answer_from_metrics  # noqa: E402
+from src.retrieval import metrics_store  # noqa: E402
+from src.retrieval.metrics_store import MetricRow  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def metrics_db(tmp_path, monkeypatch, override_settings):
+    override_settings(metrics_db_path=tmp_path / "metrics.db")
+    monkeypatch.setattr(metrics_store, "_initialized", False)
+    metrics_store.replace_source_metrics(
+        "annual_report.pdf",
+        [
+            MetricRow("Revenue", "Q4 FY2025", 120.5, "120.5", "annual_report.pdf", "$M", 4),
+            MetricRow("Cost of revenue", "Q4 FY2025", 70.0, "70.0", "annual_report.pdf", "$M", 4),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "question",
+    ["What was revenue in Q4 FY2025?", "Revenue Q4 FY25", "What was the cost of revenue for Q4 FY2025?"],
+)
+def test_exact_lookup_is_answered(question):
+    response = _answer_from_metrics(question)
+
+    assert response is not None
+    assert response.sources[0].metadata["source_file"] == "annual_report.pdf"
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "What was revenue growth in Q4 FY2025?",
+        "What is the revenue guidance for Q4 FY2025?",
+        "What was revenue per share in Q4 FY2025?",
+        "What was YoY revenue in Q4 FY2025?",
+        "Why did revenue fall in Q4 FY2025?",
+        "What was revenue in Q3 FY2025?",
+    ],
+)
+def test_qualified_or_unknown_lookups_fall_through(question):
+    assert _answer_from_metrics(question) is None
+
+
+def test_answer_cites_the_matching_metric():
+    response = _answer_from_metrics("What was the cost of revenue for Q4 FY2025?")
+
+    assert "**Cost of revenue**" in response.answer
+    assert "70.0" in response.answer
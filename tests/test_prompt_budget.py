@@ -0,0 +1,62 @@
+"""Prompt budgeting: whole-chunk fitting, clean truncation, and one tokenizer per profile model."""
+
+import pytest
+
+pytest.importorskip("langchain_huggingface")
+
+from src.llm import prompt_budget  # noqa: E402
+from src.llm.prompt_budget import count_tokens, fit_chunks, truncate_to_tokens  # noqa: E402
+
+
+class _WordTokenizer:
+    """One token per whitespace-separated word (slow tokenizer path)."""
+
+    is_fast = False
+
+    def encode(self, text, add_special_tokens=False):
+        return text.split()
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(ids)
+
+
+@pytest.fixture(autouse=True)
+def tokenizers(monkeypatch, override_settings):
+    override_settings(llm_tokenizer=None, llm_model_name="big-model", llm_backend="hf_endpoint")
+    table = {"big-model": None, "word-model": _WordTokenizer()}  # None: 4 chars/token heuristic
+    monkeypatch.setattr(prompt_budget, "_tokenizers", table)
+    return table
+
+
+def test_tokens_are_counted_with_the_requested_model():
+    text = "one two three four five six seven eight"
+
+    assert count_tokens(text) == 10  # default model: ceil(40 / 4)
+    assert count_tokens(text, "word-model") == 8
+
+
+def test_llm_tokenizer_overrides_every_model(override_settings):
+    override_settings(llm_tokenizer="word-model")
+
+    assert count_tokens("one two three", "big-model") == 3
+
+
+def test_fit_chunks_keeps_whole_chunks_in_order_and_skips_ones_that_do_not_fit():
+    chunks = ["a b c", "d e f g h i j k l m", "n o"]
+
+    text, used = fit_chunks(chunks, 7, separator=" | ", model="word-model")
+
+    assert (text, used) == ("a b c | n o", 2)
+
+
+def test_fit_chunks_truncates_the_first_chunk_rather_than_returning_nothing():
+    text, used = fit_chunks(["a b c d e f"], 3, model="word-model")
+
+    assert (text, used) == ("a b c", 1)
+
+
+def test_truncate_prefers_a_sentence_boundary():
+    text = "one two three four five six seven eight nine. ten eleven twelve"
+
+    assert truncate_to_tokens(text, 10, "word-model") == "one two three four five six seven eight nine."
+    assert truncate_to_tokens(text, 100, "word-model") == text
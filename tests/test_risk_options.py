@@ -0,0 +1,55 @@
+"""Per-option risk assessment: splitting planner output into options and merging the per-option results."""
+
+import pytest
+
+pytest.importorskip("langchain_huggingface")
+
+from src.graph.nodes.risk_assessment import _merge_options, split_options  # noqa: E402
+from src.llm.prompt_budget import PromptReport  # noqa: E402
+
+PLAN = """Intro text.
+
+## Option A: Expand to EU
+- Open two offices
+
+## Option b : Stay focused
+- Deepen US accounts
+
+## Summary of trade-offs
+EU is riskier.
+"""
+
+
+def _report(tokens):
+    return PromptReport(node="risk_option", prompt_tokens=tokens, budget=1500, reserved_new_tokens=512)
+
+
+def test_split_options_stops_each_block_at_the_next_header():
+    options = split_options(PLAN)
+
+    assert [(letter, name) for letter, name, _ in options] == [("A", "Expand to EU"), ("B", "Stay focused")]
+    assert options[1][2] == "## Option b : Stay focused\n- Deepen US accounts"
+
+
+def test_split_options_without_option_headers():
+    assert split_options("Just prose, no options.") == []
+
+
+def test_merge_keeps_option_order_and_notes_failed_options():
+    options = split_options(PLAN)
+    outcomes = ["## Option A: whatever\nRisk score: 7\nRisk level: HIGH", RuntimeError("timeout")]
+
+    update = _merge_options({}, options, outcomes, [_report(900), _report(1200)])
+
+    assert update["risk_analysis"].startswith("## Option A: Expand to EU\nRisk score: 7")
+    assert "## Option B: Stay focused\n- Risk assessment unavailable" in update["risk_analysis"]
+    assert update["risk_scores"] == {"Expand to EU": 7.0}
+    assert update["risk_levels"] == {"Expand to EU": "HIGH"}
+    assert "(1 failed)" in update["reasoning_trace"][0]["detail"]
+
+
+def test_merge_raises_when_every_option_failed():
+    options = split_options(PLAN)
+
+    with pytest.raises(RuntimeError):
+        _merge_options({}, options, [RuntimeError("a"), RuntimeError("b")], [_report(1), _report(1)])
@@ -1,8 +1,10 @@
 """Streamlit UI: mode selection, display answer, sources, reasoning trace, risk chart."""
 
 import io
+import json
 import logging
 import sys
+import time
 from pathlib import Path
 
 # Add project root for imports
@@ -22,6 +24,111 @@ settings = get_settings()
 API_BASE = f"http://localhost:{settings.api_port}"
 
 
+def _iter_sse(response: requests.Response):
+    """Yield (event, data) pairs from a text/event-stream response."""
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if not line:
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+
+def _ask_streaming(question: str, mode: str):
+    """
+    POST /ask/stream and render as events arrive: node progress in a status box, answer tokens in place.
+    Returns the final AskResponse dict (None after an error event).
+    """
+    header = st.empty()
+    progress = None
+    st.subheader("Answer")
+    answer_box = st.empty()
+    answer_box.markdown("_Thinking..._")
+    text = ""
+    with requests.post(
+        f"{API_BASE}/ask/stream",
+        json={"question": question, "mode": mode},
+        stream=True,
+        timeout=(10, 300),
+    ) as r:
+        r.raise_for_status()
+        for event, payload in _iter_sse(r):
+            if event == "route":
+                header.info(f"Routing to **{payload.get('agent_type')}** agent...")
+                if payload.get("agent_type") == "strategic":
+                    progress = st.status("Running Decision Agent...", expanded=False)
+            elif event == "node_start" and progress is not None:
+                progress.update(label=f"Running {payload.get('node')}...")
+            elif event == "node_end" and progress is not None:
+                progress.write(f"**{payload.get('node')}**: {payload.get('summary', '')}")
+            elif event == "token":
+                text += payload.get("text", "")
+                answer_box.markdown(text + " ▌")
+            elif event == "error":
+                answer_box.empty()
+                st.error(f"Request failed: {payload.get('detail')}")
+                return None
+            elif event == "done":
+                if progress is not None:
+                    progress.update(label="Decision Agent finished", state="complete")
+                agent = payload.get("agent_type", "insight")
+                header.success(f"Answered by **{agent}** agent" + (" (from answer cache)" if payload.get("cached") else ""))
+                answer_box.markdown(payload.get("answer", ""))
+                return payload
+    answer_box.empty()
+    st.error("The answer stream ended unexpectedly.")
+    return None
+
+
+def _render_details(data: dict) -> None:
+    """Sources, reasoning steps and risk summary of a finished answer."""
+    sources = data.get("sources") or []
+    if sources:
+        with st.expander("📎 Sources (data fetched from)", expanded=False):
+            # Show file names from metadata; deduplicate while preserving order
+            seen = set()
+            for s in sources:
+                meta = s.get("metadata", {}) if isinstance(s, dict) else getattr(s, "metadata", {}) or {}
+                file_name = meta.get("source_file") or meta.get("source_path", "—")
+                if isinstance(file_name, str) and "/" in file_name:
+                    file_name = file_name.split("/")[-1].split("\\")[-1]
+                if file_name not in seen:
+                    seen.add(file_name)
+                    score = s.get("score") if isinstance(s, dict) else getattr(s, "score", None)
+                    label = file_name + (f" (relevance: {score:.0%})" if score is not None else "")
+                    st.markdown(f"• **{label}**")
+
+    trace = data.get("reasoning_trace")
+    if trace:
+        with st.expander("🔍 Reasoning steps", expanded=False):
+            for step in trace:
+                node = step.get("node", step.get("node", ""))
+                summary = step.get("summary", step.get("summary", ""))
+                st.markdown(f"**{node}**: {summary}")
+
+    risk = data.get("risk_summary")
+    if risk:
+        st.subheader("Risk summary")
+        scores = risk.get("scores") or {}
+        options = risk.get("options") or []
+        if scores:
+            import pandas as pd
+            df = pd.DataFrame({"Risk score": list(scores.values())}, index=list(scores.keys()))
+            st.bar_chart(df)
+        if options:
+            for opt in options:
+                name = opt.get("name", opt.get("summary", str(opt)))
+                level = opt.get("level", "")
+                score = opt.get("score", "")
+                st.write(f"- **{name}**: level {level}, score {score}")
+
+
 def main():
     st.set_page_config(
         page_title="AI Leadership Agent",
@@ -41,66 +148,17 @@ def main():
     submit = st.button("Ask")
 
     if submit and question.strip():
-        with st.spinner("Thinking..."):
-            try:
-                r = requests.post(
-                    f"{API_BASE}/ask",
-                    json={"question": question.strip(), "mode": mode},
-                    timeout=120,
-                )
-                r.raise_for_status()
-                data = r.json()
-            except requests.exceptions.ConnectionError:
-                st.error("Could not connect to the API. Is the backend running? Start it with: `python -m uvicorn src.api.main:app --host 0.0.0.0 --port 8000`")
-                return
-            except Exception as e:
-                st.error(f"Request failed: {e}")
-                return
-
-        agent = data.get("agent_type", "insight")
-        st.success(f"Answered by **{agent}** agent")
-        st.subheader("Answer")
-        st.markdown(data.get("answer", ""))
-
-        sources = data.get("sources") or []
-        if sources:
-            with st.expander("📎 Sources (data fetched from)", expanded=False):
-                # Show file names from metadata; deduplicate while preserving order
-                seen = set()
-                for s in sources:
-                    meta = s.get("metadata", {}) if isinstance(s, dict) else getattr(s, "metadata", {}) or {}
-                    file_name = meta.get("source_file") or meta.get("source_path", "—")
-                    if isinstance(file_name, str) and "/" in file_name:
-                        file_name = file_name.split("/")[-1].split("\\")[-1]
-                    if file_name not in seen:
-                        seen.add(file_name)
-                        score = s.get("score") if isinstance(s, dict) else getattr(s, "score", None)
-                        label = file_name + (f" (relevance: {score:.0%})" if score is not None else "")
-                        st.markdown(f"• **{label}**")
-
-        trace = data.get("reasoning_trace")
-        if trace:
-            with st.expander("🔍 Reasoning steps", expanded=False):
-                for step in trace:
-                    node = step.get("node", step.get("node", ""))
-                    summary = step.get("summary", step.get("summary", ""))
-                    st.markdown(f"**{node}**: {summary}")
-
-        risk = data.get("risk_summary")
-        if risk:
-            st.subheader("Risk summary")
-            scores = risk.get("scores") or {}
-            options = risk.get("options") or []
-            if scores:
-                import pandas as pd
-                df = pd.DataFrame({"Risk score": list(scores.values())}, index=list(scores.keys()))
-                st.bar_chart(df)
-            if options:
-                for opt in options:
-                    name = opt.get("name", opt.get("summary", str(opt)))
-                    level = opt.get("level", "")
-                    score = opt.get("score", "")
-                    st.write(f"- **{name}**: level {level}, score {score}")
+        try:
+            data = _ask_streaming(question.strip(), mode)
+        except requests.exceptions.ConnectionError:
+            st.error("Could not connect to the API. Is the backend running? Start it with: `python -m uvicorn src.api.main:app --host 0.0.0.0 --port 8000`")
+            return
+        except Exception as e:
+            st.error(f"Request failed: {e}")
+            return
+        if data is None:
+            return
+        _render_details(data)
 
     elif submit and not question.strip():
         st.warning("Please enter a question.")
@@ -123,9 +181,20 @@ def main():
                     timeout=120,
                 )
                 r.raise_for_status()
-                data = r.json()
-                st.sidebar.success(f"Uploaded {data.get('uploaded', 0)} file(s), {data.get('chunks_added', 0)} chunks added.")
-                for f in data.get("files") or []:
+                job = r.json()
+                with st.sidebar.status("Ingesting...", expanded=False) as status_box:
+                    while job.get("status") in ("queued", "running"):
+                        time.sleep(1.0)
+                        r = requests.get(f"{API_BASE}/jobs/{job['job_id']}", timeout=10)
+                        r.raise_for_status()
+                        job = r.json()
+                        done = sum(1 for f in job.get("files") or [] if f.get("status") in ("completed", "failed"))
+                        status_box.update(label=f"Ingesting... {done}/{len(job.get('files') or [])} file(s), {job.get('chunks_added', 0)} chunks")
+                    status_box.update(label="Ingestion finished", state="complete" if job.get("status") == "completed" else "error")
+                files = job.get("files") or []
+                ok = [f for f in files if f.get("status") == "completed"]
+                st.sidebar.success(f"Uploaded {len(ok)} file(s), {job.get('chunks_added', 0)} chunks added.")
+                for f in files:
                     name = f.get("filename", "")
                     chunks = f.get("chunks", 0)
                     err = f.get("error")